@@ -153,6 +153,9 @@ CORS_ALLOW_HEADERS = [
     'x-requested-with',
 ]
 
+# Pagination cursors are returned in headers by endpoints whose body is a plain list
+CORS_EXPOSE_HEADERS = ['x-next-cursor', 'link']
+
 CORS_ALLOW_METHODS = [
     'DELETE',
     'GET',
@@ -170,3 +173,117 @@ MONGODB_DB_NAME = config('MONGODB_DB_NAME', default='news_aggregator_db')
 NEWSAPI_KEY = config('NEWSAPI_KEY', default='')
 GNEWS_KEY = config('GNEWS_KEY', default='')
 MEDIASTACK_KEY = config('MEDIASTACK_KEY', default='')
+
+# === Ingestion ===
+# Timeout (seconds) for each news provider API request
+NEWS_SOURCE_TIMEOUT = config('NEWS_SOURCE_TIMEOUT', default=15, cast=int)
+# Wall-clock budget (seconds) for one provider, including scraping its articles
+NEWS_SOURCE_DEADLINE = config('NEWS_SOURCE_DEADLINE', default=120, cast=int)
+NEWS_FETCH_MAX_WORKERS = config('NEWS_FETCH_MAX_WORKERS', default=3, cast=int)
+# Shared scraper client: in-flight page fetches across all sources, and per domain
+SCRAPER_MAX_CONCURRENCY = config('SCRAPER_MAX_CONCURRENCY', default=16, cast=int)
+SCRAPER_PER_HOST_LIMIT = config('SCRAPER_PER_HOST_LIMIT', default=4, cast=int)
+# Bulk article writes: flush after this many articles or seconds, whichever comes first
+INGEST_WRITE_BATCH_SIZE = config('INGEST_WRITE_BATCH_SIZE', default=100, cast=int)
+INGEST_WRITE_FLUSH_INTERVAL = config('INGEST_WRITE_FLUSH_INTERVAL', default=5, cast=float)
+# Streaming ingest pipeline: bounded queue size between stages, dedupe batch size
+# and number of AI enrichment workers
+INGEST_QUEUE_SIZE = config('INGEST_QUEUE_SIZE', default=100, cast=int)
+INGEST_DEDUPE_BATCH_SIZE = config('INGEST_DEDUPE_BATCH_SIZE', default=50, cast=int)
+INGEST_ENRICH_WORKERS = config('INGEST_ENRICH_WORKERS', default=1, cast=int)
+# Model worker processes for AI enrichment (0 runs the models in the Django process,
+# using INGEST_ENRICH_WORKERS threads). Each worker holds its own copy of the models.
+ENRICHMENT_POOL_SIZE = config('ENRICHMENT_POOL_SIZE', default=1, cast=int)
+# torch intra-op threads per worker (0 = CPU cores divided by the pool size)
+ENRICHMENT_TORCH_THREADS = config('ENRICHMENT_TORCH_THREADS', default=0, cast=int)
+# Articles handed to the AI models together, and how long (seconds) to wait to fill a batch
+INGEST_ENRICH_BATCH_SIZE = config('INGEST_ENRICH_BATCH_SIZE', default=32, cast=int)
+INGEST_ENRICH_BATCH_WAIT = config('INGEST_ENRICH_BATCH_WAIT', default=2, cast=float)
+# Texts per sentiment model forward pass
+SENTIMENT_BATCH_SIZE = config('SENTIMENT_BATCH_SIZE', default=16, cast=int)
+# An ingest job that sends no progress for this many seconds is considered dead
+INGEST_JOB_STALE_AFTER = config('INGEST_JOB_STALE_AFTER', default=900, cast=int)
+# Texts per summarization beam-search batch
+SUMMARY_BATCH_SIZE = config('SUMMARY_BATCH_SIZE', default=8, cast=int)
+# Texts per NER model forward pass
+NER_BATCH_SIZE = config('NER_BATCH_SIZE', default=8, cast=int)
+
+# === Recommendations ===
+# Directory for persisted recommendation data (article vector index, ...)
+RECSYS_DATA_DIR = config('RECSYS_DATA_DIR', default=str(BASE_DIR / 'recsys_data'))
+ARTICLE_INDEX_MAX_FEATURES = config('ARTICLE_INDEX_MAX_FEATURES', default=50000, cast=int)
+# Refit the TF-IDF vocabulary once the corpus has grown by this fraction since the last fit
+ARTICLE_INDEX_REFIT_RATIO = config('ARTICLE_INDEX_REFIT_RATIO', default=0.25, cast=float)
+# Reads lose half their weight in a user's interest profile after this many days
+USER_PROFILE_HALF_LIFE_DAYS = config('USER_PROFILE_HALF_LIFE_DAYS', default=14, cast=float)
+# Strongest terms kept per stored profile
+USER_PROFILE_MAX_TERMS = config('USER_PROFILE_MAX_TERMS', default=1000, cast=int)
+# Reads used when a profile is (re)built from the reading history
+USER_PROFILE_HISTORY_LIMIT = config('USER_PROFILE_HISTORY_LIMIT', default=100, cast=int)
+# ANN candidate generation: dense vector size, IVF lists (0 = sqrt of corpus size),
+# lists probed per query, and candidates fetched for full scoring
+ANN_DIMENSIONS = config('ANN_DIMENSIONS', default=128, cast=int)
+ANN_LISTS = config('ANN_LISTS', default=0, cast=int)
+ANN_PROBES = config('ANN_PROBES', default=8, cast=int)
+RECOMMENDATION_CANDIDATES = config('RECOMMENDATION_CANDIDATES', default=300, cast=int)
+# Diversity reranking: maximal marginal relevance trade-off (1 = rank by score
+# only, lower values push near-duplicate stories further apart) and whether at
+# most max(3, limit // 5) articles of a feed may share a category
+RECOMMENDATION_MMR_LAMBDA = config('RECOMMENDATION_MMR_LAMBDA', default=0.7, cast=float)
+RECOMMENDATION_CATEGORY_CAP = config('RECOMMENDATION_CATEGORY_CAP', default=True, cast=bool)
+# Co-read (item-item collaborative filtering) job: most recent distinct reads
+# counted per user, co-reads needed before two articles count as neighbours,
+# neighbours kept per article, and pair events buffered per sparse chunk
+CO_READ_MAX_ITEMS_PER_USER = config('CO_READ_MAX_ITEMS_PER_USER', default=200, cast=int)
+CO_READ_MIN_COUNT = config('CO_READ_MIN_COUNT', default=2, cast=int)
+CO_READ_NEIGHBOURS = config('CO_READ_NEIGHBOURS', default=50, cast=int)
+CO_READ_CHUNK_SIZE = config('CO_READ_CHUNK_SIZE', default=1000000, cast=int)
+# Trending counters lose half their weight after this many hours
+TRENDING_HALF_LIFE_HOURS = config('TRENDING_HALF_LIFE_HOURS', default=24, cast=float)
+
+# === Caching ===
+# Personalized feeds are materialized per user (FEED_CACHE_SIZE ranked articles)
+# and paged from the cache; entries expire after FEED_CACHE_TTL seconds and the
+# least recently used are evicted beyond FEED_CACHE_MAX_ENTRIES
+FEED_CACHE_SIZE = config('FEED_CACHE_SIZE', default=200, cast=int)
+FEED_CACHE_TTL = config('FEED_CACHE_TTL', default=900, cast=int)
+FEED_CACHE_MAX_ENTRIES = config('FEED_CACHE_MAX_ENTRIES', default=1000, cast=int)
+# Article list, search and feed responses carry ETags keyed on the ingest
+# generation, which each worker re-reads at most every INGEST_STATE_POLL_INTERVAL seconds
+INGEST_STATE_POLL_INTERVAL = config('INGEST_STATE_POLL_INTERVAL', default=5, cast=float)
+# Article lists and search results are cached per ingest generation for
+# RESPONSE_CACHE_TTL seconds, evicting beyond RESPONSE_CACHE_MAX_ENTRIES; identical
+# concurrent misses wait up to RESPONSE_CACHE_WAIT seconds for the one computing it
+RESPONSE_CACHE_TTL = config('RESPONSE_CACHE_TTL', default=600, cast=int)
+RESPONSE_CACHE_MAX_ENTRIES = config('RESPONSE_CACHE_MAX_ENTRIES', default=2000, cast=int)
+RESPONSE_CACHE_WAIT = config('RESPONSE_CACHE_WAIT', default=10, cast=float)
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    'feeds': {
+        'BACKEND': config('FEED_CACHE_BACKEND', default='django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': config('FEED_CACHE_LOCATION', default='personalized-feeds'),
+        'TIMEOUT': FEED_CACHE_TTL,
+        'OPTIONS': {'MAX_ENTRIES': FEED_CACHE_MAX_ENTRIES},
+    },
+    'responses': {
+        'BACKEND': config('RESPONSE_CACHE_BACKEND', default='django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': config('RESPONSE_CACHE_LOCATION', default='article-responses'),
+        'TIMEOUT': RESPONSE_CACHE_TTL,
+        'OPTIONS': {'MAX_ENTRIES': RESPONSE_CACHE_MAX_ENTRIES},
+    },
+}
+# Feed precomputation after ingest: users who read something in the last
+# FEED_PRECOMPUTE_ACTIVE_DAYS days are ranked FEED_PRECOMPUTE_BATCH_SIZE at a time
+# against the newest FEED_PRECOMPUTE_CANDIDATES articles
+FEED_PRECOMPUTE_ACTIVE_DAYS = config('FEED_PRECOMPUTE_ACTIVE_DAYS', default=7, cast=int)
+FEED_PRECOMPUTE_BATCH_SIZE = config('FEED_PRECOMPUTE_BATCH_SIZE', default=256, cast=int)
+FEED_PRECOMPUTE_CANDIDATES = config('FEED_PRECOMPUTE_CANDIDATES', default=2000, cast=int)
+
+# === Pagination ===
+# List endpoints return pages of API_PAGE_SIZE items by default and at most
+# API_MAX_PAGE_SIZE per request, with a cursor for the next page
+API_PAGE_SIZE = config('API_PAGE_SIZE', default=50, cast=int)
+API_MAX_PAGE_SIZE = config('API_MAX_PAGE_SIZE', default=200, cast=int)
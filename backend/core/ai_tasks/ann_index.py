@@ -0,0 +1,300 @@
+"""
+Approximate nearest-neighbour index for recommendation candidate generation.
+Article TF-IDF rows are reduced to dense vectors with TruncatedSVD and grouped
+into an inverted-file (IVF) index of k-means clusters. A query only scores the
+articles in the few clusters closest to the user profile, so finding the best
+few hundred candidates stays fast as the corpus grows. The dense vectors
+are saved as a .npy file that workers map read-only (see mapped_arrays.py).
+"""
+
+from sklearn.decomposition import TruncatedSVD
+from sklearn.cluster import MiniBatchKMeans
+from django.conf import settings
+from pathlib import Path
+from .mapped_arrays import write_arrays, load_arrays, remove_old_generations
+import numpy as np
+import threading
+import joblib
+import os
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+def _normalize(vectors):
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return vectors / norms
+
+
+class ArticleANNIndex:
+    """
+    IVF index over dense article vectors, aligned with the rows of an
+    ArticleVectorIndex (row ``i`` here is ``urls[i]`` there).
+    """
+
+    def __init__(self, dimensions=128, n_lists=0, n_probe=8):
+        self.dimensions = dimensions
+        self.n_lists = n_lists  # 0: about sqrt(number of articles)
+        self.n_probe = n_probe
+        self.svd = None
+        self.centroids = None
+        self.vectors = None  # (n, dimensions) float32, L2-normalized
+        self.lists = []  # article rows per cluster
+        self.urls = []
+        self.source_fit_id = None
+        self.arrays = None  # generation directory holding the saved vectors
+
+    def __getstate__(self):
+        # The vectors are saved as a mapped array, not pickled
+        state = self.__dict__.copy()
+        state["vectors"] = None
+        return state
+
+    def __len__(self):
+        return len(self.urls)
+
+    def project(self, tfidf_rows):
+        """TF-IDF rows (or a profile row) -> normalized dense vectors."""
+        return _normalize(self.svd.transform(tfidf_rows)).astype(np.float32)
+
+    def build(self, article_index):
+        """Fit the projection and clusters on every row of ``article_index``."""
+        matrix = article_index.matrix
+        n, vocabulary = matrix.shape
+        components = max(1, min(self.dimensions, vocabulary - 1, n - 1))
+        self.svd = TruncatedSVD(n_components=components, random_state=0).fit(matrix)
+        self.vectors = self.project(matrix)
+
+        n_lists = self.n_lists or int(np.sqrt(n))
+        n_lists = max(1, min(n_lists, n))
+        kmeans = MiniBatchKMeans(n_clusters=n_lists, random_state=0, n_init=3, batch_size=4096)
+        labels = kmeans.fit_predict(self.vectors)
+        self.centroids = _normalize(kmeans.cluster_centers_).astype(np.float32)
+        self.lists = [np.flatnonzero(labels == c) for c in range(n_lists)]
+
+        self.urls = list(article_index.urls)
+        self.source_fit_id = article_index.fit_id
+        return self
+
+    def add(self, article_index):
+        """Append rows ``article_index`` gained since the last build or add."""
+        start = len(self.urls)
+        if len(article_index) <= start:
+            return 0
+        vectors = self.project(article_index.matrix[start:])
+        labels = np.argmax(vectors @ self.centroids.T, axis=1)
+        rows = np.arange(start, start + len(vectors))
+        lists = list(self.lists)
+        for c in np.unique(labels):
+            lists[c] = np.concatenate([lists[c], rows[labels == c]])
+        # Swap in complete arrays, lists last, so concurrent searches never see unknown rows
+        self.vectors = np.vstack([self.vectors, vectors])
+        self.urls = self.urls + list(article_index.urls[start:])
+        self.lists = lists
+        return len(vectors)
+
+    def search(self, profile, k=300, exclude=None, article_index=None):
+        """
+        Approximate top-``k`` articles for a profile vector.
+
+        Args:
+            profile: (1 x vocabulary) sparse row in the article index space
+            k (int): Number of candidates to return
+            exclude (set): URLs to leave out (e.g. already read)
+            article_index (ArticleVectorIndex): If given, a 4x larger dense
+                shortlist is re-ranked with the exact TF-IDF similarities
+
+        Returns:
+            list: (url, similarity) pairs, best first
+        """
+        query = self.project(profile)[0]
+        n_probe = min(self.n_probe, len(self.centroids))
+        probed = np.argpartition(-(self.centroids @ query), n_probe - 1)[:n_probe]
+        rows = np.concatenate([self.lists[c] for c in probed])
+        if exclude:
+            rows = np.array([r for r in rows if self.urls[r] not in exclude], dtype=np.int64)
+        if not len(rows):
+            return []
+
+        rerank = article_index is not None and article_index.fit_id == self.source_fit_id
+        rows, scores = self._top(rows, self.vectors[rows] @ query, k * 4 if rerank else k)
+        if rerank:
+            # SVD keeps the topic but blurs word-level overlap; restore it for the shortlist
+            exact = (article_index.matrix[rows] @ profile.T).toarray().ravel()
+            rows, scores = self._top(rows, exact, k)
+        return [(self.urls[row], float(score)) for row, score in zip(rows, scores)]
+
+    @staticmethod
+    def _top(rows, scores, k):
+        """The ``k`` best (rows, scores), best first."""
+        if len(rows) > k:
+            top = np.argpartition(-scores, k - 1)[:k]
+        else:
+            top = np.arange(len(rows))
+        top = top[np.argsort(-scores[top], kind='stable')]
+        return rows[top], scores[top]
+
+    def save(self, path):
+        """
+        Write the vectors to a new generation directory, then the index
+        atomically, so readers never see a partial file or missing vectors.
+        """
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        arrays_root = path.with_suffix('')
+        self.arrays = write_arrays(arrays_root, {"vectors": self.vectors})
+        tmp_path = path.with_suffix(path.suffix + '.tmp')
+        joblib.dump(self, tmp_path)
+        os.replace(tmp_path, path)
+        remove_old_generations(arrays_root)
+
+    @staticmethod
+    def load(path):
+        ann = joblib.load(path)
+        # Indexes saved before the vectors were mapped still have them pickled
+        if ann.vectors is None and getattr(ann, "arrays", None) is not None:
+            ann.vectors = load_arrays(Path(path).with_suffix(''), ann.arrays, ("vectors",))["vectors"]
+        return ann
+
+
+# ============ SHARED INDEX ============
+
+_ann = None
+_ann_mtime = None
+_ann_lock = threading.Lock()
+
+
+def _ann_path():
+    return Path(settings.RECSYS_DATA_DIR) / 'ann_index.joblib'
+
+
+def get_ann_index():
+    """
+    Return the persisted ANN index, reloading it when another process has
+    saved a newer version. Returns None if no index has been built yet.
+    """
+    global _ann, _ann_mtime
+    path = _ann_path()
+    try:
+        mtime = path.stat().st_mtime
+    except FileNotFoundError:
+        return _ann
+
+    with _ann_lock:
+        if _ann is None or mtime != _ann_mtime:
+            try:
+                _ann = ArticleANNIndex.load(path)
+                _ann_mtime = mtime
+                logger.info(f"🧭 Loaded ANN index ({len(_ann)} articles, {len(_ann.lists)} lists)")
+            except Exception as e:
+                logger.error(f"❌ Could not load ANN index: {str(e)}")
+        return _ann
+
+
+def update_ann_index(article_index):
+    """
+    Bring the ANN index in line with ``article_index``: rebuild it after a
+    vocabulary refit, otherwise assign the new rows to their nearest clusters.
+    """
+    global _ann, _ann_mtime
+    if article_index is None or len(article_index) < 2:
+        return None  # Too few articles to cluster
+
+    ann = get_ann_index()
+    if ann is None or ann.source_fit_id != article_index.fit_id or len(ann) > len(article_index):
+        ann = ArticleANNIndex(
+            dimensions=settings.ANN_DIMENSIONS,
+            n_lists=settings.ANN_LISTS,
+            n_probe=settings.ANN_PROBES
+        ).build(article_index)
+        logger.info(f"🧭 Built ANN index ({len(ann)} articles, {len(ann.lists)} lists)")
+    else:
+        added = ann.add(article_index)
+        if not added:
+            return ann
+        logger.info(f"🧭 Added {added} articles to the ANN index")
+
+    path = _ann_path()
+    ann.save(path)
+    with _ann_lock:
+        _ann, _ann_mtime = ann, path.stat().st_mtime
+    return ann
+
+
+def _similar_urls(size, article_index, user_profile, exclude_urls, co_reads, recent_reads):
+    """URLs of the ANN neighbours of the profile and the co-read neighbours of the recent reads."""
+    similar_urls = []
+    ann = get_ann_index()
+    if ann is not None and user_profile is not None and ann.source_fit_id == article_index.fit_id:
+        similar_urls = [
+            url for url, _ in ann.search(user_profile, k=size, exclude=exclude_urls, article_index=article_index)
+        ]
+
+    if co_reads is not None and recent_reads:
+        similar_urls += [
+            url for url in co_reads.neighbours(recent_reads, k=size // 2) if url not in exclude_urls
+        ]
+    return similar_urls
+
+
+def fetch_candidate_articles(user_preferences, article_index, user_profile=None, exclude_urls=(),
+                             co_reads=None, recent_reads=()):
+    """
+    Fetch the articles worth fully scoring for a user instead of the whole corpus:
+    the ANN neighbours of their interest profile, the articles most co-read
+    with their ``recent_reads`` (given a CoReadIndex), plus the newest articles in
+    their preferred categories and overall (category and recency carry most
+    of the score, and new articles have no readers to be similar to yet).
+
+    Returns:
+        list: Article documents without their full ``content``
+    """
+    from ..db import articles_collection
+
+    size = settings.RECOMMENDATION_CANDIDATES
+    exclude_urls = set(exclude_urls)
+    query = {"url": {"$nin": list(exclude_urls)}} if exclude_urls else {}
+    projection = {"_id": 0, "content": 0}
+
+    similar_urls = _similar_urls(size, article_index, user_profile, exclude_urls, co_reads, recent_reads)
+    candidates = list(articles_collection.find({"url": {"$in": similar_urls}}, projection)) if similar_urls else []
+    categories = user_preferences.get('categories', [])
+    if categories:
+        candidates += articles_collection.find(
+            {**query, "category": {"$in": categories}}, projection
+        ).sort("publishedAt", -1).limit(size)
+    candidates += articles_collection.find(query, projection).sort("publishedAt", -1).limit(size // 2)
+
+    unique = {}
+    for article in candidates:
+        unique.setdefault(article.get('url'), article)
+    return list(unique.values())
+
+
+def fetch_candidate_rows(user_preferences, store, article_index, user_profile=None, exclude_urls=(),
+                         co_reads=None, recent_reads=()):
+    """
+    The candidates of fetch_candidate_articles as rows of an ArticleFeatureStore:
+    the newest articles come from the mapped publish timestamps instead of
+    two sorted queries, and no article document is loaded.
+
+    Returns:
+        np.ndarray: Distinct candidate rows
+    """
+    size = settings.RECOMMENDATION_CANDIDATES
+    exclude_urls = set(exclude_urls)
+    exclude_rows = store.rows_for(list(exclude_urls))
+
+    similar_rows = store.rows_for(
+        _similar_urls(size, article_index, user_profile, exclude_urls, co_reads, recent_reads)
+    )
+    parts = [similar_rows]
+    preferred = store.codes_for(user_preferences.get('categories', []))
+    if preferred:
+        parts.append(store.newest(size, category_codes=preferred, exclude_rows=exclude_rows))
+    parts.append(store.newest(size // 2, exclude_rows=exclude_rows))
+
+    rows = np.concatenate(parts)
+    _, first = np.unique(rows, return_index=True)
+    return rows[np.sort(first)]
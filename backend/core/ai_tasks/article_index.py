@@ -0,0 +1,230 @@
+"""
+Persistent corpus-level TF-IDF index of articles.
+Fitted once over the stored articles and extended as new articles are
+ingested, so recommendation scoring only needs sparse matrix products
+against precomputed rows instead of refitting TF-IDF per request. The CSR
+arrays of the matrix are saved as .npy files that workers map read-only
+(see mapped_arrays.py); the joblib file holds the rest of the index.
+"""
+
+from sklearn.feature_extraction.text import TfidfVectorizer
+from scipy import sparse
+from .mapped_arrays import write_arrays, load_arrays, remove_old_generations
+from django.conf import settings
+from pathlib import Path
+import threading
+import joblib
+import uuid
+import os
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+def article_text(article):
+    """Text that represents an article in the index."""
+    return f"{article.get('title', '') or ''} {article.get('summary', '') or ''}"
+
+
+class ArticleVectorIndex:
+    """
+    TF-IDF vectors for the article corpus, addressable by article URL.
+    Rows are L2-normalized, so a dot product between rows is their cosine similarity.
+    """
+
+    def __init__(self, max_features=50000):
+        self.max_features = max_features
+        self.vectorizer = None
+        self.matrix = None
+        self.urls = []
+        self.row_of = {}
+        self.fitted_rows = 0
+        self.version = 0
+        self.fit_id = None  # changes whenever the vocabulary (column space) changes
+        self.arrays = None  # generation directory holding the saved matrix
+
+    def __getstate__(self):
+        # The matrix is saved as mapped arrays, not pickled
+        state = self.__dict__.copy()
+        state["matrix_shape"] = self.matrix.shape if self.matrix is not None else None
+        state["matrix"] = None
+        return state
+
+    def __len__(self):
+        return len(self.urls)
+
+    def fit(self, articles):
+        """(Re)fit the vocabulary and IDF weights on ``articles`` and index them."""
+        articles = [a for a in articles if a.get('url')]
+        self.vectorizer = TfidfVectorizer(
+            max_features=self.max_features,
+            stop_words='english',
+            ngram_range=(1, 2),
+            min_df=1
+        )
+        self.matrix = self.vectorizer.fit_transform([article_text(a) for a in articles]).tocsr()
+        self.urls = [a['url'] for a in articles]
+        self.row_of = {url: row for row, url in enumerate(self.urls)}
+        self.fitted_rows = len(self.urls)
+        self.version += 1
+        self.fit_id = uuid.uuid4().hex
+        return self
+
+    def transform(self, articles):
+        """Vectorize articles with the fitted vocabulary, without indexing them."""
+        return self.vectorizer.transform([article_text(a) for a in articles])
+
+    def add(self, articles):
+        """Append rows for articles not indexed yet, keeping the current vocabulary."""
+        new = [a for a in articles if a.get('url') and a['url'] not in self.row_of]
+        if not new:
+            return 0
+        self.matrix = sparse.vstack([self.matrix, self.transform(new)], format='csr')
+        for article in new:
+            self.row_of[article['url']] = len(self.urls)
+            self.urls.append(article['url'])
+        self.version += 1
+        return len(new)
+
+    def rows(self, urls):
+        """Row numbers of the indexed URLs among ``urls`` (unknown URLs are skipped)."""
+        return [self.row_of[url] for url in urls if url in self.row_of]
+
+    def vectors_for(self, articles):
+        """
+        Vectors for ``articles`` in order: precomputed rows where available,
+        freshly transformed rows for articles not indexed yet.
+        """
+        indexed = [(i, self.row_of[a.get('url')]) for i, a in enumerate(articles) if a.get('url') in self.row_of]
+        if len(indexed) == len(articles):
+            return self.matrix[[row for _, row in indexed]]
+
+        missing = [i for i, a in enumerate(articles) if a.get('url') not in self.row_of]
+        stacked = sparse.vstack([
+            self.matrix[[row for _, row in indexed]],
+            self.transform([articles[i] for i in missing])
+        ], format='csr')
+        # Put rows back into the order of ``articles``
+        positions = [i for i, _ in indexed] + missing
+        order = sorted(range(len(positions)), key=positions.__getitem__)
+        return stacked[order]
+
+    def save(self, path):
+        """
+        Write the matrix arrays to a new generation directory, then the index
+        atomically, so readers never see a partial file or a missing matrix.
+        """
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        arrays_root = _arrays_root(path)
+        self.arrays = write_arrays(arrays_root, {
+            "data": self.matrix.data,
+            "indices": self.matrix.indices,
+            "indptr": self.matrix.indptr,
+        })
+        tmp_path = path.with_suffix(path.suffix + '.tmp')
+        joblib.dump(self, tmp_path)
+        os.replace(tmp_path, path)
+        remove_old_generations(arrays_root)
+
+    @staticmethod
+    def load(path):
+        index = joblib.load(path)
+        # Indexes saved before the matrix was mapped still have it pickled
+        if index.matrix is None and getattr(index, "arrays", None) is not None:
+            arrays = load_arrays(_arrays_root(path), index.arrays, ("data", "indices", "indptr"))
+            index.matrix = sparse.csr_matrix(
+                (arrays["data"], arrays["indices"], arrays["indptr"]),
+                shape=index.matrix_shape, copy=False
+            )
+        return index
+
+
+def _arrays_root(path):
+    return Path(path).with_suffix('')
+
+
+# ============ SHARED INDEX ============
+
+_index = None
+_index_mtime = None
+_index_lock = threading.Lock()
+
+
+def _index_path():
+    return Path(settings.RECSYS_DATA_DIR) / 'article_index.joblib'
+
+
+def get_article_index():
+    """
+    Return the persisted index, reloading it when another process has saved
+    a newer version. Returns None if no index has been built yet.
+    """
+    global _index, _index_mtime
+    path = _index_path()
+    try:
+        mtime = path.stat().st_mtime
+    except FileNotFoundError:
+        return _index
+
+    with _index_lock:
+        if _index is None or mtime != _index_mtime:
+            try:
+                _index = ArticleVectorIndex.load(path)
+                _index_mtime = mtime
+                logger.info(f"📚 Loaded article index v{_index.version} ({len(_index)} articles)")
+            except Exception as e:
+                logger.error(f"❌ Could not load article index: {str(e)}")
+        return _index
+
+
+def rebuild_article_index():
+    """Fit a fresh index over every stored article and persist it."""
+    from ..db import articles_collection
+
+    global _index, _index_mtime
+    articles = list(articles_collection.find({}, {"_id": 0, "url": 1, "title": 1, "summary": 1}))
+    if not articles:
+        return None
+    index = ArticleVectorIndex(max_features=settings.ARTICLE_INDEX_MAX_FEATURES).fit(articles)
+    if _index is not None:
+        index.version = _index.version + 1
+
+    path = _index_path()
+    index.save(path)
+    with _index_lock:
+        _index, _index_mtime = index, path.stat().st_mtime
+    logger.info(f"📚 Rebuilt article index ({len(index)} articles)")
+    return index
+
+
+def update_article_index(urls):
+    """
+    Add newly ingested articles to the persisted index. The vocabulary is
+    refitted once the corpus has grown by ARTICLE_INDEX_REFIT_RATIO since the
+    last fit, so IDF weights and new terms do not drift too far.
+    """
+    from ..db import articles_collection
+
+    global _index_mtime
+    index = get_article_index()
+    if index is None or index.vectorizer is None:
+        return rebuild_article_index()
+    if not urls:
+        return index
+
+    articles = list(articles_collection.find(
+        {"url": {"$in": list(urls)}},
+        {"_id": 0, "url": 1, "title": 1, "summary": 1}
+    ))
+    if len(index) + len(articles) > index.fitted_rows * (1 + settings.ARTICLE_INDEX_REFIT_RATIO):
+        return rebuild_article_index()
+
+    with _index_lock:
+        added = index.add(articles)
+        if added:
+            path = _index_path()
+            index.save(path)
+            _index_mtime = path.stat().st_mtime
+    logger.info(f"📚 Added {added} articles to the index")
+    return index
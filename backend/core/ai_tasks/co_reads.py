@@ -0,0 +1,235 @@
+"""
+Item-item collaborative filtering from reading history.
+A periodic job streams every user's reads and counts how often two articles
+were read by the same user. Counts are normalized to cosine similarities
+(co-reads / sqrt(readers_a * readers_b)) and pruned to each article's
+strongest neighbours, so "readers of X also read Y" is a sparse row lookup.
+"""
+
+from django.conf import settings
+from scipy import sparse
+from pathlib import Path
+import numpy as np
+import threading
+import joblib
+import os
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class CoReadAccumulator:
+    """
+    Builds the co-read count matrix in bounded memory: pair events are
+    buffered in fixed-size arrays and folded into a sparse matrix chunk by
+    chunk, so memory follows the number of distinct pairs, not events.
+    """
+
+    def __init__(self, chunk_size=1_000_000):
+        self.chunk_size = chunk_size
+        self.row_of = {}
+        self.urls = []
+        self.readers = np.zeros(0, dtype=np.int64)  # distinct readers per article
+        self.counts = sparse.csr_matrix((0, 0), dtype=np.int64)  # upper triangle
+        self._rows = np.empty(chunk_size, dtype=np.int64)
+        self._cols = np.empty(chunk_size, dtype=np.int64)
+        self._buffered = 0
+
+    def _ids(self, urls):
+        ids = []
+        for url in urls:
+            if url not in self.row_of:
+                self.row_of[url] = len(self.urls)
+                self.urls.append(url)
+            ids.append(self.row_of[url])
+        return np.array(ids, dtype=np.int64)
+
+    def add_user(self, urls):
+        """Count one user's distinct reads: every pair of them is one co-read."""
+        if not urls:
+            return
+        ids = np.sort(self._ids(urls))
+        if len(self.readers) < len(self.row_of):
+            self.readers = np.concatenate([self.readers, np.zeros(len(self.row_of) - len(self.readers), dtype=np.int64)])
+        self.readers[ids] += 1
+
+        first, second = np.triu_indices(len(ids), k=1)
+        rows, cols = ids[first], ids[second]
+        for start in range(0, len(rows), self.chunk_size):
+            end = min(start + self.chunk_size, len(rows))
+            if self._buffered + end - start > self.chunk_size:
+                self._flush()
+            n = end - start
+            self._rows[self._buffered:self._buffered + n] = rows[start:end]
+            self._cols[self._buffered:self._buffered + n] = cols[start:end]
+            self._buffered += n
+
+    def _flush(self):
+        n_items = len(self.row_of)
+        if self.counts.shape[0] < n_items:
+            self.counts.resize((n_items, n_items))
+        if self._buffered:
+            chunk = sparse.coo_matrix(
+                (np.ones(self._buffered, dtype=np.int64), (self._rows[:self._buffered], self._cols[:self._buffered])),
+                shape=(n_items, n_items)
+            ).tocsr()  # duplicate pairs are summed here
+            self.counts = self.counts + chunk
+            self._buffered = 0
+
+    def similarities(self, min_count=2, neighbours=50):
+        """Cosine-normalized co-read matrix keeping the top ``neighbours`` per article."""
+        self._flush()
+        counts = self.counts + self.counts.T
+        counts.data[counts.data < min_count] = 0
+        counts.eliminate_zeros()
+
+        scale = sparse.diags(1.0 / np.sqrt(np.maximum(self.readers, 1)))
+        similar = (scale @ counts.astype(np.float64) @ scale).tocsr()
+
+        # Keep each article's strongest neighbours
+        for row in range(similar.shape[0]):
+            start, end = similar.indptr[row], similar.indptr[row + 1]
+            if end - start > neighbours:
+                values = similar.data[start:end]
+                values[np.argpartition(values, -neighbours)[:-neighbours]] = 0
+        similar.eliminate_zeros()
+        return similar.astype(np.float32)
+
+
+class CoReadIndex:
+    """Item-item similarities from co-reads, addressable by article URL."""
+
+    def __init__(self, urls, matrix, users, events):
+        self.urls = urls
+        self.row_of = {url: row for row, url in enumerate(urls)}
+        self.matrix = matrix
+        self.users = users
+        self.events = events
+
+    def __len__(self):
+        return len(self.urls)
+
+    def neighbour_scores(self, read_urls):
+        """
+        Strongest similarity of every article to any of ``read_urls``.
+
+        Returns:
+            np.ndarray or None: One value per index row, None if no read is indexed
+        """
+        rows = [self.row_of[url] for url in read_urls if url in self.row_of]
+        if not rows:
+            return None
+        return self.matrix[rows].max(axis=0).toarray().ravel()
+
+    def neighbours(self, read_urls, k=100):
+        """URLs of the ``k`` articles most co-read with ``read_urls``."""
+        scores = self.neighbour_scores(read_urls)
+        if scores is None:
+            return []
+        top = np.flatnonzero(scores)
+        if len(top) > k:
+            top = top[np.argpartition(-scores[top], k - 1)[:k]]
+        return [self.urls[row] for row in top[np.argsort(-scores[top], kind='stable')]]
+
+    def scores_for(self, articles, read_urls):
+        """Co-read similarity (0-1) of each article to the reads, in order."""
+        scores = self.neighbour_scores(read_urls)
+        if scores is None:
+            return np.zeros(len(articles))
+        return np.array([
+            scores[self.row_of[a.get('url')]] if a.get('url') in self.row_of else 0.0
+            for a in articles
+        ])
+
+    def save(self, path):
+        """Write the index atomically so readers never see a partial file."""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(path.suffix + '.tmp')
+        joblib.dump(self, tmp_path)
+        os.replace(tmp_path, path)
+
+    @staticmethod
+    def load(path):
+        return joblib.load(path)
+
+
+# ============ SHARED INDEX ============
+
+_co_reads = None
+_co_reads_mtime = None
+_co_reads_lock = threading.Lock()
+
+
+def _co_reads_path():
+    return Path(settings.RECSYS_DATA_DIR) / 'co_reads.joblib'
+
+
+def get_co_read_index():
+    """
+    Return the persisted co-read index, reloading it when the job has saved
+    a newer one. Returns None if the job has not run yet.
+    """
+    global _co_reads, _co_reads_mtime
+    path = _co_reads_path()
+    try:
+        mtime = path.stat().st_mtime
+    except FileNotFoundError:
+        return _co_reads
+
+    with _co_reads_lock:
+        if _co_reads is None or mtime != _co_reads_mtime:
+            try:
+                _co_reads = CoReadIndex.load(path)
+                _co_reads_mtime = mtime
+                logger.info(f"🤝 Loaded co-read index ({len(_co_reads)} articles, {_co_reads.matrix.nnz} pairs)")
+            except Exception as e:
+                logger.error(f"❌ Could not load co-read index: {str(e)}")
+        return _co_reads
+
+
+def build_co_read_index(batch_size=5000):
+    """
+    Stream reading_history grouped by user and build the co-read index.
+    Only each user's CO_READ_MAX_ITEMS_PER_USER most recent distinct reads
+    count, which bounds the pairs a single heavy reader can add.
+    """
+    from ..db import reading_history_collection
+
+    global _co_reads, _co_reads_mtime
+    max_items = settings.CO_READ_MAX_ITEMS_PER_USER
+    accumulator = CoReadAccumulator(chunk_size=settings.CO_READ_CHUNK_SIZE)
+
+    cursor = reading_history_collection.find(
+        {}, {"_id": 0, "username": 1, "article_url": 1}
+    ).sort([("username", 1), ("timestamp", -1)]).batch_size(batch_size)
+
+    current_user, reads, users, events = None, {}, 0, 0
+    for event in cursor:
+        events += 1
+        if event.get("username") != current_user:
+            accumulator.add_user(list(reads))
+            current_user, reads = event.get("username"), {}
+            users += 1
+        url = event.get("article_url")
+        if url and len(reads) < max_items:
+            reads[url] = None  # dict keeps first (most recent) occurrence order
+        if events % 100000 == 0:
+            logger.info(f"🤝 Co-read job: {events} events from {users} users")
+    accumulator.add_user(list(reads))
+
+    index = CoReadIndex(
+        accumulator.urls,
+        accumulator.similarities(
+            min_count=settings.CO_READ_MIN_COUNT,
+            neighbours=settings.CO_READ_NEIGHBOURS
+        ),
+        users,
+        events
+    )
+    path = _co_reads_path()
+    index.save(path)
+    with _co_reads_lock:
+        _co_reads, _co_reads_mtime = index, path.stat().st_mtime
+    logger.info(f"🤝 Built co-read index from {events} reads by {users} users ({index.matrix.nnz} pairs)")
+    return index
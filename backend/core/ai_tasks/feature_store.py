@@ -0,0 +1,253 @@
+"""
+Compact columnar snapshot of the article features used for ranking.
+Written at ingest as plain .npy files in a fresh generation directory and
+published by atomically replacing a CURRENT pointer file. Web workers map the
+arrays read-only (np.load with mmap_mode='r'), so every worker shares the same
+page cache pages instead of holding the corpus as Python dicts, and candidate
+generation and scoring slice the arrays without copying the corpus.
+"""
+
+from django.conf import settings
+from pathlib import Path
+from datetime import datetime
+from .recommendations import _published_timestamp
+import numpy as np
+import threading
+import hashlib
+import shutil
+import json
+import uuid
+import os
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Sentiment labels by code; 0 is "not analyzed"
+SENTIMENTS = ["", "Positive", "Neutral", "Negative"]
+
+# Generations kept on disk: the current one and the one workers may still have mapped
+KEEP_GENERATIONS = 2
+
+
+def url_hash(url):
+    """Stable 64-bit hash of a URL, used to look rows up without a dict per worker."""
+    return int.from_bytes(hashlib.blake2b(url.encode("utf-8"), digest_size=8).digest(), "little")
+
+
+class ArticleFeatureStore:
+    """
+    Read-only view of one snapshot generation. One entry per article in
+    every array:
+
+    - url_hashes / hash_rows: sorted URL hashes and the row of each, for lookups by URL
+    - url_offsets / url_bytes: the UTF-8 URLs, concatenated
+    - category_codes: index into ``categories``
+    - published: POSIX timestamps of publishedAt (NaN when unknown)
+    - sentiment_codes: index into SENTIMENTS
+    - vector_rows: row in the ArticleVectorIndex with ``index_fit_id`` (-1 if not indexed)
+    """
+
+    ARRAYS = (
+        "url_hashes", "hash_rows", "url_offsets", "url_bytes",
+        "category_codes", "published", "sentiment_codes", "vector_rows",
+    )
+
+    def __init__(self, path):
+        self.path = Path(path)
+        meta = json.loads((self.path / "meta.json").read_text())
+        self.generation = meta["generation"]
+        self.categories = meta["categories"]
+        self.code_of = {category: code for code, category in enumerate(self.categories)}
+        self.index_fit_id = meta["index_fit_id"]
+        self.created_at = meta["created_at"]
+        for name in self.ARRAYS:
+            setattr(self, name, np.load(self.path / f"{name}.npy", mmap_mode="r"))
+
+    def __len__(self):
+        return len(self.category_codes)
+
+    def rows_for(self, urls):
+        """Rows of the known URLs among ``urls``, in order (unknown URLs are skipped)."""
+        if not len(self) or not urls:
+            return np.zeros(0, dtype=np.int64)
+        hashes = np.fromiter((url_hash(url) for url in urls), dtype=np.uint64, count=len(urls))
+        positions = np.minimum(np.searchsorted(self.url_hashes, hashes), len(self) - 1)
+        found = self.url_hashes[positions] == hashes
+        return np.asarray(self.hash_rows[positions[found]], dtype=np.int64)
+
+    def urls(self, rows):
+        """URLs of ``rows``, in order."""
+        return [
+            bytes(self.url_bytes[self.url_offsets[row]:self.url_offsets[row + 1]]).decode("utf-8")
+            for row in rows
+        ]
+
+    def codes_for(self, categories):
+        """Category codes of the known ``categories``."""
+        return [self.code_of[c] for c in categories if c in self.code_of]
+
+    def newest(self, k, category_codes=None, exclude_rows=()):
+        """
+        Rows of the ``k`` most recently published articles, newest first,
+        optionally only in ``category_codes`` and never in ``exclude_rows``.
+        """
+        if category_codes is not None:
+            eligible = np.isin(self.category_codes, category_codes)
+        else:
+            eligible = np.ones(len(self), dtype=bool)
+        eligible[np.asarray(exclude_rows, dtype=np.int64)] = False
+        rows = np.flatnonzero(eligible)
+        if k <= 0 or not len(rows):
+            return np.zeros(0, dtype=np.int64)
+
+        # Unknown dates sort last, like missing fields in a descending Mongo sort
+        published = np.nan_to_num(self.published[rows], nan=-np.inf)
+        if k < len(rows):
+            top = np.argpartition(-published, k - 1)[:k]
+            rows, published = rows[top], published[top]
+        return rows[np.argsort(-published, kind="stable")]
+
+
+def _store_root():
+    return Path(settings.RECSYS_DATA_DIR) / "features"
+
+
+def _current_path():
+    return _store_root() / "CURRENT"
+
+
+def write_feature_store(article_index=None, batch_size=5000):
+    """
+    Snapshot every stored article's ranking features into a new generation
+    and make it current.
+
+    Args:
+        article_index (ArticleVectorIndex): Index whose rows ``vector_rows`` point at
+
+    Returns:
+        ArticleFeatureStore: The new snapshot, None if no articles are stored
+    """
+    from ..db import articles_collection
+
+    global _store, _store_mtime
+    urls, categories, published, sentiments, vector_rows = [], [], [], [], []
+    code_of = {}
+    sentiment_code = {label: code for code, label in enumerate(SENTIMENTS)}
+    row_of = article_index.row_of if article_index is not None else {}
+
+    cursor = articles_collection.find(
+        {}, {"_id": 0, "url": 1, "category": 1, "publishedAt": 1, "sentiment_label": 1}
+    ).batch_size(batch_size)
+    for article in cursor:
+        url = article.get("url")
+        if not url:
+            continue
+        urls.append(url.encode("utf-8"))
+        categories.append(code_of.setdefault(article.get("category", ""), len(code_of)))
+        published_at = article.get("publishedAt", "")
+        published.append(_published_timestamp(published_at) if isinstance(published_at, str) else np.nan)
+        sentiments.append(sentiment_code.get(article.get("sentiment_label", ""), 0))
+        vector_rows.append(row_of.get(url, -1))
+    if not urls:
+        return None
+
+    hashes = np.fromiter((url_hash(url.decode("utf-8")) for url in urls), dtype=np.uint64, count=len(urls))
+    order = np.argsort(hashes, kind="stable")
+    arrays = {
+        "url_hashes": hashes[order],
+        "hash_rows": order.astype(np.int64),
+        "url_offsets": np.concatenate([[0], np.cumsum([len(url) for url in urls], dtype=np.int64)]).astype(np.int64),
+        "url_bytes": np.frombuffer(b"".join(urls), dtype=np.uint8),
+        "category_codes": np.array(categories, dtype=np.int32),
+        "published": np.array(published, dtype=np.float64),
+        "sentiment_codes": np.array(sentiments, dtype=np.int8),
+        "vector_rows": np.array(vector_rows, dtype=np.int64),
+    }
+
+    # Write the generation under a temporary name, then publish it with one rename
+    root = _store_root()
+    root.mkdir(parents=True, exist_ok=True)
+    current = get_feature_store()
+    generation = current.generation + 1 if current is not None else 1
+    name = f"g{generation:06d}-{uuid.uuid4().hex[:8]}"
+    tmp_dir = root / f".{name}.tmp"
+    tmp_dir.mkdir()
+    for array_name, values in arrays.items():
+        np.save(tmp_dir / f"{array_name}.npy", values)
+    (tmp_dir / "meta.json").write_text(json.dumps({
+        "generation": generation,
+        "categories": list(code_of),
+        "index_fit_id": article_index.fit_id if article_index is not None else None,
+        "created_at": datetime.utcnow().isoformat(),
+        "articles": len(urls),
+    }))
+    os.replace(tmp_dir, root / name)
+
+    pointer = root / "CURRENT.tmp"
+    pointer.write_text(name)
+    os.replace(pointer, _current_path())
+
+    # Older generations stay mapped by workers until they reload; unlinking is safe
+    for path in sorted(root.glob("g*"))[:-KEEP_GENERATIONS]:
+        shutil.rmtree(path, ignore_errors=True)
+
+    store = ArticleFeatureStore(root / name)
+    with _store_lock:
+        _store, _store_mtime = store, _current_path().stat().st_mtime
+    logger.info(f"🗂️ Wrote feature store generation {generation} ({len(store)} articles)")
+    return store
+
+
+# ============ SHARED SNAPSHOT ============
+
+_store = None
+_store_mtime = None
+_store_lock = threading.Lock()
+
+
+def get_feature_store():
+    """
+    Return the current snapshot, mapping a new generation when CURRENT has
+    been replaced. Returns None if no snapshot has been written yet.
+    """
+    global _store, _store_mtime
+    path = _current_path()
+    try:
+        mtime = path.stat().st_mtime
+    except FileNotFoundError:
+        return _store
+
+    with _store_lock:
+        if _store is None or mtime != _store_mtime:
+            try:
+                name = path.read_text().strip()
+                if _store is None or _store.path.name != name:
+                    _store = ArticleFeatureStore(_store_root() / name)
+                    logger.info(f"🗂️ Mapped feature store generation {_store.generation} ({len(_store)} articles)")
+                _store_mtime = mtime
+            except Exception as e:
+                logger.error(f"❌ Could not load feature store: {str(e)}")
+        return _store
+
+
+def hydrate_articles(items):
+    """
+    Replace article references (dicts with a "url") by the stored documents
+    merged with the reference's other fields. References to articles that no
+    longer exist are dropped; order is kept.
+    """
+    from ..db import articles_collection
+
+    if not items:
+        return []
+    articles = {
+        article["url"]: article
+        for article in articles_collection.find(
+            {"url": {"$in": [item["url"] for item in items]}},
+            {"_id": 0, "content": 0}
+        )
+    }
+    return [
+        {**articles[item["url"]], **{k: v for k, v in item.items() if k != "url"}}
+        for item in items if item["url"] in articles
+    ]
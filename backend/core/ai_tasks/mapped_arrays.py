@@ -0,0 +1,49 @@
+"""
+Large index arrays persisted as .npy files and mapped read-only by readers.
+Each save writes a fresh generation directory (under a temporary name, then
+renamed into place), so files a worker has mapped are never rewritten, and
+np.load(mmap_mode='r') lets every worker share the same page cache pages
+instead of unpickling a private copy.
+"""
+
+from pathlib import Path
+import numpy as np
+import shutil
+import time
+import uuid
+import os
+
+# Generations kept on disk: the current one and the one workers may still have mapped
+KEEP_GENERATIONS = 2
+
+
+def write_arrays(root, arrays):
+    """
+    Write ``arrays`` (name -> np.ndarray) into a new generation directory under ``root``.
+
+    Returns:
+        str: Name of the generation directory
+    """
+    root = Path(root)
+    root.mkdir(parents=True, exist_ok=True)
+    # Fixed-width nanosecond prefix: names sort in write order
+    name = f"{time.time_ns()}-{uuid.uuid4().hex[:8]}"
+    tmp_dir = root / f".{name}.tmp"
+    tmp_dir.mkdir()
+    for array_name, values in arrays.items():
+        np.save(tmp_dir / f"{array_name}.npy", np.ascontiguousarray(values))
+    os.replace(tmp_dir, root / name)
+    return name
+
+
+def load_arrays(root, name, names):
+    """Map the arrays ``names`` of generation ``name`` read-only."""
+    directory = Path(root) / name
+    return {array_name: np.load(directory / f"{array_name}.npy", mmap_mode="r") for array_name in names}
+
+
+def remove_old_generations(root, keep=KEEP_GENERATIONS):
+    """Delete all but the ``keep`` newest generations; mapped files stay valid until unmapped."""
+    generations = sorted(path for path in Path(root).iterdir() if path.is_dir() and not path.name.startswith("."))
+    for path in generations[:-keep]:
+        shutil.rmtree(path, ignore_errors=True)
@@ -107,36 +107,47 @@ def filter_valid_entities(entities):
     
     return valid
 
+def _prepare_text(text):
+    """Return the text window fed to the model, or None if it is too short."""
+    if not text or len(text.split()) < 20:
+        return None
+    
+    # Limit text length for efficiency
+    words = text.split()
+    if len(words) > 300:
+        # Take first 200 and last 100 words (usually contain key entities)
+        text = ' '.join(words[:200] + words[-100:])
+    return text
+
+def _entities_from_results(results):
+    """Turn raw pipeline output for one text into the final entity list."""
+    # Extract entity words with score threshold
+    raw_entities = [
+        ent['word'] 
+        for ent in results 
+        if ent['entity_group'] in ["PER", "LOC", "ORG", "MISC"] 
+        and ent.get('score', 0) > 0.80  # Slightly lower threshold for better recall
+    ]
+    
+    # Filter and clean entities
+    entities = filter_valid_entities(raw_entities)
+    
+    # Limit to top 15 most relevant (increased from 10)
+    return entities[:15]
+
 def extract_entities(text):
     """Extract clean, meaningful entities from text."""
     try:
-        if not text or len(text.split()) < 20:
+        text = _prepare_text(text)
+        if text is None:
             return []
 
         ner_pipeline = _get_ner_pipeline()
         
-        # Limit text length for efficiency
-        words = text.split()
-        if len(words) > 300:
-            # Take first 200 and last 100 words (usually contain key entities)
-            text = ' '.join(words[:200] + words[-100:])
-        
         # Run NER
         results = ner_pipeline(text)
         
-        # Extract entity words with score threshold
-        raw_entities = [
-            ent['word'] 
-            for ent in results 
-            if ent['entity_group'] in ["PER", "LOC", "ORG", "MISC"] 
-            and ent.get('score', 0) > 0.80  # Slightly lower threshold for better recall
-        ]
-        
-        # Filter and clean entities
-        entities = filter_valid_entities(raw_entities)
-        
-        # Limit to top 15 most relevant (increased from 10)
-        entities = entities[:15]
+        entities = _entities_from_results(results)
         
         print(f"✅ Extracted {len(entities)} entities: {entities[:5]}")
         return entities
@@ -145,3 +156,36 @@ def extract_entities(text):
         print(f"❌ NER failed: {e}")
         return []
 
+def extract_entities_batch(texts, batch_size=8):
+    """
+    Extract entities for many texts with one batched pipeline call.
+    
+    Uses the same head-and-tail window, post-processing and 15-entity cap as
+    extract_entities. If the batched call fails, texts are retried one by one.
+    
+    Args:
+        texts (list): Texts to analyze
+        batch_size (int): Texts per forward pass of the token-classification model
+        
+    Returns:
+        list: Entity lists, in the same order as ``texts``
+    """
+    entities = [[] for _ in texts]
+    prepared = [(i, _prepare_text(text)) for i, text in enumerate(texts)]
+    prepared = [(i, t) for i, t in prepared if t is not None]
+    if not prepared:
+        return entities
+    
+    try:
+        ner_pipeline = _get_ner_pipeline()
+        results = ner_pipeline([t for _, t in prepared], batch_size=batch_size)
+        for (i, _), result in zip(prepared, results):
+            entities[i] = _entities_from_results(result)
+    except Exception as e:
+        print(f"❌ Batched NER failed, retrying per text: {e}")
+        for i, text in prepared:
+            entities[i] = extract_entities(text)
+        return entities
+    
+    print(f"✅ Extracted entities for {len(prepared)} texts")
+    return entities
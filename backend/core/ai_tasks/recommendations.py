@@ -3,40 +3,62 @@ ML-based recommendation engine for personalized news feed.
 Uses TF-IDF for content similarity and collaborative filtering.
 """
 
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
+from .article_index import ArticleVectorIndex
+from django.conf import settings
+from scipy import sparse
 from datetime import datetime, timedelta
-from collections import Counter
+from functools import lru_cache
 import numpy as np
 import logging
+import time
 
 logger = logging.getLogger(__name__)
 
 
+@lru_cache(maxsize=100000)
+def _parse_published_at(published_at):
+    try:
+        return datetime.fromisoformat(published_at.replace('Z', '+00:00')).timestamp()
+    except (ValueError, AttributeError):
+        return np.nan
+
+
+def _published_timestamp(published_at):
+    """
+    POSIX timestamp of a publishedAt value (NaN if missing or unparseable).
+    ISO strings are parsed once and cached, since the same articles are
+    scored on every request.
+    """
+    if not published_at:
+        return np.nan
+    if isinstance(published_at, str):
+        return _parse_published_at(published_at)
+    try:
+        return published_at.timestamp()
+    except (AttributeError, ValueError, OverflowError):
+        return np.nan
+
+
 class NewsRecommender:
     """
     Hybrid recommendation system combining:
     1. Content-based filtering (TF-IDF similarity)
-    2. Collaborative filtering (user behavior patterns)
+    2. Collaborative filtering (item-item co-reads across users)
     3. Category preferences
     4. Recency boost
     5. Diversity enhancement
     """
     
-    def __init__(self):
-        self.vectorizer = TfidfVectorizer(
-            max_features=1000,
-            stop_words='english',
-            ngram_range=(1, 2),
-            min_df=1
-        )
-    
     def get_personalized_recommendations(
         self, 
         user_preferences, 
         reading_history, 
         all_articles,
-        limit=50
+        limit=50,
+        article_index=None,
+        user_profile=None,
+        co_reads=None,
+        trending=None
     ):
         """
         Generate personalized article recommendations for a user.
@@ -46,6 +68,10 @@ class NewsRecommender:
             reading_history (list): User's reading history
             all_articles (list): All available articles
             limit (int): Number of recommendations to return
+            article_index (ArticleVectorIndex): Precomputed corpus TF-IDF index
+            user_profile (sparse row): User's interest centroid in ``article_index`` space
+            co_reads (CoReadIndex): Item-item co-read similarities
+            trending (dict): Global trending strength (0-1) by article URL
             
         Returns:
             list: Scored and ranked articles with recommendation reasons
@@ -69,63 +95,51 @@ class NewsRecommender:
                     reverse=True
                 )[:limit]
             
-            # Step 2: Score each article
-            scored_articles = []
+            # Candidate vectors, shared by content scoring and the diversity reranker
+            candidate_vectors = None
+            if article_index is not None and article_index.vectorizer is not None:
+                candidate_vectors = article_index.vectors_for(candidate_articles)
             
-            for article in candidate_articles:
-                score_breakdown = {
-                    'category_score': 0,
-                    'content_similarity_score': 0,
-                    'recency_score': 0,
-                    'popularity_score': 0
-                }
-                
-                # Category matching score (0-40 points)
-                category_score = self._calculate_category_score(
-                    article, user_preferences
-                )
-                score_breakdown['category_score'] = category_score
-                
-                # Content similarity score (0-30 points)
-                if reading_history:
-                    content_score = self._calculate_content_similarity(
-                        article, reading_history, all_articles
-                    )
-                    score_breakdown['content_similarity_score'] = content_score
-                
-                # Recency score (0-20 points)
-                recency_score = self._calculate_recency_score(article)
-                score_breakdown['recency_score'] = recency_score
-                
-                # Popularity/trending score (0-10 points)
-                popularity_score = self._calculate_popularity_score(
-                    article, reading_history
-                )
-                score_breakdown['popularity_score'] = popularity_score
-                
-                # Total score
-                total_score = sum(score_breakdown.values())
-                
-                # Determine recommendation reason
-                reason = self._get_recommendation_reason(
-                    score_breakdown, article, user_preferences
+            # Content similarity for all candidates at once (0-30 points)
+            if reading_history:
+                content_scores = self._calculate_content_similarity(
+                    candidate_articles, reading_history, all_articles, article_index, user_profile,
+                    candidate_vectors
                 )
-                
-                scored_articles.append({
-                    **article,
-                    'recommendation_score': total_score,
-                    'recommendation_reason': reason,
-                    'score_breakdown': score_breakdown
-                })
-            
-            # Step 3: Sort by score and apply diversity
-            scored_articles.sort(
-                key=lambda x: x['recommendation_score'], 
-                reverse=True
+            else:
+                content_scores = np.zeros(len(candidate_articles))
+            
+            # Collaborative score: co-read with the user's recent reads (0-15 points)
+            collaborative_scores = None
+            if reading_history and co_reads is not None:
+                recent_urls = [item['article_url'] for item in reading_history[:20]]
+                collaborative_scores = co_reads.scores_for(candidate_articles, recent_urls) * 15
+            
+            trending_strengths = None
+            if trending:
+                trending_strengths = np.array([trending.get(a.get('url'), 0.0) for a in candidate_articles])
+            
+            # Step 2: Score all candidates as columns
+            columns = self._score_candidates(
+                candidate_articles, user_preferences, reading_history, content_scores,
+                collaborative_scores, trending_strengths
             )
             
-            # Step 4: Enhance diversity (avoid too many articles from same category)
-            diverse_articles = self._enhance_diversity(scored_articles, limit)
+            # Step 3 + 4: Pick the top articles, skipping near-duplicates and
+            # limiting how many share a category
+            selected = self._select_top(
+                columns, limit,
+                self._cosine_lookup(candidate_vectors) if candidate_vectors is not None else None
+            )
+            
+            diverse_articles = [
+                self._scored_article(
+                    candidate_articles[i],
+                    self._score_breakdown(columns, i, reading_history, collaborative_scores, trending_strengths),
+                    user_preferences
+                )
+                for i in selected
+            ]
             
             logger.info(f"✅ Generated {len(diverse_articles)} personalized recommendations")
             return diverse_articles
@@ -135,6 +149,277 @@ class NewsRecommender:
             # Fallback to category-filtered articles
             return [a for a in all_articles if a.get('category') in user_preferences.get('categories', [])][:limit]
     
+    def rank_feature_rows(
+        self,
+        store,
+        rows,
+        user_preferences,
+        reading_history,
+        limit=50,
+        article_index=None,
+        user_profile=None,
+        co_reads=None,
+        trending=None
+    ):
+        """
+        Rank candidates given as rows of an ArticleFeatureStore. Features are
+        read from the mapped arrays, so only the picked articles are ever
+        turned into dicts.
+        
+        Args:
+            store (ArticleFeatureStore): Feature snapshot the rows belong to
+            rows (array): Candidate rows
+            article_index (ArticleVectorIndex): Index the store's vector rows point into
+            (other arguments as in get_personalized_recommendations)
+            
+        Returns:
+            list: Ranked references ({"url", "category"} plus scores and reason),
+                to be hydrated with the article documents
+        """
+        try:
+            read_rows = store.rows_for([item['article_url'] for item in reading_history])
+            rows = np.asarray(rows, dtype=np.int64)
+            rows = rows[~np.isin(rows, read_rows)]
+            if not len(rows):
+                return []
+            
+            urls = store.urls(rows)
+            category_codes = np.asarray(store.category_codes[rows], dtype=np.int64)
+            references = [
+                {'url': url, 'category': store.categories[code]}
+                for url, code in zip(urls, category_codes.tolist())
+            ]
+            
+            # Candidate vectors straight from the index rows; unindexed articles get empty rows
+            candidate_vectors = None
+            if article_index is not None and article_index.fit_id == store.index_fit_id:
+                vector_rows = np.asarray(store.vector_rows[rows])
+                candidate_vectors = sparse.diags((vector_rows >= 0).astype(np.float64)) @ \
+                    article_index.matrix[np.maximum(vector_rows, 0)]
+            
+            if reading_history and candidate_vectors is not None:
+                content_scores = self._calculate_content_similarity(
+                    references, reading_history, [], article_index, user_profile, candidate_vectors
+                )
+            else:
+                content_scores = np.zeros(len(rows))
+            
+            collaborative_scores = None
+            if reading_history and co_reads is not None:
+                recent_urls = [item['article_url'] for item in reading_history[:20]]
+                collaborative_scores = co_reads.scores_for(references, recent_urls) * 15
+            
+            trending_strengths = None
+            if trending:
+                trending_strengths = np.array([trending.get(url, 0.0) for url in urls])
+            
+            columns = self._score_features(
+                store.code_of, category_codes, np.asarray(store.published[rows]), category_codes,
+                user_preferences, reading_history, content_scores, collaborative_scores, trending_strengths
+            )
+            selected = self._select_top(
+                columns, limit,
+                self._cosine_lookup(candidate_vectors) if candidate_vectors is not None else None
+            )
+            return [
+                self._scored_article(
+                    references[i],
+                    self._score_breakdown(columns, i, reading_history, collaborative_scores, trending_strengths),
+                    user_preferences
+                )
+                for i in selected
+            ]
+            
+        except Exception as e:
+            logger.error(f"❌ Error ranking feature store candidates: {str(e)}")
+            return []
+    
+    def _score_candidates(self, candidates, user_preferences, reading_history, content_scores,
+                          collaborative_scores=None, trending_strengths=None):
+        """
+        Compute every score component for all candidates as NumPy arrays.
+        Gives the same values as the per-article _calculate_* methods.
+        
+        Returns:
+            dict: Score component arrays, plus 'total' and the 'diversity_codes'
+                used to group candidates by category
+        """
+        # Category codes: one integer per distinct category string
+        codes_of = {}
+        category_codes = np.fromiter(
+            (codes_of.setdefault(a.get('category', ''), len(codes_of)) for a in candidates),
+            dtype=np.int64, count=len(candidates)
+        )
+        # Unparseable dates are NaN
+        published = np.fromiter(
+            (_published_timestamp(a.get('publishedAt', '')) for a in candidates),
+            dtype=np.float64, count=len(candidates)
+        )
+        # Diversity groups missing categories under 'general'
+        diversity_of = {}
+        diversity_codes = np.fromiter(
+            (diversity_of.setdefault(a.get('category', 'general'), len(diversity_of)) for a in candidates),
+            dtype=np.int64, count=len(candidates)
+        )
+        return self._score_features(
+            codes_of, category_codes, published, diversity_codes,
+            user_preferences, reading_history, content_scores, collaborative_scores, trending_strengths
+        )
+    
+    def _score_features(self, codes_of, category_codes, published, diversity_codes,
+                        user_preferences, reading_history, content_scores,
+                        collaborative_scores=None, trending_strengths=None):
+        """
+        Score candidates given as feature columns: category codes (``codes_of``
+        maps category names to them), publish timestamps and diversity groups.
+        """
+        # Category matching score (0-40 points)
+        preferred = [codes_of[c] for c in user_preferences.get('categories', []) if c in codes_of]
+        category_score = np.where(np.isin(category_codes, preferred), 40, 0)
+        
+        # Recency score (0-20 points); unknown dates score 0
+        age_hours = (time.time() - published) / 3600
+        recency_score = np.select(
+            [age_hours < 6, age_hours < 24, age_hours < 48, age_hours < 168],
+            [20, 15, 10, 5],
+            default=0
+        )
+        
+        # Popularity/trending score (0-10 points): reads per category, scaled
+        category_reads = np.zeros(len(codes_of), dtype=np.int64)
+        for item in reading_history:
+            code = codes_of.get(item.get('category'))
+            if code is not None:
+                category_reads[code] += 1
+        popularity_score = np.minimum(category_reads[category_codes] * 2, 10)
+        if trending_strengths is not None:
+            # Or trending across all readers, whichever is stronger
+            popularity_score = np.maximum(popularity_score, np.asarray(trending_strengths) * 10)
+        
+        content_scores = np.asarray(content_scores, dtype=np.float64)
+        if collaborative_scores is None:
+            collaborative_scores = np.zeros(len(category_codes))
+        
+        return {
+            'category_score': category_score,
+            'content_similarity_score': content_scores,
+            'recency_score': recency_score,
+            'popularity_score': popularity_score,
+            'collaborative_score': collaborative_scores,
+            'total': category_score + content_scores + recency_score + popularity_score + collaborative_scores,
+            'diversity_codes': diversity_codes,
+        }
+    
+    def _score_breakdown(self, columns, i, reading_history, collaborative_scores=None, trending_strengths=None):
+        """Score components of candidate ``i`` as plain numbers."""
+        return {
+            'category_score': int(columns['category_score'][i]),
+            'content_similarity_score': float(columns['content_similarity_score'][i]) if reading_history else 0,
+            'recency_score': int(columns['recency_score'][i]),
+            'popularity_score': float(columns['popularity_score'][i]) if trending_strengths is not None else int(columns['popularity_score'][i]),
+            'collaborative_score': float(columns['collaborative_score'][i]) if collaborative_scores is not None else 0
+        }
+    
+    def _scored_article(self, article, score_breakdown, user_preferences):
+        """The article with its total score, breakdown and recommendation reason."""
+        return {
+            **article,
+            'recommendation_score': sum(score_breakdown.values()),
+            'recommendation_reason': self._get_recommendation_reason(
+                score_breakdown, article, user_preferences
+            ),
+            'score_breakdown': score_breakdown
+        }
+    
+    def _ranked(self, total, k):
+        """
+        Indices of the ``k`` highest totals, best first. Ties keep candidate
+        order, like a stable sort, including which of the items tied at the
+        ``k``-th total make the cut. Uses a partition so only ``k`` items are sorted.
+        """
+        n = len(total)
+        if k < n:
+            # argpartition picks arbitrarily among ties at the boundary, so
+            # take everything above the k-th total and the earliest tied items
+            kth = -np.partition(-total, k - 1)[k - 1]
+            above = np.flatnonzero(total > kth)
+            tied = np.flatnonzero(total == kth)[:k - len(above)]
+            top = np.concatenate([above, tied])
+        else:
+            top = np.arange(n)
+        return top[np.lexsort((top, -total[top]))]
+    
+    def _cosine_lookup(self, vectors):
+        """Function giving the similarity of candidate ``i`` to every candidate (rows are L2-normalized)."""
+        return lambda i: vectors @ vectors[i].toarray().ravel()
+    
+    def _select_top(self, columns, limit, similarity=None, mmr_lambda=None, category_cap=None):
+        """
+        Pick up to ``limit`` candidates by maximal marginal relevance: each pick
+        maximizes ``mmr_lambda * relevance - (1 - mmr_lambda) * similarity`` to the
+        articles already picked, so near-duplicate stories from different
+        sources do not crowd the top. With ``category_cap`` at most
+        max(3, limit // 5) share a category until the rest cannot fill the limit.
+        
+        Args:
+            columns (dict): Output of _score_candidates
+            limit (int): Number of candidates to pick
+            similarity (callable): Maps a candidate index to its cosine similarity
+                with every candidate; without it the picks follow the total score
+            mmr_lambda (float): Relevance/novelty trade-off (1 = relevance only)
+            category_cap (bool): Whether to cap picks per category
+            
+        Returns:
+            list: Indices of the picked candidates, in feed order
+        """
+        total, codes = columns['total'], columns['diversity_codes']
+        n = len(total)
+        if not n or limit <= 0:
+            return []
+        if mmr_lambda is None:
+            mmr_lambda = settings.RECOMMENDATION_MMR_LAMBDA
+        if category_cap is None:
+            category_cap = settings.RECOMMENDATION_CATEGORY_CAP
+        max_per_category = max(3, limit // 5) if category_cap else n  # At most 20% from same category
+        
+        # The picks nearly always come from a small head of the ranking; widen
+        # to the full ranking only when the capped head cannot fill the limit
+        k = min(n, limit * 4)
+        while True:
+            order = self._ranked(total, k)
+            head_codes = codes[order]
+            best = total[order[0]]
+            relevance = total[order] / best if best > 0 else np.zeros(len(order))
+            
+            max_similarity = np.zeros(len(order))
+            available = np.ones(len(order), dtype=bool)
+            counts = np.zeros(codes.max() + 1, dtype=np.int64)
+            picks = []
+            for _ in range(min(limit, len(order))):
+                allowed = available & (counts[head_codes] < max_per_category)
+                if not allowed.any():
+                    if k < n:
+                        break
+                    # Every category is at its cap: fill with the best of the rest
+                    allowed = available
+                marginal = mmr_lambda * relevance - (1 - mmr_lambda) * max_similarity
+                # argmax returns the first maximum, so ties keep ranking order
+                pick = int(np.argmax(np.where(allowed, marginal, -np.inf)))
+                picks.append(pick)
+                available[pick] = False
+                counts[head_codes[pick]] += 1
+                if similarity is not None and mmr_lambda < 1:
+                    # One similarity row per pick keeps the whole pass O(k * n)
+                    np.maximum(max_similarity, similarity(order[pick])[order], out=max_similarity)
+            
+            if len(picks) >= min(limit, n) or k == n:
+                break
+            k = n
+        
+        return order[picks].tolist()
+    
+    # Per-article scorers; _score_candidates is the vectorized equivalent
+    
     def _calculate_category_score(self, article, user_preferences):
         """Calculate score based on category match."""
         categories = user_preferences.get('categories', [])
@@ -145,46 +430,55 @@ class NewsRecommender:
             return 40
         return 0
     
-    def _calculate_content_similarity(self, article, reading_history, all_articles):
-        """Calculate content similarity with previously read articles."""
+    def _calculate_content_similarity(
+        self, candidates, reading_history, all_articles, article_index=None, user_profile=None, candidate_vectors=None
+    ):
+        """
+        Calculate content similarity of each candidate with previously read articles.
+        
+        Returns:
+            np.ndarray: Similarity to the stored interest profile (or the average
+                cosine similarity to the last 20 reads without one), scaled to 0-30
+        """
         try:
-            # Get texts from reading history
-            read_article_urls = [item['article_url'] for item in reading_history[:20]]  # Last 20 articles
-            read_articles = [
-                a for a in all_articles 
-                if a.get('url') in read_article_urls
-            ]
+            if user_profile is not None and article_index is not None:
+                # One product against the decayed centroid of everything the user read
+                if candidate_vectors is None:
+                    candidate_vectors = article_index.vectors_for(candidates)
+                similarities = candidate_vectors @ user_profile.T
+                return similarities.toarray().ravel() * 30
             
-            if not read_articles:
-                return 0
+            read_article_urls = {item['article_url'] for item in reading_history[:20]}  # Last 20 articles
             
-            # Prepare texts for TF-IDF
-            read_texts = [
-                f"{a.get('title', '')} {a.get('summary', '')}" 
-                for a in read_articles
-            ]
-            current_text = f"{article.get('title', '')} {article.get('summary', '')}"
+            index = article_index
+            if index is None or index.vectorizer is None:
+                # No persisted index yet: fit one for this request (once, not per candidate)
+                index = ArticleVectorIndex().fit(all_articles)
             
-            if not current_text.strip():
-                return 0
+            # Read articles come from the index; ones not indexed yet are vectorized on the fly
+            read_rows = index.rows(read_article_urls)
+            unindexed_reads = [
+                a for a in all_articles
+                if a.get('url') in read_article_urls and a.get('url') not in index.row_of
+            ]
+            if not read_rows and not unindexed_reads:
+                return np.zeros(len(candidates))
             
-            # Calculate TF-IDF similarity
-            all_texts = read_texts + [current_text]
-            tfidf_matrix = self.vectorizer.fit_transform(all_texts)
+            read_vectors = index.matrix[read_rows]
+            if unindexed_reads:
+                read_vectors = sparse.vstack([read_vectors, index.transform(unindexed_reads)], format='csr')
             
-            # Cosine similarity between current article and read articles
-            similarities = cosine_similarity(
-                tfidf_matrix[-1:],  # Current article
-                tfidf_matrix[:-1]   # Read articles
-            )[0]
+            # Rows are L2-normalized, so the sparse product gives cosine similarities
+            if candidate_vectors is None or index is not article_index:
+                candidate_vectors = index.vectors_for(candidates)
+            similarities = (candidate_vectors @ read_vectors.T).toarray()
             
             # Average similarity score, scaled to 0-30
-            avg_similarity = np.mean(similarities)
-            return float(avg_similarity * 30)
+            return similarities.mean(axis=1) * 30
             
         except Exception as e:
             logger.warning(f"Content similarity calculation failed: {str(e)}")
-            return 0
+            return np.zeros(len(candidates))
     
     def _calculate_recency_score(self, article):
         """Calculate score based on article recency."""
@@ -252,50 +546,29 @@ class NewsRecommender:
         if score_breakdown['popularity_score'] > 5:
             reasons.append("Trending in your interests")
         
+        if score_breakdown.get('collaborative_score', 0) > 5:
+            reasons.append("Readers like you also read this")
+        
         if not reasons:
             return "Recommended for you"
         
         return " • ".join(reasons)
-    
-    def _enhance_diversity(self, scored_articles, limit):
-        """
-        Ensure diversity in recommendations by limiting consecutive articles
-        from the same category.
-        """
-        if not scored_articles:
-            return []
-        
-        diverse_list = []
-        category_count = Counter()
-        max_per_category = max(3, limit // 5)  # At most 20% from same category
-        
-        # First pass: add high-scoring articles with diversity constraint
-        for article in scored_articles:
-            category = article.get('category', 'general')
-            
-            if category_count[category] < max_per_category:
-                diverse_list.append(article)
-                category_count[category] += 1
-                
-                if len(diverse_list) >= limit:
-                    break
-        
-        # Second pass: fill remaining slots if needed
-        if len(diverse_list) < limit:
-            for article in scored_articles:
-                if article not in diverse_list:
-                    diverse_list.append(article)
-                    if len(diverse_list) >= limit:
-                        break
-        
-        return diverse_list
 
 
 # Singleton instance
 recommender = NewsRecommender()
 
 
-def get_recommendations(user_preferences, reading_history, all_articles, limit=50):
+def get_recommendations(
+    user_preferences,
+    reading_history,
+    all_articles,
+    limit=50,
+    article_index=None,
+    user_profile=None,
+    co_reads=None,
+    trending=None
+):
     """
     Convenience function to get personalized recommendations.
     
@@ -304,6 +577,10 @@ def get_recommendations(user_preferences, reading_history, all_articles, limit=5
         reading_history (list): User's reading history
         all_articles (list): All available articles
         limit (int): Number of recommendations to return
+        article_index (ArticleVectorIndex): Precomputed corpus TF-IDF index
+        user_profile (sparse row): User's interest centroid in ``article_index`` space
+        co_reads (CoReadIndex): Item-item co-read similarities
+        trending (dict): Global trending strength (0-1) by article URL
         
     Returns:
         list: Personalized recommendations
@@ -312,5 +589,39 @@ def get_recommendations(user_preferences, reading_history, all_articles, limit=5
         user_preferences,
         reading_history,
         all_articles,
-        limit
+        limit,
+        article_index,
+        user_profile,
+        co_reads,
+        trending
+    )
+
+
+def get_feature_recommendations(
+    store,
+    rows,
+    user_preferences,
+    reading_history,
+    limit=50,
+    article_index=None,
+    user_profile=None,
+    co_reads=None,
+    trending=None
+):
+    """
+    Convenience function to rank feature store rows for a user.
+    
+    Returns:
+        list: Ranked article references (url, category, scores and reason)
+    """
+    return recommender.rank_feature_rows(
+        store,
+        rows,
+        user_preferences,
+        reading_history,
+        limit,
+        article_index,
+        user_profile,
+        co_reads,
+        trending
     )
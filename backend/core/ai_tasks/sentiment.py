@@ -58,20 +58,42 @@ def extract_meaningful_text(text, max_words=200):
     
     return combined
 
+def _prepare_text(text):
+    """Return the text fed to the model, or None if it is too short to analyze."""
+    if not text or len(text.strip()) < 20:
+        return None
+    
+    # Extract and clean meaningful text
+    processed_text = extract_meaningful_text(text, max_words=150)
+    
+    if len(processed_text.split()) < 10:
+        return None
+    return processed_text
+
+def _result_from_scores(scores):
+    """Turn one row of class probabilities into a label and confidence."""
+    predicted = torch.argmax(scores).item()
+    confidence = scores[predicted].item()
+
+    # Apply confidence threshold for neutral
+    if confidence < 0.6:
+        predicted = 1  # Default to Neutral if uncertain
+        confidence = scores[1].item()
+
+    return {
+        "label": labels[predicted],
+        "confidence": round(confidence, 3)
+    }
+
 def analyze_sentiment(text):
     """Analyze sentiment with improved accuracy."""
     try:
-        if not text or len(text.strip()) < 20:
+        processed_text = _prepare_text(text)
+        if processed_text is None:
             return {"label": "Neutral", "confidence": 0.0}
 
         tokenizer, model = _get_model()
         
-        # Extract and clean meaningful text
-        processed_text = extract_meaningful_text(text, max_words=150)
-        
-        if len(processed_text.split()) < 10:
-            return {"label": "Neutral", "confidence": 0.0}
-        
         # Tokenize with proper truncation
         inputs = tokenizer(
             processed_text,
@@ -85,18 +107,8 @@ def analyze_sentiment(text):
         with torch.no_grad():
             outputs = model(**inputs)
             scores = F.softmax(outputs.logits, dim=1)[0]
-            predicted = torch.argmax(scores).item()
-            confidence = scores[predicted].item()
-
-        # Apply confidence threshold for neutral
-        if confidence < 0.6:
-            predicted = 1  # Default to Neutral if uncertain
-            confidence = scores[1].item()
-
-        result = {
-            "label": labels[predicted],
-            "confidence": round(confidence, 3)
-        }
+
+        result = _result_from_scores(scores)
         
         print(f"✅ Sentiment: {result['label']} ({result['confidence']})")
         return result
@@ -104,3 +116,56 @@ def analyze_sentiment(text):
     except Exception as e:
         print(f"❌ Sentiment analysis failed: {e}")
         return {"label": "Neutral", "confidence": 0.0}
+
+def analyze_sentiment_batch(texts, batch_size=16):
+    """
+    Analyze sentiment for many texts with batched forward passes.
+    
+    Texts are sorted by length and run in micro-batches of ``batch_size`` so
+    each padded batch holds similarly sized inputs. Labels and confidence
+    thresholds are the same as analyze_sentiment.
+    
+    Args:
+        texts (list): Texts to analyze
+        batch_size (int): Maximum number of texts per forward pass
+        
+    Returns:
+        list: {"label", "confidence"} dicts, in the same order as ``texts``
+    """
+    results = [{"label": "Neutral", "confidence": 0.0} for _ in texts]
+    
+    prepared = [(i, _prepare_text(text)) for i, text in enumerate(texts)]
+    prepared = [(i, t) for i, t in prepared if t is not None]
+    if not prepared:
+        return results
+    
+    # Shortest first, so padding inside each micro-batch stays small
+    prepared.sort(key=lambda item: len(item[1]))
+    
+    try:
+        tokenizer, model = _get_model()
+    except Exception as e:
+        print(f"❌ Sentiment analysis failed: {e}")
+        return results
+    
+    for start in range(0, len(prepared), batch_size):
+        chunk = prepared[start:start + batch_size]
+        try:
+            inputs = tokenizer(
+                [t for _, t in chunk],
+                return_tensors="pt",
+                truncation=True,
+                max_length=512,
+                padding=True
+            )
+            with torch.no_grad():
+                outputs = model(**inputs)
+                scores = F.softmax(outputs.logits, dim=1)
+            
+            for row, (i, _) in enumerate(chunk):
+                results[i] = _result_from_scores(scores[row])
+        except Exception as e:
+            print(f"❌ Sentiment batch of {len(chunk)} failed: {e}")
+    
+    print(f"✅ Sentiment: analyzed {len(prepared)} texts in {-(-len(prepared) // batch_size)} batches")
+    return results
@@ -181,4 +181,107 @@ def generate_summary(text, use_fallback=False):
             return generate_summary(text, use_fallback=True)
         return ""
 
+def _summarize_buckets(summarizer, texts, max_len, min_len, batch_size):
+    """
+    Summarize texts in length-sorted buckets of ``batch_size``, one beam-search
+    batch per bucket.
+    
+    Returns:
+        tuple: ({index: summary}, [indexes of texts whose bucket failed])
+    """
+    order = sorted(range(len(texts)), key=lambda i: len(texts[i].split()))
+    summaries, failed = {}, []
+    
+    for start in range(0, len(order), batch_size):
+        bucket = order[start:start + batch_size]
+        try:
+            results = summarizer(
+                [texts[i] for i in bucket],
+                max_length=max_len,
+                min_length=min_len,
+                do_sample=False,
+                num_beams=4,
+                early_stopping=True,
+                batch_size=len(bucket)
+            )
+            for i, result in zip(bucket, results):
+                result = result[0] if isinstance(result, list) else result
+                summaries[i] = post_process_summary(result['summary_text'])
+        except Exception as e:
+            print(f"❌ Summarization batch of {len(bucket)} failed: {e}")
+            failed.extend(bucket)
+    
+    return summaries, failed
 
+def generate_summaries(texts, batch_size=8):
+    """
+    Generate summaries for many texts with batched beam search.
+    
+    Texts are grouped into length buckets so each batch pads to a similar
+    length. Texts under 80 words go to the T5 fallback model in their own
+    batches, and items from a failed BART batch are retried on the fallback
+    model without re-running the other batches.
+    
+    Args:
+        texts (list): Texts to summarize
+        batch_size (int): Maximum number of texts per generation batch
+        
+    Returns:
+        list: Summaries ("" when a text is too short or fails), in input order
+    """
+    summaries = [""] * len(texts)
+    primary_items, fallback_items = [], []
+    
+    for i, text in enumerate(texts):
+        if not text or len(text.split()) < 30:
+            continue
+        try:
+            # Clean and truncate the text
+            truncated_text = truncate_text(text, max_tokens=800)
+        except Exception as e:
+            print(f"❌ Summarization failed: {e}")
+            continue
+        
+        # Skip if cleaned text is too short
+        word_count = len(truncated_text.split())
+        if word_count < 30:
+            continue
+        
+        if word_count < 80:
+            fallback_items.append((i, truncated_text))
+        else:
+            primary_items.append((i, truncated_text))
+    
+    if primary_items:
+        try:
+            results, failed = _summarize_buckets(
+                _get_primary_summarizer(),
+                [t for _, t in primary_items],
+                max_len=130, min_len=40, batch_size=batch_size
+            )
+        except Exception as e:
+            print(f"❌ Summarization failed: {e}")
+            results, failed = {}, list(range(len(primary_items)))
+        
+        for j, summary in results.items():
+            summaries[primary_items[j][0]] = summary
+        if failed:
+            print(f"🔄 Retrying {len(failed)} texts on fallback model...")
+            fallback_items.extend(primary_items[j] for j in failed)
+    
+    if fallback_items:
+        try:
+            results, _ = _summarize_buckets(
+                _get_fallback_summarizer(),
+                [t for _, t in fallback_items],
+                max_len=60, min_len=20, batch_size=batch_size
+            )
+        except Exception as e:
+            print(f"❌ Fallback summarization failed: {e}")
+            results = {}
+        
+        for j, summary in results.items():
+            summaries[fallback_items[j][0]] = summary
+    
+    print(f"✅ Summaries generated: {sum(1 for s in summaries if s)}/{len(texts)}")
+    return summaries
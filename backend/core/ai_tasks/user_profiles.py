@@ -0,0 +1,252 @@
+"""
+Stored user interest profiles.
+A profile is the time-decayed centroid of the index vectors of the articles a
+user has read. It is updated incrementally on every tracked read, so scoring
+a user's candidates is a single vector-matrix product no matter how long
+their reading history is.
+"""
+
+from django.conf import settings
+from pymongo import UpdateOne
+from pymongo.errors import DuplicateKeyError
+from scipy import sparse
+from datetime import datetime
+import numpy as np
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+def _decay(elapsed_seconds):
+    """Weight left after ``elapsed_seconds`` given the configured half-life."""
+    half_life = settings.USER_PROFILE_HALF_LIFE_DAYS * 86400
+    return 0.5 ** (max(elapsed_seconds, 0) / half_life)
+
+
+def _article_vectors(urls, index):
+    """
+    Index vectors for ``urls`` in order. Articles not indexed yet are
+    vectorized from their stored title/summary; unknown URLs get None.
+    """
+    from ..db import articles_collection
+
+    missing = [url for url in urls if url not in index.row_of]
+    unindexed = {}
+    if missing:
+        articles = list(articles_collection.find(
+            {"url": {"$in": missing}},
+            {"_id": 0, "url": 1, "title": 1, "summary": 1}
+        ))
+        if articles:
+            for article, vector in zip(articles, index.transform(articles)):
+                unindexed[article["url"]] = vector
+
+    vectors = []
+    for url in urls:
+        if url in index.row_of:
+            vectors.append(index.matrix[index.row_of[url]])
+        else:
+            vectors.append(unindexed.get(url))
+    return vectors
+
+
+def _to_document(weights, weight_sum, updated_at, index):
+    """Sparse decayed sum -> profile document, keeping the strongest terms."""
+    weights = sparse.csr_matrix(weights)
+    cols, values = weights.indices, weights.data
+    max_terms = settings.USER_PROFILE_MAX_TERMS
+    if len(values) > max_terms:
+        keep = np.argpartition(values, -max_terms)[-max_terms:]
+        cols, values = cols[keep], values[keep]
+    return {
+        "cols": cols.tolist(),
+        "weights": values.tolist(),
+        "weight_sum": float(weight_sum),
+        "updated_at": updated_at,
+        "index_fit_id": index.fit_id,
+    }
+
+
+def _from_document(profile, index):
+    """Profile document -> (1 x vocabulary) sparse decayed sum."""
+    return sparse.csr_matrix(
+        (profile["weights"], ([0] * len(profile["cols"]), profile["cols"])),
+        shape=(1, index.matrix.shape[1])
+    )
+
+
+def recent_reads(usernames, limit, fields):
+    """
+    The last ``limit`` reads of each user, newest first, fetched for all
+    ``usernames`` with one aggregation instead of a query per user.
+
+    Args:
+        fields (tuple): Reading history fields to return for each read
+
+    Returns:
+        dict: username -> list of reads ([] for users without reads)
+    """
+    from ..db import reading_history_collection
+
+    reads = {username: [] for username in usernames}
+    if not reads:
+        return reads
+    # $topN keeps at most ``limit`` reads per user while grouping, so memory
+    # stays bounded by the batch size instead of the users' full histories
+    for doc in reading_history_collection.aggregate([
+        {"$match": {"username": {"$in": list(reads)}}},
+        {"$group": {"_id": "$username", "reads": {"$topN": {
+            "n": limit,
+            "sortBy": {"timestamp": -1},
+            "output": {field: f"${field}" for field in fields},
+        }}}},
+    ]):
+        reads[doc["_id"]] = doc["reads"]
+    return reads
+
+
+def build_user_profiles(usernames, index):
+    """
+    Build profiles from scratch out of the users' recent reading histories,
+    with one history query and one article lookup for all of them.
+    Used for new profiles and when the index vocabulary has been refitted.
+
+    Returns:
+        dict: username -> profile document
+    """
+    histories = recent_reads(usernames, settings.USER_PROFILE_HISTORY_LIMIT, ("article_url", "timestamp"))
+    vectors = iter(_article_vectors(
+        [item["article_url"] for username in usernames for item in histories[username]], index
+    ))
+
+    now = datetime.utcnow()
+    profiles = {}
+    for username in usernames:
+        weights = sparse.csr_matrix((1, index.matrix.shape[1]))
+        weight_sum = 0.0
+        for item in histories[username]:
+            vector = next(vectors)
+            if vector is None:
+                continue
+            weight = _decay((now - item.get("timestamp", now)).total_seconds())
+            weights = weights + vector * weight
+            weight_sum += weight
+        profiles[username] = _to_document(weights, weight_sum, now, index)
+    return profiles
+
+
+def build_user_profile(username, index):
+    """Build one user's profile from scratch (see build_user_profiles)."""
+    return build_user_profiles([username], index)[username]
+
+
+def record_read(username, article_url, index, read_at=None):
+    """
+    Fold one read into the user's stored profile: decay the running sum to
+    ``read_at`` and add the article's vector.
+
+    Returns:
+        bool: Whether the profile was updated
+    """
+    from ..db import user_profiles_collection
+
+    if index is None or index.vectorizer is None:
+        return False
+    read_at = read_at or datetime.utcnow()
+
+    # Optimistic concurrency: retry if another request updated the profile meanwhile
+    for _ in range(3):
+        stored = user_profiles_collection.find_one({"username": username})
+        if not stored or stored.get("index_fit_id") != index.fit_id:
+            # Unknown vocabulary: the history (which already holds this read) is the source of truth
+            profile = build_user_profile(username, index)
+        else:
+            vector = _article_vectors([article_url], index)[0]
+            if vector is None:
+                return False
+            factor = _decay((read_at - stored["updated_at"]).total_seconds())
+            profile = _to_document(
+                _from_document(stored, index) * factor + vector,
+                stored["weight_sum"] * factor + 1.0,
+                max(read_at, stored["updated_at"]),
+                index
+            )
+
+        try:
+            if stored:
+                result = user_profiles_collection.replace_one(
+                    {"_id": stored["_id"], "revision": stored.get("revision", 0)},
+                    {"username": username, "revision": stored.get("revision", 0) + 1, **profile}
+                )
+                if result.matched_count:
+                    return True
+            else:
+                user_profiles_collection.insert_one({"username": username, "revision": 1, **profile})
+                return True
+        except DuplicateKeyError:
+            pass
+
+    logger.warning(f"⚠️ Gave up updating the interest profile of {username} after concurrent writes")
+    return False
+
+
+def get_user_profile_vector(username, index):
+    """
+    Return the user's interest centroid as a (1 x vocabulary) sparse row, or
+    None if they have no usable reads. Profiles built against an older
+    vocabulary are rebuilt and stored.
+    """
+    from ..db import user_profiles_collection
+
+    if index is None or index.vectorizer is None:
+        return None
+
+    stored = user_profiles_collection.find_one({"username": username})
+    if not stored or stored.get("index_fit_id") != index.fit_id:
+        profile = build_user_profile(username, index)
+        user_profiles_collection.update_one(
+            {"username": username},
+            {"$set": profile, "$inc": {"revision": 1}},
+            upsert=True
+        )
+        stored = profile
+
+    if not stored["weight_sum"]:
+        return None
+    # The decay factor cancels out in sum / weight_sum, so the centroid needs no re-decaying
+    return _from_document(stored, index) / stored["weight_sum"]
+
+
+def get_user_profile_matrix(usernames, index):
+    """
+    Interest centroids of many users stacked as a (users x vocabulary) sparse
+    matrix, loaded with one query. Missing or outdated profiles are rebuilt
+    together and stored with one bulk write. Users without a usable profile
+    get an empty row.
+
+    Returns:
+        tuple: (matrix, np.ndarray of bool marking users that have a profile)
+    """
+    from ..db import user_profiles_collection
+
+    stored = {
+        doc["username"]: doc
+        for doc in user_profiles_collection.find({"username": {"$in": list(usernames)}})
+    }
+    outdated = [u for u in usernames if stored.get(u, {}).get("index_fit_id") != index.fit_id]
+    if outdated:
+        rebuilt = build_user_profiles(outdated, index)
+        user_profiles_collection.bulk_write([
+            UpdateOne({"username": username}, {"$set": profile, "$inc": {"revision": 1}}, upsert=True)
+            for username, profile in rebuilt.items()
+        ], ordered=False)
+        stored.update(rebuilt)
+
+    empty = sparse.csr_matrix((1, index.matrix.shape[1]))
+    rows, has_profile = [], []
+    for username in usernames:
+        doc = stored[username]
+        row = _from_document(doc, index) / doc["weight_sum"] if doc["weight_sum"] else None
+        rows.append(row if row is not None else empty)
+        has_profile.append(row is not None)
+    return sparse.vstack(rows, format="csr"), np.array(has_profile, dtype=bool)
@@ -0,0 +1,131 @@
+"""
+Process-pool workers for AI enrichment.
+Each worker process loads the transformer models once (on first use) and then
+enriches article batches, so enrichment throughput scales with the CPU cores
+instead of being limited to the Django process.
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from .summarize import generate_summaries
+from .sentiment import analyze_sentiment_batch
+from .ner import extract_entities_batch
+from .classify_category import predict_category, CATEGORY_LABELS
+import multiprocessing
+import threading
+import logging
+import torch
+
+logger = logging.getLogger(__name__)
+
+
+def enrich_batch(items, summary_batch_size=8, sentiment_batch_size=16, ner_batch_size=8):
+    """
+    Run summarization, sentiment, NER and categorization on a batch of articles.
+
+    Args:
+        items (list): Dicts with "title", "description", "category" and "full_content"
+
+    Returns:
+        list: Dicts with "summary", "sentiment_label", "sentiment_confidence",
+            "entities" and "category", in the same order as ``items``
+    """
+    texts = [item["full_content"] for item in items]
+    results = [{} for _ in items]
+    print(f"\n🔄 Processing batch of {len(items)}: {items[0]['title'][:60]}...")
+
+    # AI Processing - Summarization (length-bucketed beam search batches)
+    try:
+        summaries = generate_summaries(texts, batch_size=summary_batch_size)
+    except Exception as e:
+        print(f"⚠️ Summarization failed: {e}")
+        summaries = [""] * len(items)
+    for item, result, summary in zip(items, results, summaries):
+        # Use description as fallback
+        description = item.get("description", "")
+        result["summary"] = summary or (description[:200] if description else "")
+
+    # AI Processing - Sentiment Analysis (batched forward passes)
+    try:
+        sentiments = analyze_sentiment_batch(texts, batch_size=sentiment_batch_size)
+    except Exception as e:
+        print(f"⚠️ Sentiment analysis failed: {e}")
+        sentiments = [{"label": "Neutral", "confidence": 0.0}] * len(items)
+    for result, sentiment in zip(results, sentiments):
+        result["sentiment_label"] = sentiment["label"]
+        result["sentiment_confidence"] = sentiment["confidence"]
+
+    # AI Processing - Named Entity Recognition (batched)
+    try:
+        entities = extract_entities_batch(texts, batch_size=ner_batch_size)
+    except Exception as e:
+        print(f"⚠️ NER failed: {e}")
+        entities = [[] for _ in items]
+    for result, article_entities in zip(results, entities):
+        result["entities"] = article_entities
+
+    # AI Processing - Category Classification
+    for item, result in zip(items, results):
+        source_category = item.get("category", "general").lower()
+
+        if source_category != "general" and source_category in CATEGORY_LABELS:
+            result["category"] = source_category
+            print(f"✅ Category (from source): {source_category}")
+        else:
+            result["category"] = predict_category(
+                item["title"],
+                item["full_content"],
+                fallback_label="general"
+            )
+
+    return results
+
+
+def _init_worker(torch_threads):
+    """Pin torch's intra-op thread count so workers do not oversubscribe cores."""
+    torch.set_num_threads(torch_threads)
+
+
+class EnrichmentPool:
+    """
+    Pool of model worker processes. Batches are enriched with enrich_batch in
+    a worker process; a crashed pool is replaced on the next submission.
+    """
+
+    def __init__(self, size, torch_threads):
+        self.size = size
+        self.torch_threads = torch_threads
+        self._executor = None
+        self._lock = threading.Lock()
+
+    def _get_executor(self):
+        with self._lock:
+            if self._executor is None:
+                logger.info(f"🧠 Starting {self.size} enrichment workers ({self.torch_threads} torch threads each)")
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.size,
+                    # spawn: forking a process that already runs threads/torch is unsafe
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=_init_worker,
+                    initargs=(self.torch_threads,)
+                )
+            return self._executor
+
+    def enrich(self, items, **batch_sizes):
+        """Enrich a batch in a worker process and wait for the result."""
+        executor = self._get_executor()
+        try:
+            return executor.submit(enrich_batch, items, **batch_sizes).result()
+        except BrokenProcessPool:
+            logger.error("❌ Enrichment worker died, restarting the pool")
+            with self._lock:
+                if self._executor is executor:
+                    self._executor = None
+            executor.shutdown(wait=False, cancel_futures=True)
+            raise
+
+    def shutdown(self):
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor:
+            executor.shutdown(wait=True)
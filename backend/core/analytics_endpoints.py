@@ -4,6 +4,7 @@ from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework import status
 from .db import analytics_collection, reading_history_collection
+from .trending import record_engagement, session_weight
 from datetime import datetime, timedelta
 from collections import defaultdict, Counter
 import logging
@@ -48,6 +49,11 @@ def track_reading_session(request):
         
         analytics_collection.insert_one(session_data)
         
+        try:
+            record_engagement(article_url, category, session_weight(reading_time, completed), session_data["timestamp"])
+        except Exception as e:
+            logger.warning(f"⚠️ Could not update trending counters: {str(e)}")
+        
         logger.info(f"📊 Tracked reading session for user: {user}, article: {article_title[:50] if article_title else 'Unknown'}")
         return Response({
             "status": "success",
@@ -0,0 +1,85 @@
+"""
+Article bodies, stored apart from the article documents.
+The full scraped ``content`` is large and only the article detail endpoint
+needs it, so it lives in article_bodies keyed by a hash of the article URL.
+Article documents keep the compact metadata that list, search and
+recommendation queries filter, sort and rank on.
+"""
+
+from pymongo import UpdateOne
+from .db import articles_collection, article_bodies_collection
+import hashlib
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+def body_id(url):
+    """_id of the body of the article at ``url`` (hex 128-bit hash of the URL)."""
+    return hashlib.blake2b(url.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def body_operation(url, content):
+    """Upsert of one body; a body stored meanwhile is left untouched."""
+    return UpdateOne(
+        {"_id": body_id(url)},
+        {"$setOnInsert": {"url": url, "content": content}},
+        upsert=True
+    )
+
+
+def get_article_body(url):
+    """The stored content of the article at ``url``, None if there is none."""
+    doc = article_bodies_collection.find_one({"_id": body_id(url)}, {"_id": 0, "content": 1})
+    return doc.get("content") if doc else None
+
+
+def search_article_bodies(query):
+    """
+    Text search over the stored bodies.
+
+    Returns:
+        dict: url -> text score of every body matching ``query``
+    """
+    return {
+        doc["url"]: doc["score"]
+        for doc in article_bodies_collection.find(
+            {"$text": {"$search": query}},
+            {"_id": 0, "url": 1, "score": {"$meta": "textScore"}}
+        )
+    }
+
+
+def split_article_bodies(batch_size=500):
+    """
+    Move the inline ``content`` of existing article documents into
+    article_bodies. Safe to interrupt and rerun: each batch is copied before
+    it is removed from the articles, and bodies already stored are kept.
+
+    Returns:
+        dict: {"articles": documents split, "bodies": bodies inserted}
+    """
+    moved = bodies = 0
+    while True:
+        batch = list(
+            articles_collection.find({"content": {"$exists": True}}, {"_id": 1, "url": 1, "content": 1})
+            .limit(batch_size)
+        )
+        if not batch:
+            break
+
+        operations = [
+            body_operation(article["url"], article["content"])
+            for article in batch if article.get("url") and article.get("content")
+        ]
+        if operations:
+            result = article_bodies_collection.bulk_write(operations, ordered=False)
+            bodies += result.upserted_count
+        articles_collection.update_many(
+            {"_id": {"$in": [article["_id"] for article in batch]}},
+            {"$unset": {"content": ""}}
+        )
+        moved += len(batch)
+        logger.info(f"📦 Split {moved} article bodies so far")
+
+    return {"articles": moved, "bodies": bodies}
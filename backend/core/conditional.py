@@ -0,0 +1,58 @@
+"""
+Conditional GET for article lists, search and feeds.
+
+Their content only changes when an ingest run stores new articles (or, for
+per-user responses, when the user's own state changes), so responses carry a
+weak ETag built from the ingest generation, the query params and that user
+state, and a Last-Modified of when the generation started. A client whose
+If-None-Match still matches is answered 304 before any article is queried;
+public responses are validated without touching MongoDB at all.
+"""
+
+from django.utils.cache import get_conditional_response, patch_cache_control, patch_vary_headers
+from django.utils.http import http_date
+from .ingestion.generation import get_ingest_state
+import calendar
+import hashlib
+import json
+
+
+class Validators:
+    """ETag and Last-Modified of one request's response."""
+
+    def __init__(self, request, user_state=None):
+        generation, started_at = get_ingest_state()
+        self.private = user_state is not None
+        key = json.dumps(
+            [request.path, sorted(request.GET.lists()), user_state],
+            separators=(",", ":"), sort_keys=True, default=str
+        )
+        digest = hashlib.blake2b(key.encode("utf-8"), digest_size=12).hexdigest()
+        self.etag = f'W/"{generation}-{digest}"'
+        self.last_modified = calendar.timegm(started_at.utctimetuple()) if started_at else None
+
+    def not_modified(self, request):
+        """
+        The 304 response if the client's copy is still current, else None.
+        If-Modified-Since is only honoured for public responses, since the
+        generation start time says nothing about the user's own state.
+        """
+        response = get_conditional_response(
+            request, etag=self.etag,
+            last_modified=None if self.private else self.last_modified
+        )
+        if response is not None:
+            self.apply(response)
+        return response
+
+    def apply(self, response):
+        """Add the validators to ``response`` and require revalidation before reuse."""
+        response["ETag"] = self.etag
+        if self.last_modified is not None:
+            response["Last-Modified"] = http_date(self.last_modified)
+        if self.private:
+            patch_cache_control(response, private=True, no_cache=True)
+            patch_vary_headers(response, ["Authorization"])
+        else:
+            patch_cache_control(response, no_cache=True)
+        return response
@@ -11,16 +11,23 @@ db = client[settings.MONGODB_DB_NAME]
 
 # Collections
 articles_collection = db["articles"]
+article_bodies_collection = db["article_bodies"]  # full content, _id = hash of the article URL
 user_pref_collection = db["user_preferences"]
 reading_history_collection = db["reading_history"]
 search_history_collection = db["search_history"]
 bookmarks_collection = db["bookmarks"]
 reading_lists_collection = db["reading_lists"]
 analytics_collection = db["user_analytics"]
+ingest_jobs_collection = db["ingest_jobs"]
+user_profiles_collection = db["user_profiles"]
+engagement_counters_collection = db["engagement_counters"]
+ingest_state_collection = db["ingest_state"]
+precomputed_feeds_collection = db["precomputed_feeds"]
 
 # Create indexes for better query performance
 try:
     reading_history_collection.create_index([("username", 1), ("timestamp", -1)])
+    reading_history_collection.create_index([("username", 1), ("timestamp", -1), ("_id", -1)])
     reading_history_collection.create_index([("article_url", 1)])
     
     # Search history indexes
@@ -48,11 +55,16 @@ try:
     
     # Create text index for full-text search on articles
     try:
-        # Text index on title, summary, and content for search functionality
+        # Bodies live in article_bodies (with their own text index below), so
+        # this one covers title and summary; an older index that also covered
+        # content is replaced
+        text_index = articles_collection.index_information().get("article_text_search")
+        if text_index and "content" in text_index.get("weights", {}):
+            articles_collection.drop_index("article_text_search")
+            logger.info("Dropped text index covering article content")
         articles_collection.create_index([
             ("title", "text"),
-            ("summary", "text"),
-            ("content", "text")
+            ("summary", "text")
         ], name="article_text_search", default_language="english")
         logger.info("Created text index for article search")
     except OperationFailure as e:
@@ -61,10 +73,26 @@ try:
         else:
             logger.warning(f"Could not create text search index: {str(e)}")
     
+    # Text index over article bodies, joined with article_text_search by URL
+    try:
+        article_bodies_collection.create_index(
+            [("content", "text")], name="body_text_search", default_language="english"
+        )
+        logger.info("Created text index for article body search")
+    except OperationFailure as e:
+        if "already exists" in str(e).lower():
+            logger.info("Body text search index already exists")
+        else:
+            logger.warning(f"Could not create body text search index: {str(e)}")
+    
     # Additional indexes for filtering
     try:
         articles_collection.create_index([("category", 1)])
+        articles_collection.create_index([("category", 1), ("publishedAt", -1)])
         articles_collection.create_index([("publishedAt", -1)])
+        # Keyset pagination range scans on (publishedAt, _id)
+        articles_collection.create_index([("publishedAt", -1), ("_id", -1)])
+        articles_collection.create_index([("category", 1), ("publishedAt", -1), ("_id", -1)])
         articles_collection.create_index([("sentiment_label", 1)])
     except OperationFailure:
         logger.info("Filter indexes already exist")
@@ -72,6 +100,7 @@ try:
     # Bookmarks indexes
     try:
         bookmarks_collection.create_index([("username", 1), ("created_at", -1)])
+        bookmarks_collection.create_index([("username", 1), ("created_at", -1), ("_id", -1)])
         bookmarks_collection.create_index([("username", 1), ("article_url", 1)], unique=True)
         logger.info("Created bookmarks indexes")
     except OperationFailure:
@@ -92,6 +121,42 @@ try:
         logger.info("Created analytics indexes")
     except OperationFailure:
         logger.info("Analytics indexes already exist")
+    
+    # User interest profile indexes
+    try:
+        user_profiles_collection.create_index([("username", 1)], unique=True)
+        logger.info("Created user profile indexes")
+    except OperationFailure:
+        logger.info("User profile indexes already exist")
+    
+    # Precomputed feed indexes
+    try:
+        precomputed_feeds_collection.create_index([("username", 1)], unique=True)
+        logger.info("Created precomputed feed indexes")
+    except OperationFailure:
+        logger.info("Precomputed feed indexes already exist")
+    
+    # Trending counter indexes (top-N reads walk the score index)
+    try:
+        engagement_counters_collection.create_index([("kind", 1), ("score", -1)])
+        engagement_counters_collection.create_index([("kind", 1), ("category", 1), ("score", -1)])
+        logger.info("Created engagement counter indexes")
+    except OperationFailure:
+        logger.info("Engagement counter indexes already exist")
+    
+    # Ingest job indexes (the partial unique index allows one active job at a time)
+    try:
+        ingest_jobs_collection.create_index([("job_id", 1)], unique=True)
+        ingest_jobs_collection.create_index([("started_at", -1)])
+        ingest_jobs_collection.create_index(
+            [("active", 1)],
+            unique=True,
+            partialFilterExpression={"active": True},
+            name="single_active_job"
+        )
+        logger.info("Created ingest job indexes")
+    except OperationFailure:
+        logger.info("Ingest job indexes already exist")
         
 except Exception as e:
     logger.error(f"Error creating indexes: {str(e)}")
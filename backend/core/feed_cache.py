@@ -0,0 +1,60 @@
+"""
+Per-user cache of materialized personalized feeds.
+
+A feed is ranked once and stored in the 'feeds' cache under the user's
+feed_version and the ingest generation. A new read or a preference change
+bumps feed_version and a new ingest bumps the generation, so stale entries are
+never looked up again and simply age out of the LRU/TTL cache. Pages are
+served from the cached feed with opaque cursors that pin the feed they
+started on, so "load more" stays consistent while the user keeps reading.
+"""
+
+from django.core.cache import caches
+from .db import user_pref_collection
+import base64
+import json
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def get_feed_cache():
+    return caches['feeds']
+
+
+def feed_cache_key(username, feed_version, generation):
+    return f"feed:{username}:{feed_version}:{generation}"
+
+
+def bump_feed_version(username):
+    """Invalidate the user's cached feed."""
+    user_pref_collection.update_one(
+        {'username': username},
+        {'$inc': {'feed_version': 1}},
+        upsert=True
+    )
+
+
+def encode_cursor(offset, feed_version, generation):
+    payload = json.dumps({"o": offset, "v": feed_version, "g": generation}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor):
+    """
+    Returns:
+        tuple: (offset, feed_version, generation)
+
+    Raises:
+        InvalidCursor: If the cursor was not produced by encode_cursor
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        offset = int(payload["o"])
+        if offset < 0:
+            raise ValueError("negative offset")
+        return offset, int(payload["v"]), int(payload["g"])
+    except (ValueError, KeyError, TypeError) as e:
+        raise InvalidCursor(f"Invalid cursor: {cursor}") from e
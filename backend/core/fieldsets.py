@@ -0,0 +1,75 @@
+"""
+Sparse fieldsets for article list endpoints.
+
+Clients choose the article fields they need with ``fields=title,url,...`` or a
+named ``view``: ``card`` for what a news card renders, ``full`` (the default)
+for whole metadata documents (article bodies are only served by the detail
+endpoint). The choice becomes a MongoDB projection, so fields a view does not
+render are never read, decoded or sent.
+"""
+
+import re
+
+# What NewsCard renders
+CARD_FIELDS = (
+    "url", "title", "summary", "urlToImage", "source", "author", "category",
+    "sentiment_label", "sentiment_confidence", "entities", "publishedAt", "ingested_at",
+)
+
+# Extra fields of ranked feed items shown on cards (score_breakdown is left out)
+RECOMMENDATION_CARD_FIELDS = ("recommendation_score", "recommendation_reason")
+
+VIEWS = {
+    "card": CARD_FIELDS,
+    "full": None,
+}
+
+_FIELD_NAME = re.compile(r"^[A-Za-z][A-Za-z0-9_]*$")
+
+
+class InvalidFieldset(ValueError):
+    pass
+
+
+def requested_fields(params, extra_card_fields=()):
+    """
+    The fields asked for by ``fields`` or ``view`` query params.
+
+    Args:
+        params (QueryDict): Request query params
+        extra_card_fields (tuple): Endpoint-specific fields added to the card view
+
+    Returns:
+        tuple: Field names, or None for whole documents
+
+    Raises:
+        InvalidFieldset: For an unknown view or a field name that is not a plain identifier
+    """
+    fields = params.get("fields", "").strip()
+    if fields:
+        names = tuple(dict.fromkeys(name.strip() for name in fields.split(",") if name.strip()))
+        invalid = [name for name in names if not _FIELD_NAME.match(name)]
+        if invalid or not names:
+            raise InvalidFieldset(f"Invalid fields: {', '.join(invalid) or fields}")
+        return names
+
+    view = params.get("view", "full").strip() or "full"
+    if view not in VIEWS:
+        raise InvalidFieldset(f"Unknown view '{view}', expected one of: {', '.join(VIEWS)}")
+    if VIEWS[view] is None:
+        return None
+    return VIEWS[view] + tuple(extra_card_fields)
+
+
+def article_projection(fields):
+    """MongoDB projection for ``fields`` (None: whole documents without _id)."""
+    if fields is None:
+        return {"_id": 0}
+    return {"_id": 0, **{name: 1 for name in fields}}
+
+
+def select_fields(item, fields):
+    """Apply ``fields`` to an already materialized document."""
+    if fields is None:
+        return item
+    return {name: item[name] for name in fields if name in item}
@@ -0,0 +1,137 @@
+"""
+Pre-scrape deduplication for article ingestion.
+Drops articles whose URL is already stored before any scraping or model
+work happens, using an in-memory Bloom filter backed by one batched
+MongoDB lookup for possible matches.
+"""
+
+from ..db import articles_collection
+from .generation import get_ingest_generation
+import hashlib
+import math
+import threading
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class BloomFilter:
+    """
+    Fixed-size Bloom filter over strings.
+    Membership tests may return false positives but never false negatives.
+    """
+
+    def __init__(self, capacity, error_rate=0.01):
+        self.capacity = max(int(capacity), 1)
+        self.error_rate = error_rate
+        self.num_bits = max(8, int(-self.capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.num_hashes = max(1, round(self.num_bits / self.capacity * math.log(2)))
+        self.count = 0
+        self._bits = bytearray((self.num_bits + 7) // 8)
+
+    def _positions(self, item):
+        # Double hashing: derive k bit positions from one 128-bit digest
+        digest = hashlib.blake2b(item.encode('utf-8'), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:], 'little') | 1
+        return ((h1 + i * h2) % self.num_bits for i in range(self.num_hashes))
+
+    def add(self, item):
+        for pos in self._positions(item):
+            self._bits[pos >> 3] |= 1 << (pos & 7)
+        self.count += 1
+
+    def __contains__(self, item):
+        return all(self._bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(item))
+
+
+class KnownUrlFilter:
+    """
+    Tracks which article URLs are already stored.
+    The Bloom filter is built from the articles ``url`` index on first use and
+    rebuilt with more room once it fills up; URLs it reports as possibly known
+    are confirmed with a single ``$in`` query.
+
+    A filter only learns the inserts of its own process, so it is also
+    rebuilt when the ingest generation has moved on since it was built:
+    another process has stored articles it does not know about.
+    """
+
+    def __init__(self, collection, error_rate=0.01):
+        self.collection = collection
+        self.error_rate = error_rate
+        self._bloom = None
+        self._generation = None  # ingest generation the filter was built at
+        self._lock = threading.Lock()
+
+    def rebuild(self):
+        """Rebuild the Bloom filter from every stored article URL."""
+        # Read before the scan: a bump during it only causes one more rebuild
+        generation = get_ingest_generation()
+        # Projection on the indexed field only, so the scan is covered by url_1
+        cursor = self.collection.find({}, {"url": 1, "_id": 0}).hint([("url", 1)])
+        urls = [doc["url"] for doc in cursor if doc.get("url")]
+
+        bloom = BloomFilter(max(len(urls) * 2, 10000), self.error_rate)
+        for url in urls:
+            bloom.add(url)
+
+        with self._lock:
+            self._bloom, self._generation = bloom, generation
+        logger.info(f"🧮 Known-URL filter rebuilt with {len(urls)} stored URLs")
+
+    def _get_bloom(self, check_generation=False):
+        bloom = self._bloom
+        stale = check_generation and self._generation != get_ingest_generation()
+        if bloom is None or stale or bloom.count > bloom.capacity:
+            self.rebuild()
+            bloom = self._bloom
+        return bloom
+
+    def add(self, urls):
+        """Record newly stored URLs."""
+        bloom = self._get_bloom()
+        with self._lock:
+            for url in urls:
+                if url:
+                    bloom.add(url)
+
+    def filter_new(self, articles):
+        """
+        Return the articles whose URL is not stored yet.
+        Also drops articles without a URL and repeats within the batch.
+
+        Args:
+            articles (list): Article dicts with a "url" key
+
+        Returns:
+            list: Articles that still need to be scraped and processed
+        """
+        unique = {}
+        for article in articles:
+            url = article.get("url")
+            if url and url not in unique:
+                unique[url] = article
+
+        bloom = self._get_bloom(check_generation=True)
+        maybe_known = [url for url in unique if url in bloom]
+
+        stored = set()
+        if maybe_known:
+            stored = {
+                doc["url"] for doc in self.collection.find(
+                    {"url": {"$in": maybe_known}},
+                    {"url": 1, "_id": 0}
+                )
+            }
+
+        new_articles = [article for url, article in unique.items() if url not in stored]
+        logger.info(
+            f"🧹 Dedupe: {len(articles)} fetched, {len(unique)} unique, "
+            f"{len(maybe_known)} checked in DB, {len(new_articles)} new"
+        )
+        return new_articles
+
+
+# Process-wide filter over the articles collection
+known_url_filter = KnownUrlFilter(articles_collection)
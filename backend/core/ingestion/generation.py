@@ -0,0 +1,59 @@
+"""
+Ingest generation counter.
+Bumped whenever an ingest run stores new articles, so caches of anything
+derived from the article corpus can key on it and go stale together.
+"""
+
+from django.conf import settings
+from pymongo import ReturnDocument
+from datetime import datetime
+from ..db import ingest_state_collection
+import threading
+import time
+
+GENERATION_ID = "generation"
+
+# Last ingest state read by this process, for get_ingest_state
+_state = None
+_state_read_at = 0.0
+_state_lock = threading.Lock()
+
+
+def get_ingest_generation():
+    """Current ingest generation (0 before the first ingest stored anything)."""
+    doc = ingest_state_collection.find_one({"_id": GENERATION_ID}, {"value": 1})
+    return doc["value"] if doc else 0
+
+
+def get_ingest_state():
+    """
+    Current ingest generation and when it started, re-read from MongoDB at
+    most every INGEST_STATE_POLL_INTERVAL seconds, so HTTP validators can be
+    checked without a database round trip.
+
+    Returns:
+        tuple: (generation, started_at), started_at is None before the first bump
+    """
+    global _state, _state_read_at
+    with _state_lock:
+        if _state is not None and time.monotonic() - _state_read_at < settings.INGEST_STATE_POLL_INTERVAL:
+            return _state
+    doc = ingest_state_collection.find_one({"_id": GENERATION_ID}, {"value": 1, "updated_at": 1})
+    state = (doc["value"], doc.get("updated_at")) if doc else (0, None)
+    with _state_lock:
+        _state, _state_read_at = state, time.monotonic()
+    return state
+
+
+def bump_ingest_generation():
+    """Start a new generation and return it."""
+    global _state, _state_read_at
+    doc = ingest_state_collection.find_one_and_update(
+        {"_id": GENERATION_ID},
+        {"$inc": {"value": 1}, "$set": {"updated_at": datetime.utcnow()}},
+        upsert=True,
+        return_document=ReturnDocument.AFTER
+    )
+    with _state_lock:
+        _state, _state_read_at = (doc["value"], doc["updated_at"]), time.monotonic()
+    return doc["value"]
@@ -0,0 +1,149 @@
+"""
+Background ingestion jobs.
+Runs aggregate_and_store_articles outside the HTTP request and records its
+progress in the ingest_jobs collection, so any web worker can report status.
+At most one job is active at a time: callers that arrive while a job is
+running join it instead of starting a duplicate run.
+"""
+
+from django.conf import settings
+from pymongo.errors import DuplicateKeyError
+from datetime import datetime, timedelta
+from ..db import ingest_jobs_collection
+import threading
+import uuid
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+def _public_job(job):
+    """Strip internal fields from a job document."""
+    if not job:
+        return None
+    return {k: v for k, v in job.items() if k not in ("_id", "active")}
+
+
+def get_job(job_id):
+    """Return the status document of a job, or None."""
+    return _public_job(ingest_jobs_collection.find_one({"job_id": job_id}))
+
+
+def get_latest_job():
+    """Return the most recently started job, or None."""
+    job = ingest_jobs_collection.find_one({}, sort=[("started_at", -1)])
+    return _public_job(job)
+
+
+def _expire_stale_job():
+    """Release the lock held by a job whose worker stopped sending heartbeats."""
+    cutoff = datetime.utcnow() - timedelta(seconds=settings.INGEST_JOB_STALE_AFTER)
+    result = ingest_jobs_collection.update_many(
+        {"active": True, "heartbeat_at": {"$lt": cutoff}},
+        {
+            "$set": {"status": "failed", "error": "Job stopped reporting progress", "finished_at": datetime.utcnow()},
+            "$unset": {"active": ""}
+        }
+    )
+    if result.modified_count:
+        logger.warning(f"⚠️ Released {result.modified_count} stale ingest job lock(s)")
+
+
+def acquire_job(trigger):
+    """
+    Register a new job, or join the one already running.
+
+    Args:
+        trigger (str): What started the job ("api", "command", ...)
+
+    Returns:
+        tuple: (job_id, created) where ``created`` is False when joining a running job
+    """
+    _expire_stale_job()
+
+    now = datetime.utcnow()
+    job = {
+        "job_id": uuid.uuid4().hex,
+        "status": "queued",
+        "active": True,
+        "trigger": trigger,
+        "started_at": now,
+        "heartbeat_at": now,
+        "finished_at": None,
+        "inserted": None,
+        "stages": {},
+        "step": None,
+        "error": None,
+    }
+    try:
+        ingest_jobs_collection.insert_one(job)
+        return job["job_id"], True
+    except DuplicateKeyError:
+        running = ingest_jobs_collection.find_one({"active": True}, {"job_id": 1})
+        if running:
+            return running["job_id"], False
+        # The other job finished in between; try once more
+        return acquire_job(trigger)
+
+
+def run_job(job_id):
+    """Run ingestion for a registered job, recording progress and the outcome."""
+    from ..utils import aggregate_and_store_articles
+    from ..ai_tasks.feed_precompute import precompute_feeds
+
+    def on_progress(stages):
+        ingest_jobs_collection.update_one(
+            {"job_id": job_id},
+            {"$set": {"stages": stages, "heartbeat_at": datetime.utcnow()}}
+        )
+
+    def on_step(step):
+        # The steps after the pipeline report no stage stats; keep the lock alive through them
+        ingest_jobs_collection.update_one(
+            {"job_id": job_id},
+            {"$set": {"step": step, "heartbeat_at": datetime.utcnow()}}
+        )
+
+    ingest_jobs_collection.update_one(
+        {"job_id": job_id},
+        {"$set": {"status": "running", "heartbeat_at": datetime.utcnow()}}
+    )
+    logger.info(f"🔁 Ingest job {job_id} started")
+
+    try:
+        inserted = aggregate_and_store_articles(on_progress=on_progress, on_step=on_step)
+        update = {"status": "succeeded", "inserted": inserted}
+        logger.info(f"✅ Ingest job {job_id} stored {inserted} new articles")
+        if inserted:
+            # Warm the feeds of active users for the new generation
+            try:
+                on_step("precompute_feeds")
+                update["precomputed_feeds"] = precompute_feeds(
+                    on_batch=lambda done, total: on_step(f"precompute_feeds {done}/{total}")
+                )
+            except Exception as e:
+                logger.error(f"❌ Feed precomputation after job {job_id} failed: {str(e)}")
+    except Exception as e:
+        update = {"status": "failed", "error": str(e)}
+        logger.error(f"❌ Ingest job {job_id} failed: {str(e)}")
+
+    update["finished_at"] = datetime.utcnow()
+    ingest_jobs_collection.update_one(
+        {"job_id": job_id},
+        {"$set": update, "$unset": {"active": ""}}
+    )
+    return get_job(job_id)
+
+
+def start_ingest_job(trigger="api"):
+    """
+    Start ingestion in a background thread unless a job is already running.
+
+    Returns:
+        tuple: (job_id, created)
+    """
+    job_id, created = acquire_job(trigger)
+    if created:
+        thread = threading.Thread(target=run_job, args=(job_id,), name=f"ingest-{job_id[:8]}", daemon=True)
+        thread.start()
+    return job_id, created
@@ -0,0 +1,181 @@
+"""
+Staged streaming pipeline for article ingestion.
+Stages run in their own worker threads and are joined by bounded queues, so
+I/O-bound and CPU-bound work overlap and memory stays bounded: a slow stage
+makes its upstream block instead of buffering everything.
+"""
+
+from queue import Queue, Empty
+import threading
+import time
+import logging
+
+logger = logging.getLogger(__name__)
+
+# End-of-stream marker; each worker of a stage receives one
+_END = object()
+
+
+class Stage:
+    """
+    One pipeline step.
+
+    ``func`` receives a list of up to ``batch_size`` items and returns an
+    iterable of output items for the next stage (possibly empty). Workers
+    wait up to ``batch_wait`` seconds to fill a batch before processing a
+    partial one. An exception fails only the batch that raised it.
+    """
+
+    def __init__(self, name, func, workers=1, batch_size=1, batch_wait=0.5, queue_size=100):
+        self.name = name
+        self.func = func
+        self.workers = max(1, workers)
+        self.batch_size = max(1, batch_size)
+        self.batch_wait = batch_wait
+        self.queue = Queue(maxsize=queue_size)
+
+        self.processed = 0
+        self.emitted = 0
+        self.failed = 0
+        self.busy_seconds = 0.0
+        self.started_at = None
+        self.finished_at = None
+
+        self._lock = threading.Lock()
+        self._active_workers = 0
+
+    def _next_batch(self):
+        """Block for one item, then gather more until the batch is full or batch_wait passes."""
+        first = self.queue.get()
+        if first is _END:
+            return [], True
+
+        batch = [first]
+        deadline = time.monotonic() + self.batch_wait
+        while len(batch) < self.batch_size:
+            remaining = deadline - time.monotonic()
+            try:
+                item = self.queue.get(timeout=remaining) if remaining > 0 else self.queue.get_nowait()
+            except Empty:
+                break
+            if item is _END:
+                return batch, True
+            batch.append(item)
+        return batch, False
+
+    def stats(self):
+        end = self.finished_at or time.monotonic()
+        elapsed = end - self.started_at if self.started_at else 0.0
+        return {
+            "workers": self.workers,
+            "batch_size": self.batch_size,
+            "queue_depth": self.queue.qsize(),
+            "queue_size": self.queue.maxsize,
+            "processed": self.processed,
+            "emitted": self.emitted,
+            "failed": self.failed,
+            "busy_seconds": round(self.busy_seconds, 3),
+            "elapsed_seconds": round(elapsed, 3),
+            "throughput_per_sec": round(self.processed / elapsed, 2) if elapsed > 0 else 0.0,
+        }
+
+
+class Pipeline:
+    """Runs a chain of stages over a finite stream of input items."""
+
+    def __init__(self, stages, name="pipeline"):
+        self.stages = stages
+        self.name = name
+
+    def stats(self):
+        """Per-stage queue depth, counts and throughput."""
+        return {stage.name: stage.stats() for stage in self.stages}
+
+    def _worker(self, index):
+        stage = self.stages[index]
+        downstream = self.stages[index + 1] if index + 1 < len(self.stages) else None
+
+        while True:
+            batch, finished = stage._next_batch()
+            if batch:
+                started = time.monotonic()
+                try:
+                    outputs = list(stage.func(batch) or [])
+                except Exception as e:
+                    logger.error(f"❌ Stage '{stage.name}' failed on a batch of {len(batch)}: {str(e)}")
+                    outputs = []
+                    with stage._lock:
+                        stage.failed += len(batch)
+                with stage._lock:
+                    stage.processed += len(batch)
+                    stage.emitted += len(outputs)
+                    stage.busy_seconds += time.monotonic() - started
+                if downstream:
+                    for item in outputs:
+                        downstream.queue.put(item)  # blocks while downstream is full
+            if finished:
+                break
+
+        # The last worker of a stage to finish closes the downstream stage
+        with stage._lock:
+            stage._active_workers -= 1
+            last = stage._active_workers == 0
+            if last:
+                stage.finished_at = time.monotonic()
+        if last and downstream:
+            for _ in range(downstream.workers):
+                downstream.queue.put(_END)
+
+    def run(self, inputs, on_progress=None, progress_interval=5.0):
+        """
+        Feed ``inputs`` through every stage and wait for the stream to drain.
+
+        Args:
+            inputs (iterable): Items for the first stage
+            on_progress (callable): Called with ``stats()`` every
+                ``progress_interval`` seconds and once at the end
+
+        Returns:
+            dict: Final per-stage stats
+        """
+        threads = []
+        for index, stage in enumerate(self.stages):
+            stage.started_at = time.monotonic()
+            stage._active_workers = stage.workers
+            for n in range(stage.workers):
+                thread = threading.Thread(
+                    target=self._worker, args=(index,),
+                    name=f"{self.name}-{stage.name}-{n}", daemon=True
+                )
+                thread.start()
+                threads.append(thread)
+
+        # Feed from a separate thread so progress reporting keeps running
+        # while the first stage applies backpressure
+        first = self.stages[0]
+
+        def feed():
+            for item in inputs:
+                first.queue.put(item)
+            for _ in range(first.workers):
+                first.queue.put(_END)
+
+        feeder = threading.Thread(target=feed, name=f"{self.name}-feed", daemon=True)
+        feeder.start()
+
+        for thread in threads:
+            while thread.is_alive():
+                thread.join(timeout=progress_interval)
+                if thread.is_alive():
+                    stats = self.stats()
+                    logger.info(f"📊 {self.name}: " + ", ".join(
+                        f"{name} q={s['queue_depth']} done={s['processed']}" for name, s in stats.items()
+                    ))
+                    if on_progress:
+                        on_progress(stats)
+        feeder.join()
+
+        stats = self.stats()
+        if on_progress:
+            on_progress(stats)
+        return stats
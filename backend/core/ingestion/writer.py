@@ -0,0 +1,161 @@
+"""
+Buffered bulk writer for article ingestion.
+Collects enriched articles and stores them with unordered bulk upserts keyed
+on URL, so a run costs a handful of MongoDB round trips instead of two per
+article. Article bodies go to their own collection (see core/article_bodies.py).
+"""
+
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError
+from ..article_bodies import body_operation
+import threading
+import time
+import logging
+
+logger = logging.getLogger(__name__)
+
+DUPLICATE_KEY_ERROR = 11000
+
+
+class BulkArticleWriter:
+    """
+    Buffers articles and flushes them once ``batch_size`` articles are waiting
+    or ``flush_interval`` seconds have passed since the last flush. Once
+    started (``start()`` or ``with``), a background thread applies the time
+    threshold even while no articles arrive, e.g. during a slow enrich batch.
+
+    Each article is written as ``$setOnInsert`` upsert on its URL, so an
+    article that is already stored is left untouched. That only rules out
+    duplicates from concurrent runs while the unique ``url`` index exists:
+    db.py falls back to a non-unique index when stored duplicates prevent
+    it, and then two upserts racing on a new URL can both insert. With
+    ``bodies_collection``, each article's ``content`` is written there
+    instead of into the article document.
+    """
+
+    def __init__(self, collection, batch_size=100, flush_interval=5.0, on_stored=None, bodies_collection=None):
+        self.collection = collection
+        self.bodies_collection = bodies_collection
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.on_stored = on_stored  # called with the URLs of newly inserted articles
+
+        self.inserted = 0
+        self.duplicates = 0
+        self.failed = 0
+
+        self._buffer = []
+        self._last_flush = time.monotonic()
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._timer = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+        self.flush()
+
+    def start(self):
+        """Start flushing on the time threshold from a background thread."""
+        if self._timer is None:
+            self._stop.clear()
+            self._timer = threading.Thread(target=self._flush_periodically, name="article-writer", daemon=True)
+            self._timer.start()
+        return self
+
+    def stop(self):
+        """Stop the background flushes; call flush() afterwards to write what is left."""
+        if self._timer is not None:
+            self._stop.set()
+            self._timer.join()
+            self._timer = None
+
+    def _flush_periodically(self):
+        while not self._stop.wait(self.flush_interval / 2):
+            try:
+                self.flush_if_due()
+            except Exception as e:
+                logger.error(f"❌ Background article flush failed: {str(e)}")
+
+    def add(self, article):
+        """Queue an article for writing, flushing if a threshold is reached."""
+        with self._lock:
+            self._buffer.append(article)
+            due = len(self._buffer) >= self.batch_size
+        if due:
+            self.flush()
+        else:
+            self.flush_if_due()
+
+    def flush_if_due(self):
+        """Flush if the time threshold has passed; lets idle callers drain the buffer."""
+        if time.monotonic() - self._last_flush >= self.flush_interval:
+            self.flush()
+
+    def flush(self):
+        """Write all buffered articles. Returns the number of newly inserted ones."""
+        with self._lock:
+            batch, self._buffer = self._buffer, []
+            self._last_flush = time.monotonic()
+        if not batch:
+            return 0
+
+        # Bodies first, so a stored article never lacks its body
+        omitted = ("_id", "url")
+        if self.bodies_collection is not None:
+            omitted += ("content",)
+            self._write_bodies(batch)
+
+        operations = [
+            UpdateOne(
+                {"url": article["url"]},
+                {"$setOnInsert": {k: v for k, v in article.items() if k not in omitted}},
+                upsert=True
+            )
+            for article in batch
+        ]
+
+        try:
+            result = self.collection.bulk_write(operations, ordered=False)
+            upserted_indexes = list(result.upserted_ids.keys())
+            errors = []
+        except BulkWriteError as e:
+            # Unordered: every operation was attempted, inspect them one by one
+            upserted_indexes = [item["index"] for item in e.details.get("upserted", [])]
+            errors = e.details.get("writeErrors", [])
+
+        duplicates = sum(1 for err in errors if err.get("code") == DUPLICATE_KEY_ERROR)
+        failed = len(errors) - duplicates
+        for err in errors:
+            if err.get("code") != DUPLICATE_KEY_ERROR:
+                logger.error(f"❌ Failed to store article {batch[err['index']].get('url')}: {err.get('errmsg')}")
+
+        inserted_urls = [batch[i]["url"] for i in upserted_indexes]
+        with self._lock:
+            self.inserted += len(inserted_urls)
+            # Matched-but-not-upserted documents were already stored
+            self.duplicates += duplicates + (len(batch) - len(inserted_urls) - len(errors))
+            self.failed += failed
+
+        if self.on_stored and inserted_urls:
+            self.on_stored(inserted_urls)
+
+        logger.info(f"💾 Flushed {len(batch)} articles: {len(inserted_urls)} inserted, {len(errors)} errors")
+        return len(inserted_urls)
+
+    def _write_bodies(self, batch):
+        operations = [
+            body_operation(article["url"], article["content"])
+            for article in batch if article.get("content")
+        ]
+        if not operations:
+            return
+        try:
+            self.bodies_collection.bulk_write(operations, ordered=False)
+        except BulkWriteError as e:
+            # Duplicates are bodies stored by a concurrent run; anything else only loses the body
+            for err in e.details.get("writeErrors", []):
+                if err.get("code") != DUPLICATE_KEY_ERROR:
+                    logger.error(f"❌ Failed to store article body: {err.get('errmsg')}")
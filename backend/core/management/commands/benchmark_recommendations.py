@@ -0,0 +1,117 @@
+from django.core.management.base import BaseCommand
+from core.ai_tasks.recommendations import NewsRecommender
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+import numpy as np
+import random
+import time
+
+CATEGORIES = ["business", "entertainment", "general", "health", "science", "sports", "technology"]
+
+
+def synthetic_articles(n, seed=0):
+    rng = random.Random(seed)
+    now = datetime.now(timezone.utc)
+    return [
+        {
+            "url": f"https://example.com/{i}",
+            "title": f"Article {i}",
+            "category": rng.choice(CATEGORIES),
+            "publishedAt": (now - timedelta(hours=rng.uniform(0, 24 * 14))).isoformat().replace("+00:00", "Z"),
+        }
+        for i in range(n)
+    ]
+
+
+def per_article_ranking(recommender, candidates, user_preferences, reading_history, content_scores, limit):
+    """The scoring loop the columnar engine replaced: one dict and three calls per article."""
+    scored = []
+    for i, article in enumerate(candidates):
+        breakdown = {
+            "category_score": recommender._calculate_category_score(article, user_preferences),
+            "content_similarity_score": float(content_scores[i]),
+            "recency_score": recommender._calculate_recency_score(article),
+            "popularity_score": recommender._calculate_popularity_score(article, reading_history),
+        }
+        scored.append({
+            **article,
+            "recommendation_score": sum(breakdown.values()),
+            "recommendation_reason": recommender._get_recommendation_reason(breakdown, article, user_preferences),
+            "score_breakdown": breakdown,
+        })
+    scored.sort(key=lambda x: x["recommendation_score"], reverse=True)
+    return category_capped(scored, limit)
+
+
+def category_capped(scored_articles, limit):
+    """The category cap the reranker replaced: two passes with list membership scans."""
+    diverse_list = []
+    category_count = Counter()
+    max_per_category = max(3, limit // 5)
+    for article in scored_articles:
+        category = article.get("category", "general")
+        if category_count[category] < max_per_category:
+            diverse_list.append(article)
+            category_count[category] += 1
+            if len(diverse_list) >= limit:
+                break
+    if len(diverse_list) < limit:
+        for article in scored_articles:
+            if article not in diverse_list:
+                diverse_list.append(article)
+                if len(diverse_list) >= limit:
+                    break
+    return diverse_list
+
+
+class Command(BaseCommand):
+    help = "Compare per-article and columnar recommendation scoring on synthetic articles."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 100000])
+        parser.add_argument("--limit", type=int, default=50)
+        parser.add_argument("--repeat", type=int, default=3)
+
+    def handle(self, *args, **options):
+        recommender = NewsRecommender()
+        limit = options["limit"]
+        user_preferences = {"categories": ["technology", "science"]}
+
+        for n in options["sizes"]:
+            candidates = synthetic_articles(n)
+            reading_history = [
+                {"article_url": a["url"], "category": a["category"]}
+                for a in synthetic_articles(100, seed=1)
+            ]
+            content_scores = np.random.default_rng(0).random(n) * 30
+
+            def columnar():
+                columns = recommender._score_candidates(
+                    candidates, user_preferences, reading_history, content_scores
+                )
+                # No vectors: the reranker reduces to the category cap, so rankings stay comparable
+                return recommender._select_top(columns, limit, category_cap=True)
+
+            def per_article():
+                return per_article_ranking(
+                    recommender, candidates, user_preferences, reading_history, content_scores, limit
+                )
+
+            timings = {}
+            for name, run in (("per-article", per_article), ("columnar", columnar)):
+                best = float("inf")
+                for _ in range(options["repeat"]):
+                    started = time.perf_counter()
+                    result = run()
+                    best = min(best, time.perf_counter() - started)
+                timings[name] = (best, result)
+
+            expected = [a["url"] for a in timings["per-article"][1]]
+            actual = [candidates[i]["url"] for i in timings["columnar"][1]]
+            per_article_time, columnar_time = timings["per-article"][0], timings["columnar"][0]
+            self.stdout.write(
+                f"{n:>8} articles: per-article {per_article_time * 1000:8.1f} ms, "
+                f"columnar {columnar_time * 1000:8.1f} ms, "
+                f"speedup {per_article_time / columnar_time:5.1f}x, "
+                f"same ranking: {expected == actual}"
+            )
@@ -0,0 +1,23 @@
+from django.core.management.base import BaseCommand
+from core.ai_tasks.article_index import rebuild_article_index
+from core.ai_tasks.ann_index import update_ann_index
+from core.ai_tasks.feature_store import write_feature_store
+
+
+class Command(BaseCommand):
+    help = "Refit the recommendation TF-IDF index, ANN candidate index and feature store over all stored articles."
+
+    def handle(self, *args, **options):
+        index = rebuild_article_index()
+        if index is None:
+            self.stdout.write(self.style.WARNING("No articles stored yet, nothing to index"))
+            return
+        self.stdout.write(self.style.SUCCESS(f"Indexed {len(index)} articles (v{index.version})"))
+
+        ann = update_ann_index(index)
+        if ann is not None:
+            self.stdout.write(self.style.SUCCESS(f"Built ANN index with {len(ann.lists)} lists"))
+
+        store = write_feature_store(index)
+        if store is not None:
+            self.stdout.write(self.style.SUCCESS(f"Wrote feature store generation {store.generation} ({len(store)} articles)"))
@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+from core.ai_tasks.co_reads import build_co_read_index
+
+
+class Command(BaseCommand):
+    help = "Rebuild the item-item co-read matrix from every user's reading history."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=5000, help="Reading history cursor batch size")
+
+    def handle(self, *args, **options):
+        index = build_co_read_index(batch_size=options["batch_size"])
+        self.stdout.write(self.style.SUCCESS(
+            f"Processed {index.events} reads by {index.users} users: "
+            f"{len(index)} articles, {index.matrix.nnz} neighbour pairs"
+        ))
@@ -0,0 +1,26 @@
+from django.core.management.base import BaseCommand
+from core.ingestion.jobs import acquire_job, run_job
+from core.utils import get_enrichment_pool
+
+
+class Command(BaseCommand):
+    help = "Fetch, enrich and store new articles from all news sources (e.g. from cron)."
+
+    def handle(self, *args, **options):
+        job_id, created = acquire_job("command")
+        if not created:
+            self.stdout.write(self.style.WARNING(f"Ingest job {job_id} is already running, not starting another one"))
+            return
+
+        try:
+            job = run_job(job_id)
+        finally:
+            # Stop the model worker processes so the command can exit
+            pool = get_enrichment_pool()
+            if pool:
+                pool.shutdown()
+
+        if job["status"] == "succeeded":
+            self.stdout.write(self.style.SUCCESS(f"Job {job_id}: {job['inserted']} new articles stored"))
+        else:
+            self.stderr.write(self.style.ERROR(f"Job {job_id} failed: {job['error']}"))
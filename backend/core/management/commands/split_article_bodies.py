@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+from core.article_bodies import split_article_bodies
+
+
+class Command(BaseCommand):
+    help = "Move the inline content of stored articles into the article_bodies collection."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=500, help="Articles moved per batch")
+
+    def handle(self, *args, **options):
+        stats = split_article_bodies(batch_size=options["batch_size"])
+        self.stdout.write(self.style.SUCCESS(
+            f"Split {stats['articles']} articles, {stats['bodies']} bodies stored"
+        ))
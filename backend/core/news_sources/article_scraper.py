@@ -5,6 +5,8 @@ Extracts full article text from URLs when APIs provide truncated content.
 
 import requests
 from bs4 import BeautifulSoup
+from concurrent.futures import ThreadPoolExecutor
+from .http_client import get_scraper_client
 import re
 import logging
 
@@ -90,15 +92,8 @@ def extract_article_content(url, timeout=10):
         str: Extracted article content, or empty string if extraction fails
     """
     try:
-        # Set a realistic user agent to avoid blocking
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
-            'Accept-Language': 'en-US,en;q=0.9',
-        }
-        
-        # Fetch the page
-        response = requests.get(url, headers=headers, timeout=timeout, allow_redirects=True)
+        # Fetch the page through the shared pooled client (reuses keep-alive connections)
+        response = get_scraper_client().get(url, timeout=timeout, allow_redirects=True)
         response.raise_for_status()
         
         # Parse with BeautifulSoup
@@ -196,3 +191,51 @@ def get_article_content(url, fallback_content="", title=""):
     
     logger.warning(f"No content available for URL: {url}")
     return "Article content unavailable."
+
+
+
+def get_article_contents(urls, fallback_contents=None, titles=None):
+    """
+    Get full article content for many URLs, scraping them concurrently.
+    
+    In-flight requests are capped globally and per domain by the shared
+    scraper client, so callers can submit whole batches at once.
+    
+    Args:
+        urls (list): Article URLs
+        fallback_contents (list): Per-URL content to use if scraping fails
+        titles (list): Per-URL titles to use as last resort
+        
+    Returns:
+        list: Article contents, in the same order as ``urls``
+    """
+    if not urls:
+        return []
+    
+    fallback_contents = fallback_contents or [""] * len(urls)
+    titles = titles or [""] * len(urls)
+    
+    workers = min(get_scraper_client().max_concurrency, len(urls))
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="scraper") as executor:
+        return list(executor.map(get_article_content, urls, fallback_contents, titles))
+
+
+def scrape_article_contents(articles):
+    """
+    Replace each article's API-provided (usually truncated) content with the
+    full scraped text, in place. The existing content is kept as fallback.
+    
+    Args:
+        articles (list): Article dicts with "url", "title" and "content" keys
+        
+    Returns:
+        list: The same articles, for chaining
+    """
+    contents = get_article_contents(
+        [a.get("url", "") for a in articles],
+        fallback_contents=[a.get("content") or "" for a in articles],
+        titles=[a.get("title") or "" for a in articles]
+    )
+    for article, content in zip(articles, contents):
+        article["content"] = content
+    return articles
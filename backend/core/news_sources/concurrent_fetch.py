@@ -0,0 +1,62 @@
+"""
+Concurrent fetch layer for all news providers.
+Runs every source adapter in its own worker so one slow or failing provider
+cannot stall or break the whole ingestion run.
+"""
+
+from concurrent.futures import ThreadPoolExecutor, wait
+from django.conf import settings
+from .newsapi import fetch_from_newsapi
+from .gnews import fetch_from_gnews
+from .mediastack import fetch_from_mediastack
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Source name -> adapter, in the order their articles are returned
+SOURCE_FETCHERS = {
+    "newsapi": fetch_from_newsapi,
+    "gnews": fetch_from_gnews,
+    "mediastack": fetch_from_mediastack,
+}
+
+
+def fetch_from_all_sources(fetchers=None, max_workers=None, deadline=None, scrape=True):
+    """
+    Fetch articles from all news sources in parallel.
+
+    Args:
+        fetchers (dict): Source name -> adapter callable (defaults to SOURCE_FETCHERS)
+        max_workers (int): Maximum number of sources fetched at the same time
+        deadline (int): Seconds to wait for the sources before giving up on them
+        scrape (bool): Whether adapters scrape full article content; pass False
+            to get only the API listings (e.g. to dedupe before scraping)
+
+    Returns:
+        list: Articles from every source that finished in time
+    """
+    fetchers = fetchers or SOURCE_FETCHERS
+    max_workers = max_workers or settings.NEWS_FETCH_MAX_WORKERS
+    deadline = deadline or settings.NEWS_SOURCE_DEADLINE
+
+    executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="news-source")
+    futures = {executor.submit(fetch, scrape=scrape): name for name, fetch in fetchers.items()}
+
+    # Wait for every source up to the deadline; stragglers are abandoned, not joined
+    done, not_done = wait(futures, timeout=deadline)
+    executor.shutdown(wait=False, cancel_futures=True)
+
+    all_articles = []
+    for future, name in futures.items():
+        if future in not_done:
+            logger.warning(f"⏱️ Source '{name}' did not finish within {deadline}s, skipping it")
+            continue
+        try:
+            articles = future.result()
+        except Exception as e:
+            logger.error(f"❌ Source '{name}' failed: {str(e)}")
+            continue
+        logger.info(f"📰 Source '{name}' returned {len(articles)} articles")
+        all_articles.extend(articles)
+
+    return all_articles
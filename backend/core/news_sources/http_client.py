@@ -0,0 +1,75 @@
+"""
+Shared HTTP client for article scraping.
+Keeps keep-alive connection pools per host and caps in-flight requests
+both globally and per domain.
+"""
+
+from django.conf import settings
+from requests.adapters import HTTPAdapter
+from urllib.parse import urlsplit
+import requests
+import threading
+
+# Set a realistic user agent to avoid blocking
+DEFAULT_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
+    'Accept-Language': 'en-US,en;q=0.9',
+}
+
+
+class ScraperClient:
+    """
+    Thread-safe pooled HTTP client with global and per-host concurrency limits.
+    """
+
+    def __init__(self, max_concurrency=16, per_host_limit=4, max_hosts=100):
+        self.max_concurrency = max_concurrency
+        self.per_host_limit = per_host_limit
+
+        self._session = requests.Session()
+        self._session.headers.update(DEFAULT_HEADERS)
+
+        # One keep-alive pool per host, sized to the per-host limit so every
+        # permitted request can reuse a connection
+        adapter = HTTPAdapter(pool_connections=max_hosts, pool_maxsize=per_host_limit)
+        self._session.mount('http://', adapter)
+        self._session.mount('https://', adapter)
+
+        self._global_slots = threading.BoundedSemaphore(max_concurrency)
+        self._host_slots = {}
+        self._host_slots_lock = threading.Lock()
+
+    def _slots_for_host(self, url):
+        host = urlsplit(url).netloc.lower()
+        with self._host_slots_lock:
+            slots = self._host_slots.get(host)
+            if slots is None:
+                slots = threading.BoundedSemaphore(self.per_host_limit)
+                self._host_slots[host] = slots
+            return slots
+
+    def get(self, url, timeout=10, **kwargs):
+        """Perform a GET request once both a host slot and a global slot are free."""
+        # Take the host slot first so requests queued on a busy host
+        # do not hold global slots other hosts could use
+        with self._slots_for_host(url):
+            with self._global_slots:
+                return self._session.get(url, timeout=timeout, **kwargs)
+
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_scraper_client():
+    """Return the process-wide scraper client, creating it on first use."""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = ScraperClient(
+                    max_concurrency=settings.SCRAPER_MAX_CONCURRENCY,
+                    per_host_limit=settings.SCRAPER_PER_HOST_LIMIT
+                )
+    return _client
@@ -1,11 +1,11 @@
 import requests
 from django.conf import settings
-from .article_scraper import get_article_content
+from .article_scraper import scrape_article_contents
 
-def fetch_from_mediastack():
+def fetch_from_mediastack(timeout=None, scrape=True):
     API_KEY = settings.MEDIASTACK_KEY
     url = f"http://api.mediastack.com/v1/news?access_key={API_KEY}&countries=us&limit=20"
-    response = requests.get(url)
+    response = requests.get(url, timeout=timeout or settings.NEWS_SOURCE_TIMEOUT)
     data = response.json()
 
     articles = []
@@ -13,20 +13,20 @@ def fetch_from_mediastack():
         if not (a.get("image") or a.get("urlToImage")):
             continue
         
-        # Get full article content (scrape from URL)
-        truncated_content = a.get("description", "")
-        title = a.get("title", "")
-        full_content = get_article_content(a["url"], fallback_content=truncated_content, title=title)
-        
         articles.append({
-            "title": title,
+            "title": a.get("title", ""),
             "source": a["source"],
             "author": a.get("author", ""),
             "url": a["url"],
             "urlToImage": a.get("image", ""),  
             "publishedAt": a["published_at"],
-            "content": full_content,
+            "content": a.get("description", ""),
             "category": a.get("category", "general")
         })
     
-    return articles
\ No newline at end of file
+    # Get full article content (scrape all URLs concurrently); callers that
+    # dedupe first pass scrape=False and call scrape_article_contents later
+    if scrape:
+        scrape_article_contents(articles)
+    
+    return articles
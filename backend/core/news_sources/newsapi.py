@@ -1,11 +1,11 @@
 import requests
 from django.conf import settings
-from .article_scraper import get_article_content
+from .article_scraper import scrape_article_contents
 
-def fetch_from_newsapi():
+def fetch_from_newsapi(timeout=None, scrape=True):
     API_KEY = settings.NEWSAPI_KEY
     url = f"https://newsapi.org/v2/top-headlines?country=us&apiKey={API_KEY}"
-    response = requests.get(url)
+    response = requests.get(url, timeout=timeout or settings.NEWS_SOURCE_TIMEOUT)
     data=response.json()
 
     articles = []
@@ -13,20 +13,20 @@ def fetch_from_newsapi():
         if not (a.get("image") or a.get("urlToImage")):
             continue
         
-        # Get full article content (scrape from URL)
-        truncated_content = a.get("content", "")
-        title = a.get("title", "")
-        full_content = get_article_content(a["url"], fallback_content=truncated_content, title=title)
-        
         articles.append({
-            "title": title,
+            "title": a.get("title", ""),
             "source": a["source"]["name"],
             "author": a.get("author", " "),
             "url": a["url"],
             "urlToImage": a.get("urlToImage"),
             "publishedAt": a["publishedAt"],
-            "content": full_content,
+            "content": a.get("content", ""),
             "category": "general"
         })
     
-    return articles
\ No newline at end of file
+    # Get full article content (scrape all URLs concurrently); callers that
+    # dedupe first pass scrape=False and call scrape_article_contents later
+    if scrape:
+        scrape_article_contents(articles)
+    
+    return articles
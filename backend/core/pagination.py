@@ -0,0 +1,120 @@
+"""
+Keyset (seek) pagination for list endpoints.
+
+Lists are ordered by (sort field, _id) descending and each page is read with
+an index range scan that starts right after the last item of the previous
+page, so a page costs the same no matter how deep into the list it is or how
+large the collection has grown. Cursors are opaque tokens holding the sort
+key of that last item.
+"""
+
+from django.conf import settings
+from bson import ObjectId
+from bson.errors import InvalidId
+from datetime import datetime
+from .feed_cache import InvalidCursor
+import base64
+import json
+
+
+def page_size(value, default=None, maximum=None):
+    """
+    The requested page size, clamped to 1..``maximum`` (API_MAX_PAGE_SIZE),
+    ``default`` (API_PAGE_SIZE) when not given.
+
+    Raises:
+        ValueError: If ``value`` is not an integer
+    """
+    if value in (None, ""):
+        return default or settings.API_PAGE_SIZE
+    return max(1, min(int(value), maximum or settings.API_MAX_PAGE_SIZE))
+
+
+def encode_keyset_cursor(value, object_id):
+    if isinstance(value, datetime):
+        key = ["d", value.isoformat()]
+    elif value is None:
+        key = ["n", None]
+    else:
+        key = ["s", str(value)]
+    payload = json.dumps({"k": key, "i": str(object_id)}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_keyset_cursor(cursor):
+    """
+    Returns:
+        tuple: (sort value, ObjectId) of the last item of the previous page
+
+    Raises:
+        InvalidCursor: If the cursor was not produced by encode_keyset_cursor
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        kind, value = payload["k"]
+        if kind == "d":
+            value = datetime.fromisoformat(value)
+        elif kind == "n":
+            value = None
+        elif kind != "s":
+            raise ValueError(f"unknown key type {kind}")
+        return value, ObjectId(payload["i"])
+    except (ValueError, KeyError, TypeError, InvalidId) as e:
+        raise InvalidCursor(f"Invalid cursor: {cursor}") from e
+
+
+def _after(sort_field, value, object_id):
+    """Filter for the items that come after (value, object_id) in descending order."""
+    if value is None:
+        # Items without the field sort last; only their _id orders them
+        return {sort_field: None, "_id": {"$lt": object_id}}
+    return {"$or": [
+        {sort_field: {"$lt": value}},
+        {sort_field: value, "_id": {"$lt": object_id}},
+        {sort_field: None},
+    ]}
+
+
+def keyset_page(collection, query, sort_field, limit, cursor=None, projection=None):
+    """
+    One page of ``collection`` matching ``query``, newest ``sort_field`` first.
+    Returned items never include ``_id``; with an inclusion projection only
+    the requested fields are returned.
+
+    Args:
+        cursor (str): next_cursor of the previous page, None for the first page
+
+    Returns:
+        tuple: (items, next_cursor), next_cursor is None on the last page
+
+    Raises:
+        InvalidCursor: If ``cursor`` is malformed
+    """
+    projection = dict(projection or {})
+    projection.pop("_id", None)
+    hidden = set()
+    if any(projection.values()) and not projection.get(sort_field):
+        # Inclusion projection: fetch the sort key for the cursor, then drop it
+        projection[sort_field] = 1
+        hidden.add(sort_field)
+
+    if cursor:
+        value, object_id = decode_keyset_cursor(cursor)
+        query = {"$and": [query, _after(sort_field, value, object_id)]} if query else _after(sort_field, value, object_id)
+
+    items = list(
+        collection.find(query, projection or None)
+        .sort([(sort_field, -1), ("_id", -1)])
+        .limit(limit + 1)
+    )
+
+    next_cursor = None
+    if len(items) > limit:
+        items = items[:limit]
+        next_cursor = encode_keyset_cursor(items[-1].get(sort_field), items[-1]["_id"])
+    for item in items:
+        item.pop("_id", None)
+        for field in hidden:
+            item.pop(field, None)
+    return items, next_cursor
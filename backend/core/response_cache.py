@@ -0,0 +1,100 @@
+"""
+Shared cache of article list and search results.
+
+Results are stored in the 'responses' cache under the ingest generation and
+the parsed, normalized request params, so every entry of an older generation is
+simply never looked up again once an ingest stores new articles. The backend
+is locmem (bounded by RESPONSE_CACHE_MAX_ENTRIES) unless
+RESPONSE_CACHE_BACKEND points at a shared one.
+
+Identical misses are coalesced: while one request computes an entry, other
+requests for the same key in this process wait for its result instead of
+running the same MongoDB query (single-flight).
+"""
+
+from django.conf import settings
+from django.core.cache import caches
+from .ingestion.generation import get_ingest_state
+import threading
+import hashlib
+import json
+
+
+def get_response_cache():
+    return caches['responses']
+
+
+def normalize_search_text(text):
+    """Search text with case and spacing dropped (MongoDB text search ignores both)."""
+    return " ".join(text.lower().split())
+
+
+def response_cache_key(name, generation, key):
+    digest = hashlib.blake2b(
+        json.dumps(key, separators=(",", ":"), sort_keys=True, default=str).encode("utf-8"),
+        digest_size=16
+    ).hexdigest()
+    return f"response:{name}:{generation}:{digest}"
+
+
+class _Flight:
+    """One in-progress computation that identical requests wait on."""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.value = None
+        self.error = None
+
+
+_flights = {}
+_flights_lock = threading.Lock()
+
+
+def cached_response(name, key, compute):
+    """
+    The cached result for ``key`` in the current ingest generation, computing
+    and storing it on a miss. Concurrent misses for the same key share one
+    call to ``compute``; if it raises, they all get its exception. A waiter
+    that gives up after RESPONSE_CACHE_WAIT seconds computes the result itself.
+
+    Args:
+        name (str): Endpoint name, namespacing the key
+        key: JSON-serializable description of the request, built from parsed params
+        compute (callable): Builds the result; exceptions are not cached
+
+    Returns:
+        The result, which callers must not modify
+    """
+    cache = get_response_cache()
+    generation, _ = get_ingest_state()
+    cache_key = response_cache_key(name, generation, key)
+
+    value = cache.get(cache_key)
+    if value is not None:
+        return value
+
+    with _flights_lock:
+        flight = _flights.get(cache_key)
+        leader = flight is None
+        if leader:
+            flight = _flights[cache_key] = _Flight()
+
+    if not leader:
+        if flight.done.wait(settings.RESPONSE_CACHE_WAIT):
+            if flight.error is not None:
+                raise flight.error
+            # Shared with the leader: results are only read once computed
+            return flight.value
+        return compute()
+
+    try:
+        flight.value = compute()
+        cache.set(cache_key, flight.value)
+        return flight.value
+    except Exception as e:
+        flight.error = e
+        raise
+    finally:
+        with _flights_lock:
+            _flights.pop(cache_key, None)
+        flight.done.set()
@@ -0,0 +1,179 @@
+"""
+Time-decayed engagement counters for trending articles and categories.
+
+Counters use forward decay: an event at time t adds weight * e^(rate * (t - landmark))
+to its counter with a single $inc, and the decayed value at time now is
+score * e^(-rate * (now - landmark)). Every counter decays by the same factor,
+so the stored scores rank correctly at any moment and "top N trending" is an
+index walk instead of a scan of reading_history or user_analytics.
+"""
+
+from django.conf import settings
+from pymongo import UpdateOne, DESCENDING, ReturnDocument
+from datetime import datetime
+from .db import engagement_counters_collection
+import math
+import logging
+
+logger = logging.getLogger(__name__)
+
+LANDMARK_ID = "landmark"
+
+# Event weights: a tracked click counts once, a reading session adds up to
+# two more for time spent and another one when the article was finished
+VIEW_WEIGHT = 1.0
+SESSION_MAX_TIME_WEIGHT = 2.0
+SESSION_FULL_READ_SECONDS = 180
+SESSION_COMPLETED_WEIGHT = 1.0
+
+# Rescale once e^(rate * elapsed) would exceed e^MAX_EXPONENT, long before float overflow
+MAX_EXPONENT = 500
+
+
+def _rate():
+    """Decay rate per second for the configured half-life."""
+    return math.log(2) / (settings.TRENDING_HALF_LIFE_HOURS * 3600)
+
+
+def _landmark():
+    """The reference time of the stored scores, created on first use."""
+    doc = engagement_counters_collection.find_one({"_id": LANDMARK_ID})
+    if doc is None:
+        doc = engagement_counters_collection.find_one_and_update(
+            {"_id": LANDMARK_ID},
+            {"$setOnInsert": {"kind": "meta", "at": datetime.utcnow()}},
+            upsert=True,
+            return_document=ReturnDocument.AFTER
+        )
+    return doc["at"]
+
+
+def _rescale(old_landmark, new_landmark):
+    """Move the landmark forward, shrinking every score so decayed values are unchanged."""
+    claimed = engagement_counters_collection.update_one(
+        {"_id": LANDMARK_ID, "at": old_landmark},
+        {"$set": {"at": new_landmark}}
+    )
+    if not claimed.modified_count:
+        return  # Another worker already rescaled
+    factor = math.exp(-_rate() * (new_landmark - old_landmark).total_seconds())
+    engagement_counters_collection.update_many(
+        {"kind": {"$in": ["article", "category"]}},
+        {"$mul": {"score": factor}}
+    )
+    logger.info(f"📈 Rescaled trending counters to landmark {new_landmark.isoformat()}")
+
+
+def session_weight(reading_time, completed):
+    """Engagement weight of a reading session."""
+    try:
+        seconds = max(float(reading_time or 0), 0.0)
+    except (TypeError, ValueError):
+        seconds = 0.0
+    weight = SESSION_MAX_TIME_WEIGHT * min(seconds / SESSION_FULL_READ_SECONDS, 1.0)
+    if completed:
+        weight += SESSION_COMPLETED_WEIGHT
+    return weight
+
+
+def record_engagement(article_url, category="", weight=VIEW_WEIGHT, at=None):
+    """
+    Add an engagement event to the article's and its category's counters.
+
+    Args:
+        article_url (str): Article that was engaged with
+        category (str): Its category ("" skips the category counter)
+        weight (float): Event weight
+        at (datetime): Event time (UTC), defaults to now
+    """
+    if not article_url or weight <= 0:
+        return
+    at = at or datetime.utcnow()
+
+    landmark = _landmark()
+    exponent = _rate() * (at - landmark).total_seconds()
+    if exponent > MAX_EXPONENT:
+        _rescale(landmark, at)
+        landmark = _landmark()
+        exponent = _rate() * (at - landmark).total_seconds()
+    increment = weight * math.exp(exponent)
+
+    update = {
+        "$inc": {"score": increment, "events": 1},
+        "$set": {"kind": "article", "key": article_url, "last_event_at": at},
+    }
+    if category:
+        update["$set"]["category"] = category
+    else:
+        update["$setOnInsert"] = {"category": ""}
+    operations = [UpdateOne({"_id": f"article:{article_url}"}, update, upsert=True)]
+    if category:
+        operations.append(UpdateOne(
+            {"_id": f"category:{category}"},
+            {
+                "$inc": {"score": increment, "events": 1},
+                "$set": {"kind": "category", "key": category, "category": category, "last_event_at": at}
+            },
+            upsert=True
+        ))
+    engagement_counters_collection.bulk_write(operations, ordered=False)
+
+
+def _decay_factor(now=None):
+    """Multiplier turning stored scores into decayed scores at ``now``."""
+    now = now or datetime.utcnow()
+    return math.exp(-_rate() * (now - _landmark()).total_seconds())
+
+
+def _decayed(counters):
+    """Public view of counter documents with their current decayed score."""
+    factor = _decay_factor()
+    return [
+        {
+            "key": counter["key"],
+            "category": counter.get("category", ""),
+            "trending_score": round(counter["score"] * factor, 4),
+            "events": counter.get("events", 0),
+            "last_event_at": counter.get("last_event_at"),
+        }
+        for counter in counters
+    ]
+
+
+def get_trending_articles(limit=20, category=None):
+    """Top articles by decayed engagement, best first."""
+    query = {"kind": "article"}
+    if category:
+        query["category"] = category
+    counters = engagement_counters_collection.find(query).sort("score", DESCENDING).limit(limit)
+    return _decayed(list(counters))
+
+
+def get_trending_categories(limit=10):
+    """Top categories by decayed engagement, best first."""
+    counters = engagement_counters_collection.find({"kind": "category"}).sort("score", DESCENDING).limit(limit)
+    return _decayed(list(counters))
+
+
+def get_trending_strengths(article_urls):
+    """
+    Trending strength (0-1) of each URL relative to the most trending article.
+    Uses a log scale so a few viral articles do not flatten everything else.
+
+    Returns:
+        dict: url -> strength, for URLs that have counters
+    """
+    if not article_urls:
+        return {}
+    top = engagement_counters_collection.find_one({"kind": "article"}, sort=[("score", DESCENDING)])
+    if not top or top["score"] <= 0:
+        return {}
+    factor = _decay_factor()
+    ceiling = math.log1p(top["score"] * factor)
+    if ceiling <= 0:
+        return {}
+    counters = engagement_counters_collection.find(
+        {"_id": {"$in": [f"article:{url}" for url in article_urls]}},
+        {"key": 1, "score": 1}
+    )
+    return {c["key"]: math.log1p(c["score"] * factor) / ceiling for c in counters}
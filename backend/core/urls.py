@@ -1,8 +1,9 @@
 from django.urls import path
 from .views import (
-    update_articles, get_articles, register_user, update_preferences, 
+    update_articles, get_update_status, get_articles, register_user, update_preferences, 
     get_preferences, get_filtered_articles, track_article_view, 
-    get_reading_history, get_personalized_recommendations, search_articles,
+    get_reading_history, get_personalized_recommendations, get_trending_articles, search_articles,
+    get_article_detail,
     track_search_query, get_search_suggestions,
     add_bookmark, remove_bookmark, get_bookmarks, check_bookmark_status,
     create_reading_list, get_reading_lists, add_to_reading_list,
@@ -17,10 +18,13 @@ from rest_framework_simplejwt.views import TokenObtainPairView, TokenRefreshView
 
 urlpatterns = [
     path("articles/update/", update_articles),
+    path("articles/update/status/<str:job_id>/", get_update_status),
     path("articles/", get_articles),
     path("articles/filtered/", get_filtered_articles),
     path("articles/personalized/", get_personalized_recommendations),
+    path("articles/trending/", get_trending_articles),
     path("articles/search/", search_articles),
+    path("articles/detail/", get_article_detail),
     path("articles/track/", track_article_view),
     path("register/", register_user),
     path("login/", TokenObtainPairView.as_view(), name='token_obtain_pair'),
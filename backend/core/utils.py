@@ -1,14 +1,27 @@
 from datetime import datetime
-from .ai_tasks.summarize import generate_summary
-from .ai_tasks.sentiment import analyze_sentiment
-from .ai_tasks.ner import extract_entities
-from .ai_tasks.classify_category import predict_category, CATEGORY_LABELS
-from .news_sources.newsapi import fetch_from_newsapi
-from .news_sources.gnews import fetch_from_gnews
-from .news_sources.mediastack import fetch_from_mediastack
-from .db import articles_collection
+from .ai_tasks.worker_pool import EnrichmentPool, enrich_batch
+from .ai_tasks.article_index import update_article_index
+from .ai_tasks.ann_index import update_ann_index
+from .ai_tasks.feature_store import get_feature_store, write_feature_store
+from .news_sources.concurrent_fetch import SOURCE_FETCHERS, fetch_from_all_sources
+from .news_sources.article_scraper import scrape_article_contents
+from .ingestion.dedupe import known_url_filter
+from .ingestion.writer import BulkArticleWriter
+from .ingestion.generation import bump_ingest_generation
+from .ingestion.pipeline import Pipeline, Stage
+from django.conf import settings
+from .db import articles_collection, article_bodies_collection
+import threading
+import logging
+import os
 import re
 
+logger = logging.getLogger(__name__)
+
+# Lazily created model worker pool, shared by all ingest runs in this process
+_enrichment_pool = None
+_enrichment_pool_lock = threading.Lock()
+
 def clean_article_content(content, description=""):
     """Extract and clean article content."""
     # Combine description and content
@@ -23,90 +36,193 @@ def clean_article_content(content, description=""):
     
     return full_text
 
-def aggregate_and_store_articles():
-    """Fetch articles from all sources and process with AI."""
-    all_articles = (
-        fetch_from_newsapi() +
-        fetch_from_gnews() +
-        fetch_from_mediastack()
-    )
-
-    print(f"🔎 Total articles fetched: {len(all_articles)}")
+def prepare_article(article):
+    """
+    Build the text used for AI processing.
+    
+    Returns:
+        str: Cleaned full content, or None if the article has too little text
+    """
+    content = article.get("content", "")
+    description = article.get("description", "")
+    full_content = clean_article_content(content, description)
+    
+    # Skip only if content is completely empty or just placeholder
+    if not full_content or full_content == "Article content unavailable.":
+        # Try using title + description as last resort
+        full_content = f"{article.get('title', '')} {description}".strip()
+    
+    # Very lenient check - only skip if truly empty (less than 10 words)
+    if len(full_content.split()) < 10:
+        print(f"⏭️ Skipped (no content): {article['title'][:50]}")
+        return None
+    
+    return full_content
 
-    inserted = 0
-    for article in all_articles:
-        # Skip duplicates
-        if articles_collection.find_one({"url": article["url"]}):
-            continue
+def get_enrichment_pool():
+    """Return the shared model worker pool, or None when ENRICHMENT_POOL_SIZE is 0."""
+    global _enrichment_pool
+    size = settings.ENRICHMENT_POOL_SIZE
+    if size <= 0:
+        return None
+    with _enrichment_pool_lock:
+        if _enrichment_pool is None:
+            torch_threads = settings.ENRICHMENT_TORCH_THREADS or max(1, (os.cpu_count() or 1) // size)
+            _enrichment_pool = EnrichmentPool(size, torch_threads)
+    return _enrichment_pool
 
-        # Get and clean content
-        content = article.get("content", "")
-        description = article.get("description", "")
-        full_content = clean_article_content(content, description)
-        
-        # Skip only if content is completely empty or just placeholder
-        if not full_content or full_content == "Article content unavailable.":
-            # Try using title + description as last resort
-            full_content = f"{article.get('title', '')} {description}".strip()
+def enrich_articles(items):
+    """
+    Run summarization, sentiment, NER and categorization on a batch of articles,
+    in a model worker process when the enrichment pool is enabled.
+    
+    Args:
+        items (list): (article, full_content) pairs
         
-        # Very lenient check - only skip if truly empty (less than 10 words)
-        if len(full_content.split()) < 10:
-            print(f"⏭️ Skipped (no content): {article['title'][:50]}")
-            continue
+    Returns:
+        list: The enriched articles
+    """
+    articles = [article for article, _ in items]
+    payload = [
+        {
+            "title": article.get("title") or "",
+            "description": article.get("description", ""),
+            "category": article.get("category", "general"),
+            "full_content": full_content,
+        }
+        for article, full_content in items
+    ]
+    batch_sizes = {
+        "summary_batch_size": settings.SUMMARY_BATCH_SIZE,
+        "sentiment_batch_size": settings.SENTIMENT_BATCH_SIZE,
+        "ner_batch_size": settings.NER_BATCH_SIZE,
+    }
+    
+    pool = get_enrichment_pool()
+    if pool:
+        results = pool.enrich(payload, **batch_sizes)
+    else:
+        results = enrich_batch(payload, **batch_sizes)
+    
+    for article, result in zip(articles, results):
+        article.update(result)
+        # Add timestamp
+        article["ingested_at"] = datetime.utcnow()
+    
+    return articles
+
+def build_ingest_pipeline(writer):
+    """
+    Build the ingestion stages:
+    source fetch -> dedupe -> scrape -> clean -> AI enrichment -> store.
+    """
+    seen_urls = set()
+    seen_lock = threading.Lock()
+
+    def fetch_sources(batch):
+        # Each source runs under NEWS_SOURCE_DEADLINE: a failing or slow provider
+        # only loses its own articles instead of stalling the pipeline
+        return fetch_from_all_sources(dict(batch), max_workers=len(batch), scrape=False)
 
-        print(f"\n🔄 Processing: {article['title'][:60]}...")
+    def dedupe(batch):
+        # Skip duplicates before any scraping or model work; seen_urls also
+        # catches the same story arriving from two sources in one run
+        with seen_lock:
+            batch = [a for a in batch if a.get("url") not in seen_urls]
+            seen_urls.update(a.get("url") for a in batch)
+        return known_url_filter.filter_new(batch)
+
+    def clean(batch):
+        prepared = []
+        for article in batch:
+            full_content = prepare_article(article)
+            if full_content:
+                prepared.append((article, full_content))
+        return prepared
+
+    def store(batch):
+        for article in batch:
+            writer.add(article)
+        return []
+
+    pool = get_enrichment_pool()
+    queue_size = settings.INGEST_QUEUE_SIZE
+    return Pipeline([
+        Stage("fetch", fetch_sources, workers=settings.NEWS_FETCH_MAX_WORKERS, queue_size=queue_size),
+        Stage("dedupe", dedupe, batch_size=settings.INGEST_DEDUPE_BATCH_SIZE, queue_size=queue_size),
+        Stage("scrape", scrape_article_contents, workers=settings.SCRAPER_MAX_CONCURRENCY, queue_size=queue_size),
+        Stage("clean", clean, queue_size=queue_size),
+        Stage(
+            "enrich", enrich_articles,
+            # With a worker pool, keep one batch in flight per worker process
+            workers=pool.size if pool else settings.INGEST_ENRICH_WORKERS,
+            batch_size=settings.INGEST_ENRICH_BATCH_SIZE,
+            batch_wait=settings.INGEST_ENRICH_BATCH_WAIT,
+            queue_size=queue_size
+        ),
+        Stage("store", store, queue_size=queue_size),
+    ], name="ingest")
+
+def aggregate_and_store_articles(on_progress=None, on_step=None):
+    """
+    Fetch articles from all sources and process with AI.
+    
+    Args:
+        on_progress (callable): Receives per-stage pipeline stats while the run is in progress
+        on_step (callable): Receives the name of each post-pipeline step as it
+            starts, and "done" once the last one has finished
         
-        # AI Processing - Summarization
-        try:
-            article["summary"] = generate_summary(full_content)
-            if not article["summary"]:
-                # Use description as fallback
-                article["summary"] = description[:200] if description else ""
-        except Exception as e:
-            print(f"⚠️ Summarization failed: {e}")
-            article["summary"] = description[:200] if description else ""
+    Returns:
+        int: Number of new articles stored
+    """
+    stored_urls = []
+    on_step = on_step or (lambda step: None)
 
-        # AI Processing - Sentiment Analysis
-        try:
-            sentiment = analyze_sentiment(full_content)
-            article["sentiment_label"] = sentiment["label"]
-            article["sentiment_confidence"] = sentiment["confidence"]
-        except Exception as e:
-            print(f"⚠️ Sentiment analysis failed: {e}")
-            article["sentiment_label"] = "Neutral"
-            article["sentiment_confidence"] = 0.0
+    def on_stored(urls):
+        known_url_filter.add(urls)
+        stored_urls.extend(urls)
 
-        # AI Processing - Named Entity Recognition
-        try:
-            article["entities"] = extract_entities(full_content)
-        except Exception as e:
-            print(f"⚠️ NER failed: {e}")
-            article["entities"] = []
-
-        # AI Processing - Category Classification
-        source_category = article.get("category", "general").lower()
-
-        if source_category != "general" and source_category in CATEGORY_LABELS:
-            article["category"] = source_category
-            print(f"✅ Category (from source): {source_category}")
-        else:
-            article["category"] = predict_category(
-                article["title"], 
-                full_content, 
-                fallback_label="general"
-            )
+    writer = BulkArticleWriter(
+        articles_collection,
+        batch_size=settings.INGEST_WRITE_BATCH_SIZE,
+        flush_interval=settings.INGEST_WRITE_FLUSH_INTERVAL,
+        on_stored=on_stored,
+        bodies_collection=article_bodies_collection
+    )
+    pipeline = build_ingest_pipeline(writer)
+    writer.start()
+    try:
+        pipeline.run(SOURCE_FETCHERS.items(), on_progress=on_progress)
+    finally:
+        writer.stop()
 
-        # Add timestamp
-        article["ingested_at"] = datetime.utcnow()
+    try:
+        writer.flush()
+    except Exception as e:
+        print(f"❌ Failed to insert articles: {e}")
 
-        # Insert into MongoDB
+    # Extend the recommendation vector and candidate indexes with the new articles
+    on_step("index")
+    article_index = None
+    try:
+        article_index = update_article_index(stored_urls)
+        update_ann_index(article_index)
+    except Exception as e:
+        logger.error(f"❌ Failed to update article index: {str(e)}")
+
+    # Publish a new ranking feature snapshot for the web workers
+    on_step("feature_store")
+    if stored_urls or get_feature_store() is None:
         try:
-            articles_collection.insert_one(article)
-            inserted += 1
-            print(f"✅ Inserted: {article['title'][:50]}...")
+            write_feature_store(article_index)
         except Exception as e:
-            print(f"❌ Failed to insert article: {e}")
+            logger.error(f"❌ Failed to write feature store: {str(e)}")
 
+    inserted = writer.inserted
+    if inserted:
+        # New articles: feeds and other corpus-derived caches are now stale
+        generation = bump_ingest_generation()
+        logger.info(f"🆕 Ingest generation {generation}")
+    on_step("done")
     print(f"\n🎉 Successfully inserted {inserted} new articles!")
     return inserted
-
@@ -1,6 +1,22 @@
 # views.py
 from django.http import JsonResponse
-from .utils import aggregate_and_store_articles
+from .ingestion.jobs import start_ingest_job, get_job
+from .ingestion.generation import get_ingest_state
+from .conditional import Validators
+from .response_cache import cached_response, normalize_search_text
+from .feed_cache import (
+    get_feed_cache, feed_cache_key, bump_feed_version,
+    encode_cursor, decode_cursor, InvalidCursor
+)
+from .pagination import page_size, keyset_page
+from .fieldsets import (
+    requested_fields, article_projection, select_fields,
+    InvalidFieldset, RECOMMENDATION_CARD_FIELDS
+)
+from .trending import (
+    record_engagement, get_trending_articles as get_trending_counters,
+    get_trending_categories, get_trending_strengths, VIEW_WEIGHT
+)
 from .db import (
     articles_collection, user_pref_collection, reading_history_collection, 
     search_history_collection, bookmarks_collection, reading_lists_collection,
@@ -11,6 +27,7 @@ from rest_framework.permissions import IsAuthenticated, AllowAny
 from rest_framework.response import Response
 from rest_framework import status
 from rest_framework_simplejwt.tokens import RefreshToken
+from django.conf import settings
 from .serializers import RegisterSerializer
 from datetime import datetime
 import logging
@@ -19,15 +36,17 @@ logger = logging.getLogger(__name__)
 
 
 def update_articles(request):
-    """Fetch and store new articles from all news sources."""
+    """Start a background job that fetches and stores new articles from all news sources."""
     try:
         logger.info("🔁 Article update requested")
-        count = aggregate_and_store_articles()
+        job_id, created = start_ingest_job(trigger="api")
         return JsonResponse({
-            "status": "success",
-            "message": f"{count} new articles stored",
-            "count": count
-        })
+            "status": "accepted",
+            "message": "Article update started" if created else "Article update already in progress",
+            "job_id": job_id,
+            "joined_existing": not created,
+            "status_url": f"/articles/update/status/{job_id}/"
+        }, status=202)
     except Exception as e:
         logger.error(f"❌ Error updating articles: {str(e)}")
         return JsonResponse({
@@ -37,11 +56,79 @@ def update_articles(request):
         }, status=500)
 
 
+def get_update_status(request, job_id):
+    """Get progress, per-stage counts and timings of an article update job."""
+    try:
+        job = get_job(job_id)
+        if not job:
+            return JsonResponse({
+                "status": "error",
+                "message": "Update job not found"
+            }, status=404)
+        return JsonResponse(job)
+    except Exception as e:
+        logger.error(f"❌ Error fetching update status: {str(e)}")
+        return JsonResponse({
+            "status": "error",
+            "message": "Failed to fetch update status",
+            "error": str(e)
+        }, status=500)
+
+
 def get_articles(request):
-    """Get all articles from the database."""
+    """
+    Get articles from the database, newest first, one page at a time.
+    The body is the list of articles; the cursor of the next page is in the
+    X-Next-Cursor header (and a Link rel="next" header) when there is one.
+    Responses carry ETag/Last-Modified validators; see core/conditional.py.
+    Query params: limit (page size), cursor, category, view (card|full) or fields
+    """
     try:
-        articles = list(articles_collection.find({}, {"_id": 0}))
-        return JsonResponse(articles, safe=False)
+        try:
+            limit = page_size(request.GET.get('limit'))
+        except ValueError:
+            return JsonResponse({
+                "status": "error",
+                "message": "limit must be an integer"
+            }, status=400)
+        try:
+            fields = requested_fields(request.GET)
+        except InvalidFieldset as e:
+            return JsonResponse({
+                "status": "error",
+                "message": str(e)
+            }, status=400)
+        category = request.GET.get('category', '').strip().lower()
+        query = {"category": category} if category else {}
+        
+        validators = Validators(request)
+        not_modified = validators.not_modified(request)
+        if not_modified:
+            return not_modified
+        
+        cursor = request.GET.get('cursor')
+        try:
+            articles, next_cursor = cached_response(
+                "articles",
+                {"category": category, "limit": limit, "cursor": cursor, "fields": fields},
+                lambda: keyset_page(
+                    articles_collection, query, "publishedAt", limit,
+                    cursor=cursor, projection=article_projection(fields)
+                )
+            )
+        except InvalidCursor as e:
+            return JsonResponse({
+                "status": "error",
+                "message": str(e)
+            }, status=400)
+        
+        response = JsonResponse(articles, safe=False)
+        if next_cursor:
+            response["X-Next-Cursor"] = next_cursor
+            params = request.GET.copy()
+            params["cursor"] = next_cursor
+            response["Link"] = f'<{request.path}?{params.urlencode()}>; rel="next"'
+        return validators.apply(response)
     except Exception as e:
         logger.error(f"❌ Error fetching articles: {str(e)}")
         return JsonResponse({
@@ -94,7 +181,7 @@ def update_preferences(request):
         # Update user preferences in the database
         user_pref_collection.update_one(
             {'username': user},
-            {'$set': {'categories': categories}},
+            {'$set': {'categories': categories}, '$inc': {'feed_version': 1}},
             upsert=True
         )
         
@@ -118,7 +205,7 @@ def get_preferences(request):
     """Get user's category preferences."""
     try:
         user = request.user.username
-        prefs = user_pref_collection.find_one({'username': user}, {'_id': 0})
+        prefs = user_pref_collection.find_one({'username': user}, {'_id': 0, 'feed_version': 0})
         return Response(prefs or {"categories": []})
     except Exception as e:
         logger.error(f"❌ Error fetching preferences: {str(e)}")
@@ -132,9 +219,27 @@ def get_preferences(request):
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
 def get_filtered_articles(request):
-    """Get articles filtered by user's category preferences."""
+    """
+    Get articles filtered by user's category preferences, newest first.
+    Query params: limit (page size), cursor (next_cursor of the previous page),
+    view (card|full) or fields. Responses carry ETag/Last-Modified validators.
+    """
     try:
         user = request.user.username
+        try:
+            limit = page_size(request.GET.get('limit'))
+        except ValueError:
+            return Response({
+                "status": "error",
+                "message": "limit must be an integer"
+            }, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            fields = requested_fields(request.GET)
+        except InvalidFieldset as e:
+            return Response({
+                "status": "error",
+                "message": str(e)
+            }, status=status.HTTP_400_BAD_REQUEST)
         prefs = user_pref_collection.find_one({'username': user}, {'_id': 0})
         
         if not prefs:
@@ -151,17 +256,36 @@ def get_filtered_articles(request):
                 "message": "No category preferences selected."
             })
 
-        filtered_articles = list(articles_collection.find(
-            {"category": {"$in": categories}},
-            {"_id": 0}
-        ).sort("publishedAt", -1))  # Sort by newest first
+        # The list only depends on the corpus and the user's categories
+        validators = Validators(request, user_state=sorted(categories))
+        not_modified = validators.not_modified(request)
+        if not_modified:
+            return not_modified
+
+        # Shared by every user with the same categories
+        cursor = request.GET.get('cursor')
+        try:
+            filtered_articles, next_cursor = cached_response(
+                "filtered",
+                {"categories": sorted(categories), "limit": limit, "cursor": cursor, "fields": fields},
+                lambda: keyset_page(
+                    articles_collection, {"category": {"$in": categories}}, "publishedAt", limit,
+                    cursor=cursor, projection=article_projection(fields)
+                )
+            )
+        except InvalidCursor as e:
+            return Response({
+                "status": "error",
+                "message": str(e)
+            }, status=status.HTTP_400_BAD_REQUEST)
 
         logger.info(f"✅ Fetched {len(filtered_articles)} filtered articles for user: {user}")
-        return Response({
+        return validators.apply(Response({
             "articles": filtered_articles,
             "count": len(filtered_articles),
-            "categories": categories
-        })
+            "categories": categories,
+            "next_cursor": next_cursor
+        }))
     except Exception as e:
         logger.error(f"❌ Error fetching filtered articles: {str(e)}")
         return Response({
@@ -207,6 +331,25 @@ def track_article_view(request):
         
         reading_history_collection.insert_one(reading_entry)
         
+        # Fold the read into the stored interest profile; tracking succeeds regardless
+        try:
+            from .ai_tasks.article_index import get_article_index
+            from .ai_tasks.user_profiles import record_read
+            record_read(user, article_url, get_article_index(), reading_entry["timestamp"])
+        except Exception as e:
+            logger.warning(f" Could not update interest profile for {user}: {str(e)}")
+        
+        # The read changes the user's recommendations
+        try:
+            bump_feed_version(user)
+        except Exception as e:
+            logger.warning(f" Could not invalidate feed for {user}: {str(e)}")
+        
+        try:
+            record_engagement(article_url, article_category, VIEW_WEIGHT, reading_entry["timestamp"])
+        except Exception as e:
+            logger.warning(f" Could not update trending counters: {str(e)}")
+        
         logger.info(f" Tracked article view for user: {user}, article: {article_title[:50] if article_title else 'Unknown'}")
         return Response({
             "status": "success",
@@ -224,20 +367,36 @@ def track_article_view(request):
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
 def get_reading_history(request):
-    """Get user's reading history."""
+    """
+    Get user's reading history, most recent first.
+    Query params: limit (page size), cursor (next_cursor of the previous page)
+    """
     try:
         user = request.user.username
-        limit = int(request.GET.get('limit', 50))
+        try:
+            limit = page_size(request.GET.get('limit'))
+        except ValueError:
+            return Response({
+                "status": "error",
+                "message": "limit must be an integer"
+            }, status=status.HTTP_400_BAD_REQUEST)
         
-        history = list(reading_history_collection.find(
-            {"username": user},
-            {"_id": 0}
-        ).sort("timestamp", -1).limit(limit))
+        try:
+            history, next_cursor = keyset_page(
+                reading_history_collection, {"username": user}, "timestamp", limit,
+                cursor=request.GET.get('cursor'), projection={"_id": 0}
+            )
+        except InvalidCursor as e:
+            return Response({
+                "status": "error",
+                "message": str(e)
+            }, status=status.HTTP_400_BAD_REQUEST)
         
         logger.info(f" Fetched {len(history)} reading history items for user: {user}")
         return Response({
             "history": history,
-            "count": len(history)
+            "count": len(history),
+            "next_cursor": next_cursor
         })
     except Exception as e:
         logger.error(f" Error fetching reading history: {str(e)}")
@@ -248,15 +407,111 @@ def get_reading_history(request):
         }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
 
+def _rank_feed(user, prefs, size):
+    """
+    Run the recommendation pipeline for a user.
+    
+    Returns:
+        tuple: (ranked articles, number of reads used), articles is empty
+            when there is nothing to recommend from
+    """
+    from .ai_tasks.recommendations import get_recommendations
+    from .ai_tasks.article_index import get_article_index
+    from .ai_tasks.user_profiles import get_user_profile_vector
+    from .ai_tasks.ann_index import fetch_candidate_articles, fetch_candidate_rows
+    from .ai_tasks.co_reads import get_co_read_index
+    from .ai_tasks.feature_store import get_feature_store, hydrate_articles
+    from .ai_tasks.recommendations import get_feature_recommendations
+    
+    # Fetch user's reading history
+    reading_history = list(reading_history_collection.find(
+        {"username": user},
+        {"_id": 0}
+    ).sort("timestamp", -1).limit(100))  # Last 100 reads
+    
+    # Stored interest profile, kept up to date by track_article_view
+    article_index = get_article_index()
+    user_profile = get_user_profile_vector(user, article_index) if reading_history else None
+    co_reads = get_co_read_index()
+    exclude_urls = {item['article_url'] for item in reading_history}
+    recent_reads = [item['article_url'] for item in reading_history[:20]]
+    
+    store = get_feature_store()
+    if article_index is not None and store is not None and store.index_fit_id == article_index.fit_id:
+        # Candidates and their features come from the shared memory-mapped
+        # snapshot; only the articles that make the feed are loaded
+        rows = fetch_candidate_rows(
+            prefs, store, article_index, user_profile,
+            exclude_urls=exclude_urls, co_reads=co_reads, recent_reads=recent_reads
+        )
+        references = get_feature_recommendations(
+            store, rows, prefs, reading_history,
+            limit=size,
+            article_index=article_index,
+            user_profile=user_profile,
+            co_reads=co_reads,
+            trending=get_trending_strengths(store.urls(rows))
+        )
+        if references:
+            return hydrate_articles(references), len(reading_history)
+    
+    if article_index is not None:
+        # Only fully score the ANN and co-read neighbours of the user's reads plus the newest articles
+        all_articles = fetch_candidate_articles(
+            prefs, article_index, user_profile,
+            exclude_urls=exclude_urls, co_reads=co_reads, recent_reads=recent_reads
+        )
+    else:
+        # No index built yet: score every article
+        all_articles = list(articles_collection.find({}, {"_id": 0, "content": 0}))
+    
+    if not all_articles:
+        return [], len(reading_history)
+    
+    # Generate personalized recommendations using ML
+    recommendations = get_recommendations(
+        user_preferences=prefs,
+        reading_history=reading_history,
+        all_articles=all_articles,
+        limit=size,
+        article_index=article_index,
+        user_profile=user_profile,
+        co_reads=co_reads,
+        trending=get_trending_strengths([a.get('url') for a in all_articles])
+    )
+    return recommendations, len(reading_history)
+
+
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
 def get_personalized_recommendations(request):
-    """Get ML-powered personalized article recommendations."""
+    """
+    Get ML-powered personalized article recommendations.
+    The ranked feed is cached per user and paged with cursors; on a cache miss
+    a feed precomputed after the latest ingest is used when still current.
+    Responses carry ETag/Last-Modified validators keyed on the user's feed_version.
+    Query params: limit (page size), cursor (next_cursor of the previous page),
+    view (card|full) or fields
+    """
+    limit = 50
+    fields = None
     try:
-        from .ai_tasks.recommendations import get_recommendations
-        
         user = request.user.username
-        limit = int(request.GET.get('limit', 50))
+        try:
+            limit = page_size(request.GET.get('limit'))
+        except ValueError:
+            return Response({
+                "status": "error",
+                "message": "limit must be an integer"
+            }, status=status.HTTP_400_BAD_REQUEST)
+        cursor = request.GET.get('cursor')
+        try:
+            fields = requested_fields(request.GET, extra_card_fields=RECOMMENDATION_CARD_FIELDS)
+        except InvalidFieldset as e:
+            return Response({
+                "status": "error",
+                "message": str(e)
+            }, status=status.HTTP_400_BAD_REQUEST)
         
         # Fetch user preferences
         prefs = user_pref_collection.find_one({'username': user}, {'_id': 0})
@@ -266,37 +521,76 @@ def get_personalized_recommendations(request):
                 "message": "Please set your category preferences first to get personalized recommendations."
             })
         
-        # Fetch user's reading history
-        reading_history = list(reading_history_collection.find(
-            {"username": user},
-            {"_id": 0}
-        ).sort("timestamp", -1).limit(100))  # Last 100 reads
-        
-        # Fetch all available articles
-        all_articles = list(articles_collection.find({}, {"_id": 0}))
-        
-        if not all_articles:
-            return Response({
-                "articles": [],
-                "message": "No articles available. Please wait while we fetch the latest news."
-            })
-        
-        # Generate personalized recommendations using ML
-        recommendations = get_recommendations(
-            user_preferences=prefs,
-            reading_history=reading_history,
-            all_articles=all_articles,
-            limit=limit
-        )
-        
-        logger.info(f" Generated {len(recommendations)} ML recommendations for user: {user}")
-        return Response({
-            "articles": recommendations,
-            "count": len(recommendations),
+        # Reads and preference changes bump feed_version, new ingests the generation
+        feed_version = prefs.get('feed_version', 0)
+        validators = Validators(request, user_state=[user, feed_version])
+        not_modified = validators.not_modified(request)
+        if not_modified:
+            return not_modified
+        
+        cache = get_feed_cache()
+        generation, _ = get_ingest_state()
+        offset = 0
+        feed = None
+        if cursor:
+            try:
+                offset, cursor_version, cursor_generation = decode_cursor(cursor)
+            except InvalidCursor as e:
+                return Response({
+                    "status": "error",
+                    "message": str(e)
+                }, status=status.HTTP_400_BAD_REQUEST)
+            # Keep paging the feed the cursor started on while it is still cached
+            feed = cache.get(feed_cache_key(user, cursor_version, cursor_generation))
+            if feed is not None:
+                feed_version, generation = cursor_version, cursor_generation
+        
+        key = feed_cache_key(user, feed_version, generation)
+        if feed is None:
+            feed = cache.get(key)
+        cached = feed is not None and (feed['complete'] or offset + limit <= len(feed['articles']))
+        
+        if not cached and offset + limit <= settings.FEED_CACHE_SIZE:
+            # Warm start: the feed precomputed for this user after the last ingest
+            from .ai_tasks.feed_precompute import load_precomputed_feed
+            precomputed = load_precomputed_feed(user, feed_version, generation)
+            if precomputed and precomputed['articles']:
+                feed = {
+                    "articles": precomputed['articles'],
+                    "complete": len(precomputed['articles']) < settings.FEED_CACHE_SIZE,
+                    "reading_history_count": precomputed['reading_history_count'],
+                }
+                cache.set(key, feed)
+                cached = True
+        
+        if not cached:
+            size = max(settings.FEED_CACHE_SIZE, offset + limit)
+            recommendations, reading_history_count = _rank_feed(user, prefs, size)
+            if not recommendations:
+                return Response({
+                    "articles": [],
+                    "message": "No articles available. Please wait while we fetch the latest news."
+                })
+            feed = {
+                "articles": recommendations,
+                "complete": len(recommendations) < size,
+                "reading_history_count": reading_history_count,
+            }
+            cache.set(key, feed)
+            logger.info(f" Generated {len(recommendations)} ML recommendations for user: {user}")
+        
+        # The cached feed serves every fieldset, so it is applied per page
+        page = [select_fields(article, fields) for article in feed['articles'][offset:offset + limit]]
+        has_more = offset + limit < len(feed['articles'])
+        return validators.apply(Response({
+            "articles": page,
+            "count": len(page),
+            "next_cursor": encode_cursor(offset + limit, feed_version, generation) if has_more else None,
+            "cached": cached,
             "categories": prefs.get('categories', []),
-            "reading_history_count": len(reading_history),
+            "reading_history_count": feed['reading_history_count'],
             "recommendation_engine": "ML-powered (TF-IDF + Collaborative Filtering)"
-        })
+        }))
         
     except Exception as e:
         logger.error(f" Error generating personalized recommendations: {str(e)}")
@@ -306,7 +600,7 @@ def get_personalized_recommendations(request):
             categories = prefs.get('categories', []) if prefs else []
             fallback_articles = list(articles_collection.find(
                 {"category": {"$in": categories}},
-                {"_id": 0}
+                article_projection(fields)
             ).sort("publishedAt", -1).limit(limit))
             
             return Response({
@@ -323,11 +617,98 @@ def get_personalized_recommendations(request):
             }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
 
+@api_view(['GET'])
+@permission_classes([AllowAny])
+def get_trending_articles(request):
+    """
+    Most engaged-with articles and categories across all readers, with
+    recent engagement weighted more (see core/trending.py).
+    Query params: limit (default 20), category
+    """
+    try:
+        try:
+            limit = page_size(request.GET.get('limit'), default=20, maximum=100)
+        except ValueError:
+            return Response({
+                "status": "error",
+                "message": "limit must be an integer"
+            }, status=status.HTTP_400_BAD_REQUEST)
+        category = request.GET.get('category')
+        
+        counters = get_trending_counters(limit=limit, category=category)
+        by_url = {
+            article['url']: article
+            for article in articles_collection.find(
+                {"url": {"$in": [c['key'] for c in counters]}},
+                {"_id": 0, "content": 0}
+            )
+        }
+        articles = [
+            {**by_url[c['key']], "trending_score": c['trending_score'], "engagement_events": c['events']}
+            for c in counters if c['key'] in by_url
+        ]
+        
+        return Response({
+            "articles": articles,
+            "count": len(articles),
+            "categories": [
+                {"category": c['key'], "trending_score": c['trending_score'], "engagement_events": c['events']}
+                for c in get_trending_categories()
+            ]
+        })
+    except Exception as e:
+        logger.error(f" Error fetching trending articles: {str(e)}")
+        return Response({
+            "status": "error",
+            "message": "Failed to fetch trending articles",
+            "error": str(e)
+        }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+@api_view(['GET'])
+@permission_classes([AllowAny])
+def get_article_detail(request):
+    """
+    One article with its full content, which list endpoints leave out.
+    Query params: url (required)
+    """
+    try:
+        from .article_bodies import get_article_body
+
+        url = request.GET.get('url', '').strip()
+        if not url:
+            return Response({
+                "status": "error",
+                "message": "url parameter is required"
+            }, status=status.HTTP_400_BAD_REQUEST)
+        
+        article = articles_collection.find_one({"url": url}, {"_id": 0})
+        if not article:
+            return Response({
+                "status": "error",
+                "message": "Article not found"
+            }, status=status.HTTP_404_NOT_FOUND)
+        
+        # Articles not yet split by split_article_bodies still carry their content inline
+        body = get_article_body(url)
+        if body is not None:
+            article["content"] = body
+        
+        return Response({"article": article})
+    except Exception as e:
+        logger.error(f"❌ Error fetching article detail: {str(e)}")
+        return Response({
+            "status": "error",
+            "message": "Failed to fetch article",
+            "error": str(e)
+        }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
 @api_view(['GET'])
 @permission_classes([AllowAny])
 def search_articles(request):
     """
-    Full-text search across articles with filters.
+    Full-text search across article titles, summaries and bodies, with filters.
     Query params:
     - q: search query (required)
     - category: filter by category
@@ -336,6 +717,8 @@ def search_articles(request):
     - date_to: filter articles before this date (ISO format)
     - sort: sort by 'relevance' (default) or 'date'
     - limit: number of results (default 50)
+    - view: 'card' or 'full' (default), or fields: comma-separated article fields
+    Responses carry ETag/Last-Modified validators; see core/conditional.py.
     """
     try:
         query = request.GET.get('q', '').strip()
@@ -352,49 +735,98 @@ def search_articles(request):
                 "message": "Search query 'q' is required"
             }, status=status.HTTP_400_BAD_REQUEST)
         
-        # Build MongoDB text search query
-        search_filter = {"$text": {"$search": query}}
-        
-        # Add optional filters
-        if category:
-            search_filter["category"] = category
-        
-        if sentiment:
-            search_filter["sentiment_label"] = sentiment.capitalize()
+        try:
+            fields = requested_fields(request.GET)
+        except InvalidFieldset as e:
+            return Response({
+                "status": "error",
+                "message": str(e)
+            }, status=status.HTTP_400_BAD_REQUEST)
         
-        # Date range filter
-        if date_from or date_to:
-            date_filter = {}
-            if date_from:
-                date_filter["$gte"] = date_from
-            if date_to:
-                date_filter["$lte"] = date_to
-            search_filter["publishedAt"] = date_filter
+        validators = Validators(request)
+        not_modified = validators.not_modified(request)
+        if not_modified:
+            return not_modified
         
-        # Perform search with text score for relevance sorting
-        results = list(articles_collection.find(
-            search_filter,
+        def search():
+            from .article_bodies import search_article_bodies
+            
+            # Build MongoDB text search query
+            search_filter = {"$text": {"$search": query}}
+            
+            # Add optional filters
+            if category:
+                search_filter["category"] = category
+        
+            if sentiment:
+                search_filter["sentiment_label"] = sentiment.capitalize()
+        
+            # Date range filter
+            if date_from or date_to:
+                date_filter = {}
+                if date_from:
+                    date_filter["$gte"] = date_from
+                if date_to:
+                    date_filter["$lte"] = date_to
+                search_filter["publishedAt"] = date_filter
+        
+            # Perform search with text score for relevance sorting
+            projection = article_projection(fields)
+            sort_only = fields is not None and sort_by == 'date' and 'publishedAt' not in fields
+            if sort_only:
+                projection['publishedAt'] = 1
+            # The URL joins title/summary matches with body matches
+            url_only = fields is not None and 'url' not in fields
+            if url_only:
+                projection['url'] = 1
+            results = list(articles_collection.find(
+                search_filter,
+                {
+                    **projection,
+                    "score": {"$meta": "textScore"}  # Include relevance score
+                }
+            ))
+            
+            # Bodies live in article_bodies with their own text index: add the
+            # articles matched only by their body, and sum the scores of both matches
+            body_scores = search_article_bodies(query)
+            matched = {result.get('url') for result in results}
+            body_only = [url for url in body_scores if url not in matched]
+            if body_only:
+                filters = {k: v for k, v in search_filter.items() if k != "$text"}
+                results += articles_collection.find({**filters, "url": {"$in": body_only}}, projection)
+            for result in results:
+                result['score'] = result.get('score', 0) + body_scores.get(result.get('url'), 0)
+            
+            # Sort results
+            if sort_by == 'relevance':
+                results.sort(key=lambda x: x.get('score', 0), reverse=True)
+            elif sort_by == 'date':
+                results.sort(key=lambda x: x.get('publishedAt', ''), reverse=True)
+        
+            # Remove score (and join or sort keys that were not asked for) before sending
+            for result in results:
+                result.pop('score', None)
+                if sort_only:
+                    result.pop('publishedAt', None)
+                if url_only:
+                    result.pop('url', None)
+        
+            # Limit results
+            return results[:limit]
+        
+        # Identical searches in a burst share one text search (see core/response_cache.py)
+        results = cached_response(
+            "search",
             {
-                "_id": 0,
-                "score": {"$meta": "textScore"}  # Include relevance score
-            }
-        ))
-        
-        # Sort results
-        if sort_by == 'relevance':
-            results.sort(key=lambda x: x.get('score', 0), reverse=True)
-        elif sort_by == 'date':
-            results.sort(key=lambda x: x.get('publishedAt', ''), reverse=True)
-        
-        # Remove score from results before sending
-        for result in results:
-            result.pop('score', None)
-        
-        # Limit results
-        results = results[:limit]
+                "q": normalize_search_text(query), "category": category, "sentiment": sentiment.capitalize(),
+                "date_from": date_from, "date_to": date_to, "sort": sort_by, "limit": limit, "fields": fields,
+            },
+            search
+        )
         
         logger.info(f" Search for '{query}' returned {len(results)} results")
-        return Response({
+        return validators.apply(Response({
             "query": query,
             "results": results,
             "count": len(results),
@@ -404,7 +836,7 @@ def search_articles(request):
                 "date_from": date_from or None,
                 "date_to": date_to or None
             }
-        })
+        }))
     except Exception as e:
         logger.error(f" Search error: {str(e)}")
         return Response({
@@ -586,14 +1018,30 @@ def remove_bookmark(request):
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
 def get_bookmarks(request):
-    """Get all bookmarks for the current user."""
+    """
+    Get the current user's bookmarks, newest first.
+    Query params: limit (page size), cursor (next_cursor of the previous page)
+    """
     try:
         user = request.user.username
+        try:
+            limit = page_size(request.GET.get('limit'))
+        except ValueError:
+            return Response({
+                "status": "error",
+                "message": "limit must be an integer"
+            }, status=status.HTTP_400_BAD_REQUEST)
         
-        bookmarks_raw = list(bookmarks_collection.find(
-            {"username": user},
-            {"_id": 0}
-        ).sort("created_at", -1))
+        try:
+            bookmarks_raw, next_cursor = keyset_page(
+                bookmarks_collection, {"username": user}, "created_at", limit,
+                cursor=request.GET.get('cursor'), projection={"_id": 0}
+            )
+        except InvalidCursor as e:
+            return Response({
+                "status": "error",
+                "message": str(e)
+            }, status=status.HTTP_400_BAD_REQUEST)
         
         # Flatten the article_data into the bookmark object
         bookmarks = []
@@ -616,7 +1064,8 @@ def get_bookmarks(request):
         logger.info(f" Retrieved {len(bookmarks)} bookmarks for user: {user}")
         return Response({
             "bookmarks": bookmarks,
-            "count": len(bookmarks)
+            "count": len(bookmarks),
+            "next_cursor": next_cursor
         })
     except Exception as e:
         logger.error(f" Error fetching bookmarks: {str(e)}")
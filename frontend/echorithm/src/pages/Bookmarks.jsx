@@ -1,5 +1,6 @@
 import React, { useState, useEffect } from 'react';
 import NewsCard from '../components/NewsCard/NewsCard';
+import LoadMoreButton from '../components/LoadMoreButton/LoadMoreButton';
 import { fetchBookmarks } from '../services/api';
 import './Bookmarks.css';
 
@@ -9,6 +10,8 @@ const Bookmarks = () => {
   const [error, setError] = useState(null);
   const [sortBy, setSortBy] = useState('date'); // 'date' or 'category'
   const [filterCategory, setFilterCategory] = useState('all');
+  const [nextCursor, setNextCursor] = useState(null);
+  const [loadingMore, setLoadingMore] = useState(false);
   
   const categories = ['all', 'Technology', 'Business', 'Sports', 'Entertainment', 'Health', 'Science', 'Politics'];
 
@@ -22,6 +25,7 @@ const Bookmarks = () => {
       setError(null);
       const data = await fetchBookmarks();
       setBookmarks(data.bookmarks || []);
+      setNextCursor(data.next_cursor || null);
     } catch (err) {
       console.error('Error loading bookmarks:', err);
       setError('Failed to load bookmarks. Please try again.');
@@ -30,6 +34,19 @@ const Bookmarks = () => {
     }
   };
 
+  const loadMoreBookmarks = async () => {
+    setLoadingMore(true);
+    try {
+      const data = await fetchBookmarks(50, nextCursor);
+      setBookmarks(prev => [...prev, ...(data.bookmarks || [])]);
+      setNextCursor(data.next_cursor || null);
+    } catch (err) {
+      console.error('Error loading more bookmarks:', err);
+    } finally {
+      setLoadingMore(false);
+    }
+  };
+
   const handleBookmarkRemoved = (articleUrl) => {
     // Remove bookmark from local state after NewsCard removes it
     setBookmarks(prev => prev.filter(b => b.article_url !== articleUrl));
@@ -86,7 +103,7 @@ const Bookmarks = () => {
         <div className="header-content">
           <h1 className="bookmarks-title">📚 Your Bookmarks</h1>
           <p className="bookmarks-subtitle">
-            {bookmarks.length} {bookmarks.length === 1 ? 'article' : 'articles'} saved
+            {bookmarks.length}{nextCursor ? '+' : ''} {bookmarks.length === 1 ? 'article' : 'articles'} saved
           </p>
         </div>
 
@@ -167,6 +184,10 @@ const Bookmarks = () => {
           ))}
         </div>
       )}
+
+      {nextCursor && (
+        <LoadMoreButton onClick={loadMoreBookmarks} loading={loadingMore} />
+      )}
     </div>
   );
 };
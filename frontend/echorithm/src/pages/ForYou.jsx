@@ -16,6 +16,8 @@ const ForYou = () => {
   const [displayCount, setDisplayCount] = useState(10);
   const [recommendationEngine, setRecommendationEngine] = useState("");
   const [readingHistoryCount, setReadingHistoryCount] = useState(0);
+  const [nextCursor, setNextCursor] = useState(null);
+  const [loadingMore, setLoadingMore] = useState(false);
   const navigate = useNavigate();
 
   useEffect(() => {
@@ -34,11 +36,12 @@ const ForYou = () => {
         // Fetch user preferences and ML-powered personalized recommendations
         const [prefsData, recommendationsData] = await Promise.all([
           fetchPreferences(),
-          fetchPersonalizedRecommendations(100), // Fetch more for better UX
+          fetchPersonalizedRecommendations(20),
         ]);
 
         setPreferences(prefsData.categories || []);
         setNewsList(recommendationsData.articles || []);
+        setNextCursor(recommendationsData.next_cursor || null);
         setRecommendationEngine(recommendationsData.recommendation_engine || "");
         setReadingHistoryCount(recommendationsData.reading_history_count || 0);
 
@@ -63,7 +66,20 @@ const ForYou = () => {
     loadPersonalizedNews();
   }, [navigate]);
 
-  const loadMore = () => {
+  const loadMore = async () => {
+    // Fetch the next page of the (server-cached) feed when the loaded one runs out
+    if (displayCount + 10 > newsList.length && nextCursor) {
+      setLoadingMore(true);
+      try {
+        const data = await fetchPersonalizedRecommendations(20, nextCursor);
+        setNewsList((prev) => [...prev, ...(data.articles || [])]);
+        setNextCursor(data.next_cursor || null);
+      } catch (err) {
+        console.error("Error loading more recommendations:", err);
+      } finally {
+        setLoadingMore(false);
+      }
+    }
     setDisplayCount((prev) => prev + 10);
   };
 
@@ -155,11 +171,11 @@ const ForYou = () => {
                 ))}
               </div>
 
-              {displayCount < newsList.length && (
+              {(displayCount < newsList.length || nextCursor) && (
                 <button
                   className="foryou__load-more"
                   onClick={loadMore}
-                  disabled={loading}
+                  disabled={loading || loadingMore}
                 >
                   Load More Recommendations
                 </button>
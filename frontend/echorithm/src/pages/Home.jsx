@@ -1,5 +1,5 @@
 import React, { useEffect, useState } from "react";
-import { fetchArticles, updateArticles } from "../services/api";
+import { fetchArticles, updateArticles, fetchUpdateStatus } from "../services/api";
 import "./Home.css";
 
 import Sidebar from "../components/Sidebar/Sidebar";
@@ -9,6 +9,8 @@ import NewestList from "../components/NewestList/NewestList";
 import LoadMoreButton from "../components/LoadMoreButton/LoadMoreButton";
 import Footer from "../components/Footer/Footer";
 
+const PAGE_SIZE = 50;
+
 const Home = () => {
   const [news, setNews] = useState([]);
   const [displayCount, setDisplayCount] = useState(10);
@@ -17,6 +19,16 @@ const Home = () => {
   const [error, setError] = useState(null);
   const [isFetching, setIsFetching] = useState(false);
   const [fetchStatus, setFetchStatus] = useState("");
+  const [nextCursor, setNextCursor] = useState(null);
+  const [loadingMore, setLoadingMore] = useState(false);
+
+  // Articles come newest first, a page at a time, filtered by category on the server
+  const fetchPage = (cursor = null) =>
+    fetchArticles({
+      limit: PAGE_SIZE,
+      cursor,
+      category: selectedCategory === "All" ? null : selectedCategory.toLowerCase(),
+    });
 
   useEffect(() => {
     const loadNews = async () => {
@@ -24,11 +36,9 @@ const Home = () => {
       setError(null);
       
       try {
-        const data = await fetchArticles();
-        const sorted = data.sort(
-          (a, b) => new Date(b.publishedAt) - new Date(a.publishedAt)
-        );
-        setNews(sorted);
+        const { articles, nextCursor } = await fetchPage();
+        setNews(articles);
+        setNextCursor(nextCursor);
       } catch (err) {
         console.error("Error fetching articles:", err);
         setError("Failed to load articles. Please try again later.");
@@ -38,7 +48,7 @@ const Home = () => {
     };
 
     loadNews();
-  }, []);
+  }, [selectedCategory]);
 
   const handleCategoryClick = (category) => {
     setSelectedCategory(category);
@@ -53,7 +63,20 @@ const Home = () => {
             item.category?.toLowerCase() === selectedCategory.toLowerCase()
         );
 
-  const loadMore = () => {
+  const loadMore = async () => {
+    // Fetch the next page when the loaded articles run out
+    if (displayCount + 5 > filteredNews.length && nextCursor) {
+      setLoadingMore(true);
+      try {
+        const page = await fetchPage(nextCursor);
+        setNews((prev) => [...prev, ...page.articles]);
+        setNextCursor(page.nextCursor);
+      } catch (err) {
+        console.error("Error loading more articles:", err);
+      } finally {
+        setLoadingMore(false);
+      }
+    }
     setDisplayCount((prev) => prev + 5);
   };
 
@@ -62,24 +85,31 @@ const Home = () => {
     setFetchStatus("Fetching latest articles...");
     
     try {
-      await updateArticles();
+      const { job_id } = await updateArticles();
       setFetchStatus("Processing articles with AI...");
       
-      // Wait a bit for processing, then reload articles
-      setTimeout(async () => {
-        const data = await fetchArticles();
-        const sorted = data.sort(
-          (a, b) => new Date(b.publishedAt) - new Date(a.publishedAt)
-        );
-        setNews(sorted);
-        setFetchStatus("Articles updated successfully!");
-        
-        // Clear status after 3 seconds
-        setTimeout(() => {
-          setFetchStatus("");
-          setIsFetching(false);
-        }, 3000);
-      }, 2000);
+      // The update runs in the background; poll its status until it finishes
+      let job;
+      do {
+        await new Promise((resolve) => setTimeout(resolve, 3000));
+        job = await fetchUpdateStatus(job_id);
+      } while (job.status === "queued" || job.status === "running");
+
+      if (job.status !== "succeeded") {
+        throw new Error(job.error || "Article update failed");
+      }
+
+      const { articles, nextCursor } = await fetchPage();
+      setNews(articles);
+      setNextCursor(nextCursor);
+      setDisplayCount(10);
+      setFetchStatus(`Articles updated successfully! ${job.inserted} new articles.`);
+      
+      // Clear status after 3 seconds
+      setTimeout(() => {
+        setFetchStatus("");
+        setIsFetching(false);
+      }, 3000);
     } catch (err) {
       console.error("Error fetching articles:", err);
       setFetchStatus("Failed to fetch articles. Please try again.");
@@ -147,8 +177,8 @@ const Home = () => {
                 ))}
               </div>
 
-              {displayCount < filteredNews.length && (
-                <LoadMoreButton onClick={loadMore} loading={false} />
+              {(displayCount < filteredNews.length || nextCursor) && (
+                <LoadMoreButton onClick={loadMore} loading={loadingMore} />
               )}
             </>
           )}
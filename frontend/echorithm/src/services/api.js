@@ -40,10 +40,17 @@ apiClient.interceptors.response.use(
 );
 
 // === Article APIs ===
-export const fetchArticles = async () => {
+export const fetchArticles = async ({ limit = 50, cursor = null, category = null, view = "card" } = {}) => {
   try {
-    const response = await apiClient.get("/articles/");
-    return response.data;
+    const params = new URLSearchParams({ limit, view });
+    if (cursor) params.append('cursor', cursor);
+    if (category) params.append('category', category);
+    const response = await apiClient.get(`/articles/?${params.toString()}`);
+    // The body is the page of articles; the next page's cursor comes in a header
+    return {
+      articles: response.data,
+      nextCursor: response.headers["x-next-cursor"] || null,
+    };
   } catch (error) {
     console.error("Error fetching articles:", error);
     throw error;
@@ -60,9 +67,21 @@ export const updateArticles = async () => {
   }
 };
 
-export const fetchFilteredArticles = async () => {
+export const fetchUpdateStatus = async (jobId) => {
+  try {
+    const response = await apiClient.get(`/articles/update/status/${jobId}/`);
+    return response.data;
+  } catch (error) {
+    console.error("Error fetching update status:", error);
+    throw error;
+  }
+};
+
+export const fetchFilteredArticles = async (limit = 50, cursor = null, view = "card") => {
   try {
-    const response = await apiClient.get("/articles/filtered/");
+    const params = new URLSearchParams({ limit, view });
+    if (cursor) params.append('cursor', cursor);
+    const response = await apiClient.get(`/articles/filtered/?${params.toString()}`);
     return response.data;
   } catch (error) {
     console.error("Error fetching filtered articles:", error);
@@ -149,9 +168,11 @@ export const trackArticleView = async (articleData) => {
   }
 };
 
-export const fetchPersonalizedRecommendations = async (limit = 50) => {
+export const fetchPersonalizedRecommendations = async (limit = 50, cursor = null, view = "card") => {
   try {
-    const response = await apiClient.get(`/articles/personalized/?limit=${limit}`);
+    const params = new URLSearchParams({ limit, view });
+    if (cursor) params.append('cursor', cursor);
+    const response = await apiClient.get(`/articles/personalized/?${params.toString()}`);
     return response.data;
   } catch (error) {
     console.error("Error fetching personalized recommendations:", error);
@@ -159,9 +180,11 @@ export const fetchPersonalizedRecommendations = async (limit = 50) => {
   }
 };
 
-export const fetchReadingHistory = async (limit = 50) => {
+export const fetchReadingHistory = async (limit = 50, cursor = null) => {
   try {
-    const response = await apiClient.get(`/reading-history/?limit=${limit}`);
+    const params = new URLSearchParams({ limit });
+    if (cursor) params.append('cursor', cursor);
+    const response = await apiClient.get(`/reading-history/?${params.toString()}`);
     return response.data;
   } catch (error) {
     console.error("Error fetching reading history:", error);
@@ -172,7 +195,7 @@ export const fetchReadingHistory = async (limit = 50) => {
 // === Search APIs ===
 export const searchArticles = async (query, filters = {}) => {
   try {
-    const params = new URLSearchParams({ q: query });
+    const params = new URLSearchParams({ q: query, view: filters.view || "card" });
     
     if (filters.category) params.append('category', filters.category);
     if (filters.sentiment) params.append('sentiment', filters.sentiment);
@@ -189,6 +212,17 @@ export const searchArticles = async (query, filters = {}) => {
   }
 };
 
+export const fetchArticleDetail = async (url) => {
+  try {
+    const params = new URLSearchParams({ url });
+    const response = await apiClient.get(`/articles/detail/?${params.toString()}`);
+    return response.data.article;
+  } catch (error) {
+    console.error("Error fetching article detail:", error);
+    throw error;
+  }
+};
+
 export const trackSearchQuery = async (query, resultsCount) => {
   try {
     const response = await apiClient.post("/search/track/", {
@@ -240,9 +274,11 @@ export const removeBookmark = async (articleUrl) => {
   }
 };
 
-export const fetchBookmarks = async () => {
+export const fetchBookmarks = async (limit = 50, cursor = null) => {
   try {
-    const response = await apiClient.get("/bookmarks/");
+    const params = new URLSearchParams({ limit });
+    if (cursor) params.append('cursor', cursor);
+    const response = await apiClient.get(`/bookmarks/?${params.toString()}`);
     return response.data;
   } catch (error) {
     console.error("Error fetching bookmarks:", error);